@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from gana import I
 
+from ..utils.math import isvector
 from ._x import _X
 
 if TYPE_CHECKING:
@@ -154,7 +155,7 @@ class _Component(_X):
                     # get the sample
                     sample = getattr(self, aspect)
 
-                    if isinstance(param, list):
+                    if isvector(param):
                         sample = self._handle_x(
                             aspect, self._handle_norm(aspect, sample)
                         )
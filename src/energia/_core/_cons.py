@@ -0,0 +1,60 @@
+"""Inherited _Cons class"""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gana import Prg
+    from gana.sets.constraint import C
+
+
+class _Cons:
+    """
+    Keeps the constraint sets an index (component, aspect or lag) features in.
+
+    Constraint sets are kept by their ids, i.e. their positions in the program
+    (C.n, which is kept when a set is updated, e.g. a balance),
+    as a compact integer array. Names are rendered only when asked for.
+
+    :ivar cons_ids: ids of the constraint sets, in the order they were informed
+    :vartype cons_ids: array[int]
+    """
+
+    program: Prg
+
+    def __init__(self):
+        self.cons_ids: array = array("i")
+
+    def inform(self, cons: C):
+        """
+        Notes that the index features in a constraint set
+
+        :param cons: constraint set declared in the program
+        :type cons: C
+        """
+        # a set updated again (e.g. a balance) is often the last one informed
+        if not self.cons_ids or self.cons_ids[-1] != cons.n:
+            self.cons_ids.append(cons.n)
+
+    @property
+    def cons_n(self) -> list[int]:
+        """Ids of the constraint sets, once each"""
+        return list(dict.fromkeys(self.cons_ids))
+
+    @property
+    def constraints(self) -> list[str]:
+        """Names of the constraint sets"""
+        if not self.cons_ids:
+            return []
+        names = self.program.names_constraint_sets
+        return [names[n] for n in self.cons_n]
+
+    @property
+    def cons(self) -> list[C]:
+        """Constraints"""
+        if not self.cons_ids:
+            return []
+        sets = self.program.constraint_sets
+        return [sets[n] for n in self.cons_n]
@@ -6,19 +6,19 @@ from abc import ABC, abstractmethod
 from functools import cached_property
 from typing import TYPE_CHECKING
 
+from ._cons import _Cons
 from ._hash import _Hash
 
 if TYPE_CHECKING:
     from gana import I as Idx
     from gana import Prg
-    from gana.sets.constraint import C
 
     from ..modeling.indices.domain import Domain
     from ..modeling.variables.aspect import Aspect
     from ..represent.model import Model
 
 
-class _X(ABC, _Hash):
+class _X(ABC, _Cons, _Hash):
     """
     A component (`x`) that functions as an index in the mathematical program.
 
@@ -31,17 +31,20 @@ class _X(ABC, _Hash):
     :vartype model: Model
     :ivar name: Set when the component is assigned as a Model attribute.
     :vartype name: str
-    :ivar constraints: List of constraints associated with the component.
-    :vartype constraints: list[str]
+    :ivar uid: Dense integer id, position of the component in Model.indexed. -1 until assigned.
+    :vartype uid: int
+    :ivar cons_ids: Ids of the constraint sets associated with the component, see _Cons.
+    :vartype cons_ids: array[int]
     :ivar domains: List of domains associated with the component.
     :vartype domains: list[Domain]
     :ivar aspects: Aspects associated with the component with domains.
     :vartype aspects: dict[Aspect, list[Domain]]
 
     .. note:
-        - `name` and `model` are set when the component
+        - `name`, `model` and `uid` are set when the component
            is assigned as a Model attribute.
-        - `constraints` and `domains` are populated as the program is built.
+        - components are hashed and compared by identity, not by name.
+        - `cons_ids` and `domains` are populated as the program is built.
     """
 
     def __init__(
@@ -55,9 +58,11 @@ class _X(ABC, _Hash):
         self.model: Model | None = None
         # name is given by the model
         self.name: str = ""
+        # dense id is given by the model
+        self.uid: int = -1
 
-        # constraint pnames associated with the component
-        self.constraints: set[str] = set()
+        # constraint sets associated with the component
+        _Cons.__init__(self)
         # domains associated with the component
         self.domains: list[Domain] = []
         # aspects associated with the component with domains
@@ -70,13 +75,6 @@ class _X(ABC, _Hash):
             raise AttributeError(f"{type(self)} needs to be assign as Model attribute")
         return self.model.program
 
-    @property
-    def cons(self) -> list[C]:
-        """Constraints"""
-        # this gets the actual constraint objects from the program
-        # based on the pname (attribute name) in the program
-        return [getattr(self.program, c) for c in self.constraints]
-
     @property
     @abstractmethod
     def I(self) -> Idx:
@@ -94,7 +92,13 @@ class _X(ABC, _Hash):
                 c.show(descriptive)
 
     def __eq__(self, other: object) -> bool:
-        try:
-            return str(self) == str(other)
-        except Exception:
-            super().__eq__(other)
+        return self is other
+
+    def __hash__(self):
+        return object.__hash__(self)
+
+    def __init_subclass__(cls):
+        # the hashing will be inherited by the subclasses
+        # even those that overload __eq__ (e.g. Commodity)
+        cls.__repr__ = _Hash.__repr__
+        cls.__hash__ = _X.__hash__
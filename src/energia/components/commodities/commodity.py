@@ -5,8 +5,11 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, Self
 
+import numpy
+
 from ..._core._component import _Component
 from ...modeling.parameters.conversion import Conversion
+from ...utils.math import isvector, readonly
 
 if TYPE_CHECKING:
     from ..measure.unit import Unit
@@ -40,6 +43,11 @@ class Commodity(_Component, Mapping):
     :vartype insitu: bool, optional
     """
 
+    # array * Commodity and Series * Commodity are left to __rmul__,
+    # not applied elementwise
+    __array_ufunc__ = None
+    __pandas_priority__ = 5000
+
     def __init__(
         self, basis: Unit | None = None, label: str = "", citations: str = "", **kwargs
     ):
@@ -75,6 +83,9 @@ class Commodity(_Component, Mapping):
     def __mul__(self, other: int | float) -> Conversion:
         # multiplying a number with a resources gives conversion
         # math operations with conversions form the balance in tasks
+        if isvector(other) and not isinstance(other, list):
+            # arrays and Series are kept as read-only views
+            other = readonly(other)
         return Conversion.from_balance({self: other})
 
     def __rmul__(self, other: int | float) -> Conversion:
@@ -96,7 +107,7 @@ class Commodity(_Component, Mapping):
             return self + -1 * other
 
         def _negate(par):
-            if isinstance(par, (int, float)):
+            if isinstance(par, (int, float, numpy.ndarray)):
                 return -1 * par
             return [-i for i in par]
 
@@ -7,13 +7,21 @@ from typing import TYPE_CHECKING
 from ..._core._name import _Name
 
 if TYPE_CHECKING:
+    from ..._core._component import _Component
     from ...represent.ations.graph import Graph
+    from .node import Node
 
 
 class Edge(_Name):
     """
     Edge of a Graph
 
+    :param source: Node the edge leaves. Defaults to None.
+    :type source: Node, optional
+    :param sink: Node the edge enters. Defaults to None.
+    :type sink: Node, optional
+    :param component: Component (e.g. Linkage) represented. Defaults to None.
+    :type component: _Component, optional
     :param label: Label of the component, used for plotting. Defaults to None.
     :type label: str, optional
     :param graph: Graph to which the edge belongs. Defaults to None.
@@ -25,6 +33,15 @@ class Edge(_Name):
         - name and Graph are set when made a Graph attribute.
     """
 
-    def __init__(self, label: str = ""):
+    def __init__(
+        self,
+        source: Node | None = None,
+        sink: Node | None = None,
+        component: _Component | None = None,
+        label: str = "",
+    ):
         self.graph: Graph | None = None
+        self.source = source
+        self.sink = sink
+        self.component = component
         _Name.__init__(self, label=label)
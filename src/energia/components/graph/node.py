@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 from ..._core._name import _Name
 
 if TYPE_CHECKING:
+    from ..._core._component import _Component
     from ...represent.ations.graph import Graph
 
 
@@ -14,6 +15,8 @@ class Node(_Name):
     """
     Node of a Graph
 
+    :param component: Component (commodity, operation, location) represented. Defaults to None.
+    :type component: _Component, optional
     :param label: Label of the component, used for plotting. Defaults to None.
     :type label: str, optional
     :param graph: Graph to which the node belongs. Defaults to None.
@@ -25,6 +28,7 @@ class Node(_Name):
         - name and Graph are set when made a Graph attribute.
     """
 
-    def __init__(self, label: str = ""):
+    def __init__(self, component: _Component | None = None, label: str = ""):
         self.graph: Graph | None = None
+        self.component = component
         _Name.__init__(self, label=label)
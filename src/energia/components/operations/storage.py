@@ -176,7 +176,7 @@ class Storage(_Component):
         # this gets the actual constraint objects from the program
         # based on the pname (attribute name) in the program
         return (
-            [getattr(self.program, c) for c in self.constraints]
+            super().cons
             + self.charge.cons
             + self.discharge.cons
             + self.stored.cons
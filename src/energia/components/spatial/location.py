@@ -97,6 +97,10 @@ class Location(_X):
 
     def locate(self, *operations: Process | Storage):
         """Locates the Operations"""
+        if self.model.prune:
+            # operations which cannot reach any demand are left out
+            operations = self.model.graph.prune(operations, self)
+
         # locates an operation
         # which leads to the conversion balances being written
         for opr in operations:
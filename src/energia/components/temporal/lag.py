@@ -6,16 +6,18 @@ from functools import cached_property
 from operator import is_
 from typing import TYPE_CHECKING, Self
 
+from ..._core._cons import _Cons
 from ..._core._name import _Name
 
 if TYPE_CHECKING:
     from gana import I as Idx
+    from gana import Prg
 
     from ...modeling.indices.domain import Domain
     from .periods import Periods
 
 
-class Lag(_Name):
+class Lag(_Cons, _Name):
     """
     A number of temporal Periods.
 
@@ -29,6 +31,8 @@ class Lag(_Name):
     :vartype name: str
     :ivar domains: List of Domains the lag features belong to. Defaults to [].
     :vartype domains: list[Domain]
+    :ivar cons_ids: Ids of the constraint sets the lag features in, see _Cons.
+    :vartype cons_ids: array[int]
 
     .. note::
         - Name is generated post init.
@@ -42,7 +46,12 @@ class Lag(_Name):
         self.periods = periods
         self.name = f"-{self.periods}{self.of}"
         self.domains: list[Domain] = []
-        self.constraints: set[str] = set()
+        _Cons.__init__(self)
+
+    @property
+    def program(self) -> Prg:
+        """Mathematical program of the lagged periods"""
+        return self.of.program
 
     @cached_property
     def I(self) -> Idx:
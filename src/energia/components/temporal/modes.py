@@ -90,10 +90,10 @@ class Modes(_X):
         # this gets the actual constraint objects from the program
         # based on the pname (attribute name) in the program
         if self.parent:
-            return [getattr(self.program, c) for c in self.constraints]
+            return super().cons
         return list(
             set(
-                [getattr(self.program, c) for c in self.constraints]
+                super().cons
                 + sum(
                     [m.cons for m in self],
                     [],
@@ -101,10 +101,8 @@ class Modes(_X):
             )
         )
 
-    def __eq__(self, other: Modes) -> bool:
-        if isinstance(other, Modes) and other.name == self.name:
-            return True
-        return False
+    def __eq__(self, other: object) -> bool:
+        return self is other
 
     def __len__(self) -> int:
         return self.size
@@ -15,7 +15,6 @@ from ...utils.dictionary import NotFoundError, compare
 from .lag import Lag
 
 if TYPE_CHECKING:
-    from gana.sets.constraint import C
 
     from ...components.temporal.modes import Modes
     from ...dimensions.time import Time
@@ -107,11 +106,6 @@ class Periods(_X):
 
         return {self: self.of.tree}
 
-    @property
-    def cons(self) -> list[C]:
-        """Constraints"""
-        return [getattr(self.program, c) for c in self.constraints]
-
     @property
     def horizon(self) -> Self:
         """Time Horizon"""
@@ -0,0 +1 @@
+"""Decomposition schemes"""
@@ -0,0 +1,342 @@
+"""Benders Decomposition between Design and Operation"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+from scipy.sparse import csr_array, hstack, identity, vstack
+from scipy.sparse.csgraph import connected_components
+
+from ..modeling.variables.states import Size
+
+if TYPE_CHECKING:
+    from ..represent.model import Model
+
+logger = logging.getLogger("energia")
+
+
+def _solve_block(
+    block: dict[str, numpy.ndarray | csr_array],
+    rhs: numpy.ndarray,
+) -> tuple[bool, float, numpy.ndarray, float, numpy.ndarray]:
+    """
+    Solves an operational subproblem for a fixed design
+
+    :param block: subproblem data, A, eq, c, lb, ub
+    :type block: dict[str, numpy.ndarray | csr_array]
+    :param rhs: right hand side with the design fixed
+    :type rhs: numpy.ndarray
+
+    :returns: feasible, objective value, duals of the rows,
+        dual value of the finite variable bounds (does not change with the design), solution
+    :rtype: tuple[bool, float, numpy.ndarray, float, numpy.ndarray]
+    """
+    A, eq = block["A"], block["eq"]
+    leq = ~eq
+    lb, ub = block["lb"], block["ub"]
+    n = A.shape[1]
+
+    def _duals(res) -> tuple[numpy.ndarray, float]:
+        u = numpy.zeros(len(rhs))
+        if leq.any():
+            u[leq] = res.ineqlin.marginals
+        if eq.any():
+            u[eq] = res.eqlin.marginals
+        # active bounds contribute to the dual objective too
+        # marginals of infinite bounds are zero
+        lower, upper = res.lower.marginals[:n], res.upper.marginals[:n]
+        finite_lb, finite_ub = numpy.isfinite(lb), numpy.isfinite(ub)
+        bound = lower[finite_lb] @ lb[finite_lb] + upper[finite_ub] @ ub[finite_ub]
+        return u, float(bound)
+
+    res = linprog(
+        block["c"],
+        A_ub=A[leq] if leq.any() else None,
+        b_ub=rhs[leq] if leq.any() else None,
+        A_eq=A[eq] if eq.any() else None,
+        b_eq=rhs[eq] if eq.any() else None,
+        bounds=list(zip(block["lb"], block["ub"])),
+        method="highs",
+    )
+
+    if res.status == 0:
+        return True, res.fun, *_duals(res), res.x
+
+    if res.status != 2:
+        raise RuntimeError(f"Subproblem could not be solved: {res.message}")
+
+    # infeasible, minimize the violation instead
+    # leq rows get one slack, eq rows get two
+    m = A.shape[0]
+    slack = hstack(
+        [
+            -identity(m, format="csr"),
+            identity(m, format="csr")[:, numpy.flatnonzero(eq)],
+        ]
+    )
+    slack = csr_array(slack)
+    A_ = hstack([A, slack]).tocsr()
+    n_slack = slack.shape[1]
+    res = linprog(
+        numpy.concatenate([numpy.zeros(n), numpy.ones(n_slack)]),
+        A_ub=A_[leq] if leq.any() else None,
+        b_ub=rhs[leq] if leq.any() else None,
+        A_eq=A_[eq] if eq.any() else None,
+        b_eq=rhs[eq] if eq.any() else None,
+        bounds=list(zip(block["lb"], block["ub"])) + [(0, None)] * n_slack,
+        method="highs",
+    )
+    return False, res.fun, *_duals(res), res.x[:n]
+
+
+class Benders:
+    """
+    Benders decomposition of a Model.
+
+    Size aspects (capacity, invcapacity) and their reporting binaries,
+    along with every other integer variable, are first-stage (design) decisions
+    and make up the master problem.
+    The remaining (operational) variables are split into independent blocks,
+    which are solved as linear subproblems in parallel.
+    Blocks are the connected components of the operational rows,
+    not periods as such: periods make separate blocks only where no row
+    (e.g. an inventory balance) links them.
+    Operational variables in no row are set to their cheapest bound.
+    Optimality and feasibility cuts, with the duals of the rows and of the
+    finite variable bounds, are added to the master until the bounds meet.
+
+    :param model: Model with an objective set, e.g. using m.usd.spend.obj()
+    :type model: Model
+    :param tol: relative gap at which to stop. Defaults to 1e-6.
+    :type tol: float, optional
+    :param max_iter: maximum number of iterations. Defaults to 100.
+    :type max_iter: int, optional
+    :param workers: number of processes for the subproblems, serial if 1. Defaults to None (all cores).
+    :type workers: int, optional
+    :param lower: lower bound on the operational objective of each block. Defaults to 0.
+    :type lower: float, optional
+
+    :ivar design: positions of the first-stage variables.
+    :vartype design: numpy.ndarray
+    :ivar blocks: positions of the variables in each subproblem.
+    :vartype blocks: list[numpy.ndarray]
+    :ivar bounds: lower and upper bound at every iteration.
+    :vartype bounds: list[tuple[float, float]]
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        tol: float = 1e-6,
+        max_iter: int = 100,
+        workers: int | None = None,
+        lower: float = 0,
+    ):
+        self.model = model
+        self.tol = tol
+        self.max_iter = max_iter
+        self.workers = workers
+        self.lower = lower
+
+        self.program = model.program
+        self.form = self.program.matrices.form()
+
+        self.bounds: list[tuple[float, float]] = []
+
+        self._split()
+
+    def _split(self):
+        """Splits the variables into the master and independent subproblems"""
+
+        sizes = {a.name for a in self.model.aspects if isinstance(a, Size)}
+        sizes |= {f"x_{name}" for name in sizes}
+
+        self.design = numpy.array(
+            [
+                v.n
+                for v in self.program.variables
+                if v.parent.name in sizes or v.itg or v.bnr
+            ],
+            dtype=int,
+        )
+        self.operation = numpy.setdiff1d(
+            numpy.arange(len(self.program.variables)), self.design
+        )
+
+        A = self.form["A"]
+        A_y = A[:, self.operation]
+        # rows with operational variables go to the subproblems
+        sub_rows = numpy.flatnonzero(numpy.diff(A_y.tocsr().indptr))
+        self.master_rows = numpy.setdiff1d(numpy.arange(A.shape[0]), sub_rows)
+
+        # operational variables which share a row are in the same block
+        # connected components of the bipartite graph of rows and variables
+        pattern = csr_array(A_y[sub_rows] != 0, dtype=int)
+        n_rows, n_cols = pattern.shape
+        graph = vstack(
+            [
+                hstack([csr_array((n_rows, n_rows)), pattern]),
+                hstack([pattern.T, csr_array((n_cols, n_cols))]),
+            ]
+        )
+        _, labels = connected_components(graph, directed=False)
+        row_labels, col_labels = labels[:n_rows], labels[n_rows:]
+
+        self.blocks: list[numpy.ndarray] = []
+        self._block_rows: list[numpy.ndarray] = []
+        for label in numpy.unique(row_labels):
+            self.blocks.append(self.operation[col_labels == label])
+            self._block_rows.append(sub_rows[row_labels == label])
+
+        # operational variables that feature in no row
+        # are only bound by their bounds and objective
+        free = self.operation[~numpy.isin(col_labels, row_labels)]
+        self._free = free
+
+        logger.info(
+            "✂  Split %s into a master with %s variables and %s subproblems",
+            self.model,
+            len(self.design),
+            len(self.blocks),
+        )
+
+    def _subproblems(self) -> list[dict[str, numpy.ndarray | csr_array]]:
+        """Data for the subproblems"""
+        A, eq, c = self.form["A"], self.form["eq"], self.form["c"]
+        return [
+            {
+                "A": A[rows][:, cols],
+                "A_x": A[rows][:, self.design],
+                "b": self.form["b"][rows],
+                "eq": eq[rows],
+                "c": c[cols],
+                "lb": self.form["lb"][cols],
+                "ub": self.form["ub"][cols],
+            }
+            for rows, cols in zip(self._block_rows, self.blocks)
+        ]
+
+    def solve(self) -> float:
+        """
+        Iterates between the master and subproblems
+
+        :returns: objective value
+        :rtype: float
+
+        :raises RuntimeError: if the master problem is infeasible or the objective is unbounded.
+        """
+        c_free = self.form["c"][self._free]
+        lb_free, ub_free = self.form["lb"][self._free], self.form["ub"][self._free]
+        unbounded = (c_free < 0) & numpy.isinf(ub_free)
+        unbounded |= (c_free > 0) & numpy.isinf(lb_free)
+        if unbounded.any():
+            raise RuntimeError(f"{self.model}: objective is unbounded")
+        # variables in no row take their cheapest bound
+        x_free = numpy.where(c_free < 0, ub_free, numpy.where(c_free > 0, lb_free, 0))
+        x_free = numpy.where(numpy.isfinite(x_free), x_free, 0)
+        x_free = numpy.clip(x_free, lb_free, ub_free)
+        cost_free = float(c_free @ x_free)
+
+        A, b, eq = self.form["A"], self.form["b"], self.form["eq"]
+        subs = self._subproblems()
+        n_x, n_theta = len(self.design), len(subs)
+
+        # master variables are [x, theta]
+        c_master = numpy.concatenate([self.form["c"][self.design], numpy.ones(n_theta)])
+        integrality = numpy.concatenate(
+            [self.form["integrality"][self.design], numpy.zeros(n_theta)]
+        )
+        bounds = Bounds(
+            numpy.concatenate([self.form["lb"][self.design], [self.lower] * n_theta]),
+            numpy.concatenate([self.form["ub"][self.design], [numpy.inf] * n_theta]),
+        )
+
+        A_master = A[self.master_rows][:, self.design]
+        A_master = hstack([A_master, csr_array((len(self.master_rows), n_theta))])
+        lb_master = numpy.where(eq[self.master_rows], b[self.master_rows], -numpy.inf)
+        ub_master = b[self.master_rows]
+
+        cuts, cuts_ub = [], []
+        upper, lower = numpy.inf, -numpy.inf
+        best: numpy.ndarray | None = None
+
+        pool = (
+            ProcessPoolExecutor(max_workers=self.workers)
+            if self.workers != 1 and n_theta > 1
+            else None
+        )
+
+        try:
+            for iteration in range(self.max_iter):
+                constraints = []
+                if A_master.shape[0]:
+                    constraints.append(LinearConstraint(A_master, lb_master, ub_master))
+                if cuts:
+                    constraints.append(
+                        LinearConstraint(vstack(cuts), -numpy.inf, numpy.array(cuts_ub))
+                    )
+                res = milp(
+                    c_master,
+                    constraints=constraints,
+                    integrality=integrality,
+                    bounds=bounds,
+                )
+                if res.x is None:
+                    raise RuntimeError(f"{self.model}: master problem {res.message}")
+
+                x = res.x[:n_x]
+                lower = res.fun
+
+                rhs = [sub["b"] - sub["A_x"] @ x for sub in subs]
+                if pool:
+                    results = list(pool.map(_solve_block, subs, rhs))
+                else:
+                    results = [_solve_block(sub, r) for sub, r in zip(subs, rhs)]
+
+                feasible = all(result[0] for result in results)
+
+                for k, (sub, (ok, _, u, bound, _)) in enumerate(zip(subs, results)):
+                    # theta_k >= u (b - A_x x) + bound or 0 >= u (b - A_x x) + bound
+                    theta = numpy.zeros(n_theta)
+                    if ok:
+                        theta[k] = -1
+                    cut = numpy.concatenate([-(u @ sub["A_x"]), theta])
+                    cuts.append(csr_array(cut[None, :]))
+                    cuts_ub.append(-(u @ sub["b"]) - bound)
+
+                if feasible:
+                    total = (
+                        self.form["c"][self.design] @ x
+                        + sum(r[1] for r in results)
+                        + cost_free
+                    )
+                    if total < upper:
+                        upper = total
+                        best = numpy.zeros(len(self.program.variables))
+                        best[self.design] = x
+                        best[self._free] = x_free
+                        for cols, result in zip(self.blocks, results):
+                            best[cols] = result[4]
+
+                self.bounds.append((lower, upper))
+                logger.info(
+                    "🔁  Benders iteration %s, bounds [%.6g, %.6g]",
+                    iteration,
+                    lower,
+                    upper,
+                )
+                if upper < numpy.inf and upper - lower <= self.tol * max(1, abs(upper)):
+                    break
+        finally:
+            if pool:
+                pool.shutdown()
+
+        if best is None:
+            raise RuntimeError(f"{self.model}: no feasible design found")
+
+        self.program.load(best, upper)
+        return upper
@@ -0,0 +1,252 @@
+"""Rolling (Receding) Horizon"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from gana import V
+
+if TYPE_CHECKING:
+    from ..components.temporal.periods import Periods
+    from ..modeling.indices.sample import Sample
+    from ..represent.model import Model
+
+logger = logging.getLogger("energia")
+
+
+def _position(index: tuple, time: Periods) -> int:
+    """Position of the period of a time index in an output index, 0 if not timed"""
+    for element in index:
+        # elements are members of the index sets of components
+        for parent, position in zip(element.parent, element.pos):
+            if parent is time.i:
+                return position
+    return 0
+
+
+@dataclass
+class Window:
+    """
+    A window of the densest periods solved in one go.
+
+    :param n: Position of the window.
+    :type n: int
+    :param start: First period in the window.
+    :type start: int
+    :param stop: Period after the last period in the window.
+    :type stop: int
+    :param commit: Number of periods (from start) whose decisions are committed.
+    :type commit: int
+    :param inventory: Inventory carried into the window, by (storage, location) name.
+    :type inventory: dict[tuple[str, str], float]
+    :param capacity: Capacities installed in earlier windows, by (operation, location) name.
+    :type capacity: dict[tuple[str, str], float]
+    """
+
+    n: int
+    start: int
+    stop: int
+    commit: int
+    inventory: dict[tuple[str, str], float] = field(default_factory=dict)
+    capacity: dict[tuple[str, str], float] = field(default_factory=dict)
+
+    def __call__(self, profile: list[float]) -> list[float]:
+        """Slices a profile over the full horizon to the window"""
+        return list(profile[self.start : self.stop])
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+
+class RollingHorizon:
+    """
+    Solves a long horizon as a sequence of overlapping windows.
+
+    Every window is built afresh, solved, and the decisions in the first
+    ``step`` periods are committed. Inventory at the end of the committed
+    periods, at every location, is carried into the next window as a supply
+    of the stored resource in its first period (added to the supply, if the build
+    supplies the stored resource itself). Capacities installed in earlier windows,
+    at every location, bound the capacities of the later windows from below.
+
+    :param build: Builds the model for a window, profiles can be sliced using window(profile).
+    :type build: Callable[[Window], Model]
+    :param length: Number of densest periods in the full horizon.
+    :type length: int
+    :param window: Number of periods in a window.
+    :type window: int
+    :param step: Number of periods committed per window.
+    :type step: int
+    :param objective: Gets the objective sample from a window model, e.g. lambda m: m.usd.spend
+    :type objective: Callable[[Model], Sample]
+    :param record: Samples whose committed values are recorded, by name.
+    :type record: dict[str, Callable[[Model], Sample]], optional
+    :param carry_capacity: Carry installed capacities forward. Defaults to True.
+    :type carry_capacity: bool, optional
+
+    :ivar objectives: Objective value of each window.
+    :vartype objectives: list[float]
+    :ivar committed: Committed values over the full horizon, by record name.
+    :vartype committed: dict[str, list[float]]
+    :ivar model: Model of the last solved window.
+    :vartype model: Model
+    :ivar solved: Solved windows, with what was carried into them.
+    :vartype solved: list[Window]
+
+    :raises ValueError: If step is not between 1 and window.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[Window], Model],
+        length: int,
+        window: int,
+        step: int,
+        objective: Callable[[Model], Sample],
+        record: dict[str, Callable[[Model], Sample]] | None = None,
+        carry_capacity: bool = True,
+    ):
+        if not 0 < step <= window:
+            raise ValueError(f"step {step} should be between 1 and window {window}")
+
+        self.build = build
+        self.length = length
+        self.window = window
+        self.step = step
+        self.objective = objective
+        self.record = record or {}
+        self.carry_capacity = carry_capacity
+
+        self.objectives: list[float] = []
+        self.committed: dict[str, list[float]] = {name: [] for name in self.record}
+        self.model: Model | None = None
+        self.solved: list[Window] = []
+
+    @property
+    def windows(self) -> list[Window]:
+        """Windows, the last one is truncated at the end of the horizon"""
+        return [
+            Window(
+                n=n,
+                start=start,
+                stop=min(start + self.window, self.length),
+                commit=min(self.step, self.length - start),
+            )
+            for n, start in enumerate(range(0, self.length, self.step))
+        ]
+
+    def solve(self) -> list[float]:
+        """
+        Solves the windows in sequence
+
+        :returns: objective value of each window
+        :rtype: list[float]
+
+        :raises RuntimeError: If a window is infeasible.
+        """
+        inventory: dict[tuple[str, str], float] = {}
+        capacity: dict[tuple[str, str], float] = {}
+
+        for window in self.windows:
+            window.inventory = inventory
+            window.capacity = capacity
+
+            model = self.build(window)
+            self._carry(model, window)
+
+            self.objective(model).opt()
+            if not model.program.optimized:
+                raise RuntimeError(f"{model}: window {window.n} could not be solved")
+
+            self.objectives.append(model.program.obj())
+
+            for name, sample in self.record.items():
+                self.committed[name] += self._commit(sample(model), window.commit)
+
+            densest = model.time.densest
+            # outputs are indexed by (primary, space, time...)
+            inventory = {
+                (str(storage), str(index[1])): value
+                for storage in model.storages
+                for index, value in storage.inventory(model.time.densest)
+                .output(asdict=True)
+                .items()
+                if _position(index, densest) == window.commit - 1
+            }
+
+            if self.carry_capacity:
+                capacity = {}
+                for operation in model.processes + model.storages:
+                    # storages are sized by the capacity of what is stored
+                    primary = getattr(operation, "stored", operation)
+                    aspect = operation.capacity_aspect
+                    if aspect not in primary.aspects:
+                        continue
+                    # every location the operation is sized at
+                    for index, value in aspect.output(asdict=True).items():
+                        if str(index[0]) == str(primary):
+                            capacity[(str(operation), str(index[1]))] = value
+
+            logger.info(
+                "🪟  Solved window %s [%s: %s], committed %s periods",
+                window.n,
+                window.start,
+                window.stop,
+                window.commit,
+            )
+            self.model = model
+            self.solved.append(window)
+
+        return self.objectives
+
+    @staticmethod
+    def _commit(sample: Sample, commit: int) -> list[float]:
+        """Values of a sample in the committed periods, at every other index"""
+        time = sample.time
+        return [
+            value
+            for index, value in sample.output(asdict=True).items()
+            if _position(index, time) < commit
+        ]
+
+    @staticmethod
+    def _carry(model: Model, window: Window):
+        """Carries inventory and capacity into a window model"""
+
+        program = model.program
+        for (name, loc), value in window.inventory.items():
+            storage, location = getattr(model, name), getattr(model, loc)
+            consume = storage.stored.consume(location, model.time.densest)
+            # does the build itself supply the stored resource
+            supplied = location in model.dispositions.get(consume.aspect, {}).get(
+                storage.stored, {}
+            )
+            if supplied:
+                # supplied alongside what the build supplies, in the balance
+                name = f"{storage}_{location}_carried"
+                setattr(program, name, V(*consume.I))
+                carried = getattr(program, name)
+                balance = f"{storage.stored}_{location}_{model.time.densest}_grb"
+                setattr(program, balance, getattr(program, balance) + carried)
+                setattr(program, f"{name}_first", carried[0] == value)
+                if len(carried) > 1:
+                    setattr(program, f"{name}_after", sum(carried[1:]) == 0)
+                continue
+
+            periods = consume.V()
+            # the inventory carried is supplied in the first period only
+            setattr(program, f"{storage}_{location}_carried", periods[0] == value)
+            if len(periods) > 1:
+                # carrying opens no supply in the periods after
+                setattr(
+                    program,
+                    f"{storage}_{location}_uncarried",
+                    sum(periods[1:]) == 0,
+                )
+
+        for (name, loc), value in window.capacity.items():
+            # installed capacity cannot be taken down
+            _ = getattr(model, name).capacity(getattr(model, loc)) >= value
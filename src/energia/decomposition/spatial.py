@@ -0,0 +1,473 @@
+"""Spatial Decomposition along the Location Hierarchy"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from typing import TYPE_CHECKING
+from warnings import warn
+
+import numpy
+from scipy.sparse import csr_array
+
+from ..components.spatial.linkage import Linkage
+from ..components.spatial.location import Location
+
+if TYPE_CHECKING:
+    import gurobipy as gp
+
+    from ..represent.model import Model
+
+logger = logging.getLogger("energia")
+
+
+class _Sites:
+    """
+    Subproblems of a run, their models are built once and only the objective changes.
+    The models and the gurobi Env (which holds a license) are freed by dispose.
+
+    :param sites: subproblem data, A, b, eq, c, lb, ub, vtype, coupled
+    :type sites: list[dict[str, numpy.ndarray | csr_array]]
+    """
+
+    def __init__(self, sites: list[dict[str, numpy.ndarray | csr_array]]):
+        self.sites = sites
+        self.models: dict[int, tuple[gp.Model, gp.MVar]] = {}
+        self.env: gp.Env | None = None
+
+    def model(self, k: int) -> tuple[gp.Model, gp.MVar]:
+        """Model of a site and its variables"""
+        import gurobipy as gp
+
+        if k not in self.models:
+            site = self.sites[k]
+            A, b, eq = site["A"], site["b"], site["eq"]
+            if self.env is None:
+                self.env = gp.Env(params={"OutputFlag": 0})
+            m = gp.Model(env=self.env)
+            x = m.addMVar(
+                len(site["c"]), lb=site["lb"], ub=site["ub"], vtype=site["vtype"]
+            )
+            if (~eq).any():
+                m.addMConstr(A[~eq], x, "<", b[~eq])
+            if eq.any():
+                m.addMConstr(A[eq], x, "=", b[eq])
+            self.models[k] = (m, x)
+        return self.models[k]
+
+    def solve(
+        self,
+        k: int,
+        lam: numpy.ndarray,
+        z: numpy.ndarray,
+        rho: float,
+    ) -> numpy.ndarray:
+        """
+        Solves the augmented Lagrangian of a site
+
+        :param k: position of the site
+        :type k: int
+        :param lam: multipliers of the coupled variables
+        :type lam: numpy.ndarray
+        :param z: consensus values of the coupled variables
+        :type z: numpy.ndarray
+        :param rho: penalty
+        :type rho: float
+
+        :returns: values of the variables of the site
+        :rtype: numpy.ndarray
+
+        :raises RuntimeError: if the site can not be solved
+        """
+        import gurobipy as gp
+
+        site = self.sites[k]
+        m, x = self.model(k)
+        y = x[site["coupled"]]
+        m.setObjective(site["c"] @ x + lam @ y + rho / 2 * (y - z) @ (y - z))
+        m.optimize()
+        if m.Status != gp.GRB.OPTIMAL:
+            raise RuntimeError(
+                f"Site {site['name']} could not be solved, status {m.Status}"
+            )
+        return x.X
+
+    def dispose(self):
+        """Frees the models and the Env"""
+        for m, _ in self.models.values():
+            m.dispose()
+        self.models.clear()
+        if self.env is not None:
+            self.env.dispose()
+            self.env = None
+
+
+# in a worker process, the subproblems of the run whose pool it belongs to
+_WORKER: _Sites | None = None
+
+
+def _init_worker(sites: list[dict[str, numpy.ndarray | csr_array]]):
+    """
+    Sets the subproblems on a worker, they are disposed when the worker exits
+
+    :param sites: subproblem data, A, b, eq, c, lb, ub, vtype, coupled
+    :type sites: list[dict[str, numpy.ndarray | csr_array]]
+    """
+    global _WORKER
+    _WORKER = _Sites(sites)
+    # run as the worker exits, on pool shutdown
+    Finalize(_WORKER, _WORKER.dispose, exitpriority=10)
+
+
+def _solve_site(
+    k: int,
+    lam: numpy.ndarray,
+    z: numpy.ndarray,
+    rho: float,
+) -> numpy.ndarray:
+    """Solves a site on a worker, see _Sites.solve"""
+    return _WORKER.solve(k, lam, z, rho)
+
+
+class Spatial:
+    """
+    Spatial (consensus ADMM) decomposition of a Model.
+
+    Every cluster of Locations makes up a subproblem. By default, each Location
+    directly within the network is a cluster along with all the Locations within it.
+    Linkages belong to the cluster of their source, so flows through a Linkage
+    are shared with the cluster of its sink. Constraints written at the network
+    (totals, for example) make up one more subproblem.
+    Shared variables are copied into each subproblem and are driven to consensus
+    by updating the multipliers.
+
+    Subproblems with integer variables are solved as is,
+    in which case convergence is not guaranteed.
+
+    :param model: Model with an objective set, e.g. using m.usd.spend.obj()
+    :type model: Model
+    :param clusters: Locations in each subproblem, by name. Defaults to None.
+    :type clusters: dict[str, list[Location]], optional
+    :param rho: penalty on disagreement between copies. Defaults to 1.
+    :type rho: float, optional
+    :param tol: relative primal and dual residuals at which to stop. Defaults to 1e-4.
+    :type tol: float, optional
+    :param max_iter: maximum number of iterations. Defaults to 1000.
+    :type max_iter: int, optional
+    :param workers: number of processes for the subproblems, serial if 1. Defaults to None (all cores).
+    :type workers: int, optional
+
+    :ivar sites: positions of the variables in each subproblem, by name.
+    :vartype sites: dict[str, numpy.ndarray]
+    :ivar coupled: positions of the variables shared between subproblems.
+    :vartype coupled: numpy.ndarray
+    :ivar residuals: primal and dual residual at every iteration.
+    :vartype residuals: list[tuple[float, float]]
+    :ivar converged: True if the residuals met the tolerance within max_iter.
+    :vartype converged: bool
+
+    .. note::
+        gurobipy is needed to solve the subproblems, it is imported when solving.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        clusters: dict[str, list[Location]] | None = None,
+        rho: float = 1.0,
+        tol: float = 1e-4,
+        max_iter: int = 1000,
+        workers: int | None = None,
+    ):
+        self.model = model
+        self.rho = rho
+        self.tol = tol
+        self.max_iter = max_iter
+        self.workers = workers
+
+        self.program = model.program
+        self.form = self.program.matrices.form()
+
+        if clusters is None:
+            clusters = self._clusters()
+        self.clusters = clusters
+
+        self.residuals: list[tuple[float, float]] = []
+        self.converged = False
+
+        self._split()
+
+    def _clusters(self) -> dict[str, list[Location]]:
+        """Locations directly within the network, along with all within them"""
+        network = self.model.network
+        children = list(
+            dict.fromkeys(loc for loc in network.has if isinstance(loc, Location))
+        )
+        if not children:
+            return {network.name: [network]}
+        return {loc.name: [loc, *loc.all()] for loc in children}
+
+    def _split(self):
+        """Splits the variables and constraints into subproblems"""
+
+        cluster_of: dict[str, int] = {}
+        for k, locations in enumerate(self.clusters.values()):
+            for loc in locations:
+                cluster_of[loc.name] = k
+
+        def _cluster(loc: Location) -> int | None:
+            """Cluster of a location, through its parents"""
+            while loc is not None:
+                if loc.name in cluster_of:
+                    return cluster_of[loc.name]
+                loc = loc.isin
+            return None
+
+        # Locations (and Linkages) by name
+        space = {
+            s.name: s for s in self.model.space.locations + self.model.space.linkages
+        }
+
+        # the network subproblem comes after the clusters
+        n_clusters = len(self.clusters)
+        network = n_clusters
+
+        variables = self.program.variables
+        # cluster that owns each variable, Locations and Linkages are told apart
+        owner = numpy.full(len(variables), network)
+        at_location = numpy.zeros(len(variables), dtype=bool)
+        for v in variables:
+            for index in v.index:
+                site = space.get(str(index))
+                if site is None:
+                    continue
+                if isinstance(site, Linkage):
+                    k = _cluster(site.source)
+                else:
+                    k = _cluster(site)
+                    at_location[v.n] = k is not None
+                if k is not None:
+                    owner[v.n] = k
+                break
+
+        A = self.form["A"].tocsr()
+        self._substitute(A, owner, network)
+
+        # a constraint with variables at the Locations of one cluster
+        # belongs to that cluster, Linkage constraints go with the source
+        row_owner = numpy.full(A.shape[0], network)
+        row_owner[list(self._totals.values())] = -1
+        for r in numpy.flatnonzero(row_owner == network):
+            cols = A.indices[A.indptr[r] : A.indptr[r + 1]]
+            located = numpy.unique(owner[cols][at_location[cols]])
+            if len(located) == 1:
+                row_owner[r] = located[0]
+            elif not len(located):
+                linked = numpy.unique(owner[cols])
+                if len(linked) == 1:
+                    row_owner[r] = linked[0]
+
+        names = list(self.clusters) + [self.model.network.name]
+        self.sites: dict[str, numpy.ndarray] = {}
+        self._site_rows: dict[str, numpy.ndarray] = {}
+        for k, name in enumerate(names):
+            rows = numpy.flatnonzero(row_owner == k)
+            cols = numpy.union1d(
+                A[rows].indices if len(rows) else [], numpy.flatnonzero(owner == k)
+            ).astype(int)
+            cols = numpy.setdiff1d(cols, list(self._totals))
+            if not len(cols):
+                continue
+            self.sites[name] = cols
+            self._site_rows[name] = rows
+        self._owner = owner
+        self._names = names
+
+        copies = numpy.zeros(len(variables), dtype=int)
+        for cols in self.sites.values():
+            copies[cols] += 1
+        self._copies = copies
+        self.coupled = numpy.flatnonzero(copies > 1)
+
+        logger.info(
+            "✂  Split %s into %s sites sharing %s variables",
+            self.model,
+            len(self.sites),
+            len(self.coupled),
+        )
+
+    def _substitute(self, A: csr_array, owner: numpy.ndarray, network: int):
+        """
+        Totals at the network, t - sum(x) = 0, are definitions.
+        These are substituted out, their cost is passed on to what they sum.
+
+        :param A: constraint matrix
+        :type A: csr_array
+        :param owner: cluster that owns each variable
+        :type owner: numpy.ndarray
+        :param network: position of the network subproblem
+        :type network: int
+        """
+        b, lb = self.form["b"], self.form["lb"]
+        c = self.form["c"].copy()
+        counts = numpy.diff(A.tocsc().indptr)
+
+        # total -> the constraint that defines it
+        self._totals: dict[int, int] = {}
+        for r in numpy.flatnonzero(self.form["eq"]):
+            cols = A.indices[A.indptr[r] : A.indptr[r + 1]]
+            vals = A.data[A.indptr[r] : A.indptr[r + 1]]
+            for t, a in zip(cols, vals):
+                if (
+                    owner[t] != network
+                    or counts[t] != 1
+                    or self.form["integrality"][t]
+                ):
+                    continue
+                others = cols != t
+                weights = -vals[others] / a
+                # t = b/a + sum(weights x) can not go below its bound
+                if lb[t] == 0 and not (
+                    b[r] / a >= 0
+                    and (weights >= 0).all()
+                    and (lb[cols[others]] >= 0).all()
+                ):
+                    continue
+                c[cols[others]] += c[t] * weights
+                c[t] = 0
+                self._totals[t] = r
+                owner[t] = -1
+                break
+
+        self._c = c
+
+    def _subproblems(self) -> list[dict[str, numpy.ndarray | csr_array]]:
+        """Data for the subproblems"""
+        import gurobipy as gp
+
+        A = self.form["A"].tocsr()
+        subs = []
+        for name, cols in self.sites.items():
+            rows = self._site_rows[name]
+            k = self._names.index(name)
+            # objective goes with the owner
+            c = numpy.where(self._owner[cols] == k, self._c[cols], 0)
+            subs.append(
+                {
+                    "name": name,
+                    "A": A[rows][:, cols],
+                    "b": self.form["b"][rows],
+                    "eq": self.form["eq"][rows],
+                    "c": c,
+                    "lb": self.form["lb"][cols],
+                    "ub": self.form["ub"][cols],
+                    "vtype": numpy.where(
+                        self.form["integrality"][cols] == 1,
+                        gp.GRB.INTEGER,
+                        gp.GRB.CONTINUOUS,
+                    ),
+                    "coupled": numpy.flatnonzero(self._copies[cols] > 1),
+                }
+            )
+        return subs
+
+    def solve(self) -> float:
+        """
+        Iterates between the subproblems and the multiplier updates.
+        The solution is loaded into the program only if the residuals meet the tolerance.
+
+        :returns: objective value, of the last iterate if not converged
+        :rtype: float
+        """
+        subs = self._subproblems()
+        sites = list(self.sites.values())
+        # positions of the coupled variables in each subproblem
+        shared = [cols[sub["coupled"]] for cols, sub in zip(sites, subs)]
+
+        rho = self.rho
+        z = numpy.zeros(len(self.program.variables))
+        lams = [numpy.zeros(len(s)) for s in shared]
+
+        if self.workers != 1 and len(subs) > 1:
+            # the subproblems are shipped to every worker only once
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(subs,)
+            )
+            local = None
+        else:
+            pool = None
+            local = _Sites(subs)
+
+        try:
+            for _ in range(self.max_iter):
+                args = (
+                    range(len(subs)),
+                    lams,
+                    [z[s] for s in shared],
+                    [rho] * len(subs),
+                )
+                if pool:
+                    xs = list(pool.map(_solve_site, *args))
+                else:
+                    xs = [local.solve(*arg) for arg in zip(*args)]
+
+                # consensus, average of the copies
+                z_old = z.copy()
+                z = numpy.zeros(len(z))
+                for cols, x in zip(sites, xs):
+                    z[cols] += x
+                z /= numpy.maximum(self._copies, 1)
+
+                primal, norm_lam = 0.0, 0.0
+                for k, (sub, s) in enumerate(zip(subs, shared)):
+                    gap = xs[k][sub["coupled"]] - z[s]
+                    lams[k] = lams[k] + rho * gap
+                    primal += gap @ gap
+                    norm_lam += lams[k] @ lams[k]
+
+                diff = (z - z_old)[self.coupled]
+                primal = numpy.sqrt(primal)
+                dual = rho * numpy.sqrt(diff @ (self._copies[self.coupled] * diff))
+                self.residuals.append((primal, dual))
+
+                scale = numpy.sqrt(len(self.coupled)) or 1
+                if primal <= self.tol * max(
+                    scale, numpy.linalg.norm(z[self.coupled])
+                ) and dual <= self.tol * max(scale, numpy.sqrt(norm_lam)):
+                    self.converged = True
+                    break
+        finally:
+            if pool:
+                pool.shutdown()
+            else:
+                local.dispose()
+
+        A, b = self.form["A"].tocsr(), self.form["b"]
+        for t, r in self._totals.items():
+            cols = A.indices[A.indptr[r] : A.indptr[r + 1]]
+            vals = A.data[A.indptr[r] : A.indptr[r + 1]]
+            a = vals[cols == t][0]
+            z[t] = (b[r] - vals[cols != t] @ z[cols[cols != t]]) / a
+
+        objective = float(self.form["c"] @ z)
+        primal, dual = self.residuals[-1] if self.residuals else (0.0, 0.0)
+
+        if not self.converged:
+            # the consensus may not be feasible, the program is not marked optimized
+            warn(
+                f"{self.model}: spatial decomposition did not converge in "
+                f"{self.max_iter} iterations (residuals {primal:.3g}, {dual:.3g}), "
+                "the solution is not loaded",
+                RuntimeWarning,
+            )
+            return objective
+
+        logger.info(
+            "🔁  Spatial decomposition converged in %s iterations to %.6g",
+            len(self.residuals),
+            objective,
+        )
+
+        self.program.load(z, objective)
+        return objective
@@ -1,29 +1,48 @@
 """Process conversion models (external libraries)"""
 
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 import numpy as np
-from pandas import DataFrame
+from pandas import DataFrame, DatetimeIndex
+
+from ..utils.shared import SharedArrays, attach
 
 logger = logging.getLogger("energia")
 
+# either library can be installed without the other
 try:
     from pvlib.location import Location as PVLocation
     from pvlib.modelchain import ModelChain as PVModelChain
     from pvlib.pvsystem import PVSystem, retrieve_sam
     from pvlib.temperature import TEMPERATURE_MODEL_PARAMETERS
 
-    import_all = False
+    has_pvlib = True
 except ImportError:
-    import_all = True
+    has_pvlib = False
 
 try:
     from windpowerlib import ModelChain as WModelChain
     from windpowerlib import WindTurbine
 
-    import_all = False
+    has_windpowerlib = True
 except ImportError:
-    import_all = True
+    has_windpowerlib = False
+
+
+@lru_cache(maxsize=None)
+def sam_database(name: str) -> DataFrame:
+    """
+    SAM module or inverter database, parsed once per process
+
+    :param name: name of the database, e.g. 'cecmod', 'cecinverter'
+    :type name: str
+
+    :returns: database with a column for every module or inverter
+    :rtype: DataFrame
+    """
+    return retrieve_sam(name)
 
 
 def pvlib(
@@ -69,16 +88,14 @@ def pvlib(
     """
     # data = data.resample('H').mean()
 
-    if import_all:
+    if not has_pvlib:
         logger.warning(
             "⚠ This is an optional feature. Please install pvlib, or pip install energiapy[all] ⚠",
         )
         return None
 
-    modules = retrieve_sam(sam)
-    module_parameters = modules[module_params]
-    inverters = retrieve_sam(inverter)
-    inverter_parameters = inverters[inverter_params]
+    module_parameters = sam_database(sam)[module_params]
+    inverter_parameters = sam_database(inverter)[inverter_params]
     tparams = TEMPERATURE_MODEL_PARAMETERS["sapm"][temperature_params]
     system = PVSystem(
         module_parameters=module_parameters,
@@ -99,6 +116,95 @@ def pvlib(
     return [float(i) for i in array]
 
 
+def _pvlib_run(args: tuple[DataFrame, tuple[float, float], dict]) -> list[float]:
+    """Runs pvlib for one site and system configuration"""
+    data, coord, config = args
+    return pvlib(data, coord, **config)
+
+
+def _pvlib_run_shared(
+    args: tuple[dict, int, tuple[list[str], str | None], tuple[float, float], dict],
+) -> list[float]:
+    """Runs pvlib for one site and system configuration, on shared weather data"""
+    handle, n, (columns, tz), coord, config = args
+    arrays = attach(handle)
+    # shared as UTC datetime64
+    index = DatetimeIndex(arrays["index"])
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    data = DataFrame(arrays["weather"][n], index=index, columns=columns, copy=False)
+    return pvlib(data, coord, **config)
+
+
+def pvlib_fleet(
+    data: list[DataFrame],
+    coords: list[tuple[float, float]],
+    configs: list[dict] | None = None,
+    workers: int | None = None,
+) -> np.ndarray | None:
+    """
+    Calculates solar power output for many sites and system configurations
+
+    Runs are spread over a process pool,
+    where each process parses the SAM databases only once.
+    The weather data is written once to shared memory,
+    processes read it in place instead of receiving pickled copies.
+
+    :param data: weather data at each site, see pvlib
+    :type data: list[DataFrame]
+    :param coords: latitude and longitude of each site
+    :type coords: list[tuple[float, float]]
+    :param configs: keyword arguments for pvlib, one per system configuration. Defaults to None (pvlib defaults).
+    :type configs: list[dict], optional
+    :param workers: number of processes, serial if 1. Defaults to None (all cores).
+    :type workers: int, optional
+
+    :returns: AC output with a row for each (site, configuration), site major
+    :rtype: numpy.ndarray | None
+
+    :raises ValueError: if the weather data at the sites are not aligned
+    """
+    if not has_pvlib:
+        logger.warning(
+            "⚠ This is an optional feature. Please install pvlib, or pip install energiapy[all] ⚠",
+        )
+        return None
+
+    if len({len(d) for d in data}) > 1:
+        raise ValueError("Weather data at all sites should be of the same length")
+
+    configs = configs or [{}]
+
+    if workers == 1 or len(data) * len(configs) == 1:
+        outputs = [
+            _pvlib_run((d, coord, config))
+            for d, coord in zip(data, coords)
+            for config in configs
+        ]
+        return np.array(outputs, dtype=float)
+
+    # all sites share the index and columns of the first
+    columns = list(data[0].columns)
+    index = data[0].index
+    tz = str(index.tz) if index.tz is not None else None
+    weather = np.stack([d[columns].to_numpy(dtype=float) for d in data])
+    dates = (index.tz_convert(None) if tz else index).to_numpy()
+
+    with SharedArrays({"weather": weather, "index": dates}) as shared:
+        runs = [
+            (shared.handle, n, (columns, tz), coord, config)
+            for n, coord in enumerate(coords)
+            for config in configs
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # runs at a site go to the same process
+            outputs = list(
+                pool.map(_pvlib_run_shared, runs, chunksize=len(configs))
+            )
+
+    return np.array(outputs, dtype=float)
+
+
 def windpowerlib(
     data: DataFrame,
     roughness_length: float = 0.1,
@@ -144,7 +250,7 @@ def windpowerlib(
     """
 
     # df_ = df_.dropna()
-    if import_all:
+    if not has_windpowerlib:
         logger.warning(
             "⚠ This is an optional feature. Please install windpowerlib, or pip install energiapy[all] ⚠",
         )
@@ -190,3 +296,162 @@ def windpowerlib(
     # calculate power output
     mc_turbine = WModelChain(turbine, **modelchain_data).run_model(data)
     return list(mc_turbine.power_output)
+
+
+@lru_cache(maxsize=None)
+def turbine_curves(turbine_type: str) -> dict[str, float | np.ndarray | None]:
+    """
+    Power and power coefficient curves of a turbine, read once per process
+
+    :param turbine_type: turbine in the oedb turbine library, e.g. 'V100/1800'
+    :type turbine_type: str
+
+    :returns: nominal_power, rotor_diameter, and (wind speeds, values) of power_curve and power_coefficient_curve
+    :rtype: dict[str, float | numpy.ndarray | None]
+    """
+    # hub height does not change the curves, but has to clear the rotor
+    turbine = WindTurbine(turbine_type=turbine_type, hub_height=1000)
+
+    def _curve(curve: DataFrame | None) -> np.ndarray | None:
+        if curve is None:
+            return None
+        return np.array([curve["wind_speed"], curve["value"]], dtype=float)
+
+    return {
+        "nominal_power": float(turbine.nominal_power),
+        "rotor_diameter": float(turbine.rotor_diameter or 0),
+        "power_curve": _curve(turbine.power_curve),
+        "power_coefficient_curve": _curve(turbine.power_coefficient_curve),
+    }
+
+
+def _interp_rows(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    np.interp with a different (increasing) xp for every x, zero outside xp
+
+    :param x: points, shape (...)
+    :type x: numpy.ndarray
+    :param xp: points of the curve for every x, shape (..., K)
+    :type xp: numpy.ndarray
+    :param fp: values of the curve, shape (K,)
+    :type fp: numpy.ndarray
+
+    :returns: interpolated values, shape (...)
+    :rtype: numpy.ndarray
+    """
+    k = np.clip((xp <= x[..., None]).sum(axis=-1), 1, len(fp) - 1)
+    lo = np.take_along_axis(xp, (k - 1)[..., None], axis=-1)[..., 0]
+    hi = np.take_along_axis(xp, k[..., None], axis=-1)[..., 0]
+    values = fp[k - 1] + (x - lo) / (hi - lo) * (fp[k] - fp[k - 1])
+    return np.where((x < xp[..., 0]) | (x > xp[..., -1]), 0, values)
+
+
+def windpowerlib_fleet(
+    data: list[DataFrame],
+    turbine_types: list[str],
+    hub_heights: list[float],
+    roughness_length: float = 0.1,
+    power_output_model: str = "power_coefficient_curve",
+    density_correction: bool = True,
+    obstacle_height: float = 0,
+    observation_height: float = 10,
+    normalize: bool = False,
+) -> np.ndarray | None:
+    """
+    Calculates wind power output for many sites and turbine types at once
+
+    Same as windpowerlib with a logarithmic wind speed profile,
+    a linear temperature gradient and ideal gas density,
+    but evaluated on arrays for all sites together.
+    The weather data is only read, never copied or modified.
+
+    :param data: weather data at each site with wind_speed, air_temperature, surface_pressure
+    :type data: list[DataFrame]
+    :param turbine_types: turbines in the oedb turbine library
+    :type turbine_types: list[str]
+    :param hub_heights: hub height of each turbine
+    :type hub_heights: list[float]
+    :param roughness_length: Defaults to 0.1.
+    :type roughness_length: float, optional
+    :param power_output_model: 'power_curve' or 'power_coefficient_curve'. Defaults to 'power_coefficient_curve'.
+    :type power_output_model: str, optional
+    :param density_correction: correct the power curve for density. Defaults to True.
+    :type density_correction: bool, optional
+    :param obstacle_height: Defaults to 0.
+    :type obstacle_height: float, optional
+    :param observation_height: Defaults to 10.
+    :type observation_height: float, optional
+    :param normalize: divide by the nominal power of the turbine. Defaults to False.
+    :type normalize: bool, optional
+
+    :returns: power output of shape (sites, turbines, time steps)
+    :rtype: numpy.ndarray | None
+
+    :raises ValueError: if the weather data at the sites are not aligned
+    """
+    if not has_windpowerlib:
+        logger.warning(
+            "⚠ This is an optional feature. Please install windpowerlib, or pip install energiapy[all] ⚠",
+        )
+        return None
+
+    if len({len(d) for d in data}) > 1:
+        raise ValueError("Weather data at all sites should be of the same length")
+
+    # (sites, time steps)
+    wind_speed = np.array([d["wind_speed"].to_numpy() for d in data], dtype=float)
+    temperature = (
+        np.array([d["air_temperature"].to_numpy() for d in data], dtype=float)
+        + 273.15
+    )
+    pressure = (
+        np.array([d["surface_pressure"].to_numpy() for d in data], dtype=float) * 100
+    )
+
+    displacement = 0.7 * obstacle_height
+    output = np.empty((len(data), len(turbine_types), wind_speed.shape[1]))
+
+    for m, (turbine_type, hub_height) in enumerate(zip(turbine_types, hub_heights)):
+        curves = turbine_curves(turbine_type)
+
+        # logarithmic wind profile
+        wind_hub = (
+            wind_speed
+            * np.log((hub_height - displacement) / roughness_length)
+            / np.log((observation_height - displacement) / roughness_length)
+        )
+        # linear temperature gradient
+        temperature_hub = temperature - 0.0065 * (hub_height - observation_height)
+        # ideal gas, pressure is brought to the hub by the barometric formula
+        density_hub = (
+            (pressure / 100 - (hub_height - observation_height) / 8)
+            * 100
+            / (287.058 * temperature_hub)
+        )
+
+        if power_output_model == "power_coefficient_curve":
+            speeds, cp = curves["power_coefficient_curve"]
+            power = (
+                1
+                / 8
+                * density_hub
+                * curves["rotor_diameter"] ** 2
+                * np.pi
+                * wind_hub**3
+                * np.interp(wind_hub, speeds, cp, left=0, right=0)
+            )
+        else:
+            speeds, values = curves["power_curve"]
+            if density_correction:
+                # the power curve shifts with density, differently at every time step
+                exponent = np.interp(speeds, [7.5, 12.5], [1 / 3, 2 / 3])
+                shifted = speeds * (1.225 / density_hub[..., None]) ** exponent
+                power = _interp_rows(wind_hub, shifted, values)
+            else:
+                power = np.interp(wind_hub, speeds, values, left=0, right=0)
+
+        if normalize:
+            power = power / curves["nominal_power"]
+        output[:, m, :] = power
+
+    return output
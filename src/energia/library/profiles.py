@@ -0,0 +1,193 @@
+"""Capacity factor profiles from weather data, for many sites and years"""
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+import numpy as np
+from pandas import DataFrame
+
+from ..utils.nsrdb import fetch_nsrdb_sites
+from .external import pvlib, windpowerlib
+
+logger = logging.getLogger("energia")
+
+# weather attributes needed by each model
+ATTRS = {
+    "solar": [
+        "dni",
+        "dhi",
+        "ghi",
+        "air_temperature",
+        "dew_point",
+        "relative_humidity",
+        "wind_speed",
+    ],
+    "wind": ["wind_speed", "air_temperature", "surface_pressure"],
+}
+
+
+def cache_key(
+    site: tuple[float, float],
+    year: int,
+    kind: str,
+    resolution: str,
+    params: dict,
+) -> str:
+    """
+    Key of a profile in the cache
+
+    :param site: (latitude, longitude)
+    :type site: tuple[float, float]
+    :param year: year of the weather data
+    :type year: int
+    :param kind: 'solar' or 'wind'
+    :type kind: str
+    :param resolution: resolution of the weather data
+    :type resolution: str
+    :param params: parameters passed on to the model
+    :type params: dict
+
+    :returns: hash of the inputs
+    :rtype: str
+    """
+    inputs = json.dumps(
+        [[round(float(i), 6) for i in site], year, kind, resolution, params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(inputs.encode()).hexdigest()[:32]
+
+
+def _model(kind: str, data: DataFrame, site: tuple[float, float], params: dict):
+    """Runs the power model of a kind"""
+    if kind == "solar":
+        return pvlib(data, site, **params)
+    # windpowerlib adds columns to the data it is given
+    return windpowerlib(data.copy(), **params)
+
+
+def capacity_factors(
+    sites: list[tuple[float, float]],
+    years: list[int],
+    kind: Literal["solar", "wind"] = "solar",
+    resolution: str = "hourly",
+    rating: float | None = None,
+    cache: str | None = None,
+    mirror: str | None = None,
+    index: str | None = None,
+    workers: int = 8,
+    fetch: Callable = fetch_nsrdb_sites,
+    model: Callable | None = None,
+    **params,
+) -> dict[tuple[tuple[float, float], int], np.ndarray]:
+    """
+    Capacity factor profiles for many sites and years.
+
+    Weather data for all missing sites in a year is fetched in one batched call,
+    years are fetched concurrently.
+    Profiles are cached as compressed files keyed by (site, year, kind, resolution, rating, params),
+    so only missing profiles are ever fetched and computed.
+
+    :param sites: (latitude, longitude) of the sites
+    :type sites: list[tuple[float, float]]
+    :param years: years of weather data
+    :type years: list[int]
+    :param kind: 'solar' (pvlib) or 'wind' (windpowerlib). Defaults to 'solar'.
+    :type kind: Literal['solar', 'wind'], optional
+    :param resolution: choose from 'halfhourly', 'hourly', 'daily'. Defaults to 'hourly'.
+    :type resolution: str, optional
+    :param rating: rated output, the profile is scaled to its peak if None. Defaults to None.
+    :type rating: float, optional
+    :param cache: directory with cached profiles. Defaults to None (no caching).
+    :type cache: str, optional
+    :param mirror: directory with a local copy of the NSRDB. Defaults to None (remote).
+    :type mirror: str, optional
+    :param index: directory with the persisted NSRDB site index. Defaults to None.
+    :type index: str, optional
+    :param workers: number of years fetched at once. Defaults to 8.
+    :type workers: int, optional
+    :param fetch: fetches weather data for sites, as fetch_nsrdb_sites. Defaults to fetch_nsrdb_sites.
+    :type fetch: Callable, optional
+    :param model: gives the output for the weather data at a site. Defaults to pvlib or windpowerlib.
+    :type model: Callable, optional
+    :param params: passed on to the model
+
+    :returns: capacity factor profile, by (site, year)
+    :rtype: dict[tuple[tuple[float, float], int], numpy.ndarray]
+    """
+    if model is None:
+
+        def model(data, site):
+            return _model(kind, data, site, params)
+
+    # the rating changes the profile as much as the model parameters
+    _params = {**params, "rating": rating}
+
+    profiles: dict[tuple[tuple[float, float], int], np.ndarray] = {}
+    missing: dict[int, list[tuple[float, float]]] = {}
+
+    for year in years:
+        for site in sites:
+            path = None
+            if cache is not None:
+                key = cache_key(site, year, kind, resolution, _params)
+                path = os.path.join(cache, f"{key}.npz")
+            if path is not None and os.path.exists(path):
+                with np.load(path) as f:
+                    profiles[(site, year)] = f["profile"]
+            else:
+                missing.setdefault(year, []).append(site)
+
+    if not missing:
+        return profiles
+
+    def _fetch(year: int):
+        """Fetches the weather at all missing sites of a year"""
+        return year, fetch(
+            ATTRS[kind],
+            year,
+            missing[year],
+            resolution=resolution,
+            mirror=mirror,
+            index=index,
+        )
+
+    # fetching is I/O bound
+    with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+        fetched = list(pool.map(_fetch, missing))
+
+    if cache is not None:
+        os.makedirs(cache, exist_ok=True)
+
+    for year, result in fetched:
+        if result is None:
+            logger.warning("⚠ Weather data for %s could not be fetched ⚠", year)
+            continue
+        _, weather = result
+        for n, site in enumerate(missing[year]):
+            output = model(weather[n], site)
+            if output is None:
+                continue
+            output = np.asarray(output, dtype=float)
+            peak = rating or output.max() or 1
+            profile = output / peak
+            profiles[(site, year)] = profile
+
+            if cache is not None:
+                key = cache_key(site, year, kind, resolution, _params)
+                np.savez_compressed(
+                    os.path.join(cache, f"{key}.npz"), profile=profile
+                )
+
+    logger.info(
+        "☀  Computed %s and loaded %s capacity factor profiles",
+        sum(len(s) for s in missing.values()),
+        len(sites) * len(years) - sum(len(s) for s in missing.values()),
+    )
+
+    return profiles
@@ -105,7 +105,7 @@ class Balance(_Hash):
     def updated_part(self) -> V | F | int:
         """Returns the part of the constraint that is new"""
 
-        if self.stored and self.aspect == "inventory":
+        if self.stored and self.aspect.name == "inventory":
             # if inventory is being add to GRB
 
             if len(self.time) == 1:
@@ -191,9 +191,10 @@ class Balance(_Hash):
         Updates the constraints in all the indices of self.domain
         Add constraint name to aspect
         """
-        self.domain.inform_components_of_cons(self.cons_name)
+        cons: C = getattr(self.program, self.cons_name)
+        self.domain.inform_components_of_cons(cons)
 
-        self.aspect.constraints.add(self.cons_name)
+        self.aspect.inform(cons)
 
         # update the GRB aspects
         self.existing_aspects.append(self)
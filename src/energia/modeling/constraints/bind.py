@@ -6,8 +6,10 @@ import logging
 from functools import cached_property
 from typing import TYPE_CHECKING
 
+import numpy
+
 from ...utils.decorators import timer
-from ...utils.math import normalize
+from ...utils.math import isnested, isvector, normalize, scale, to_list
 
 logger = logging.getLogger("energia")
 from gana import V
@@ -52,6 +54,10 @@ class Bind:
     :vartype report: bool
     :ivar program: The program to which the sample belongs.
     :vartype program: Prg
+    :ivar pool: Pool of the scenario, where vector parameters are interned.
+    :vartype pool: Pool
+    :ivar vector: Interned read-only vector of the parameter, if a vector.
+    :vartype vector: numpy.ndarray | None
     """
 
     def __init__(
@@ -75,6 +81,8 @@ class Bind:
         self._parameter, self.parameter_name = parameter, parameter_name
         self.leq, self.geq, self.eq = leq, geq, eq
         self.forall = forall
+        # interned vector of the parameter, set if the parameter is a vector
+        self.vector: numpy.ndarray | None = None
 
         self._handshake()
 
@@ -128,7 +136,6 @@ class Bind:
             return False
 
         self._categorize()
-        self._inform()
 
         # set the constraint
         setattr(
@@ -136,6 +143,8 @@ class Bind:
             self.cons_name,
             self.cons,
         )
+        # informed once set, and given an id, in the program
+        self._inform()
         # returned for @timer
         return self.sample, self.rel
 
@@ -143,23 +152,39 @@ class Bind:
     def parameter(self):
         """Parameter bound of the bind constraint"""
 
+        if self.nominal and isnested(self._parameter):
+            # lists of lists (e.g. for modes) are normalized list by list
+            # and stay lists, they may be ragged and are not interned
+            _parameter = normalize(self._parameter) if self.norm else self._parameter
+            return [
+                to_list(self.nominal * numpy.asarray(i, dtype=float))
+                for i in _parameter
+            ]
+
         if self.nominal:
             # if a nominal value for the self.parameter is passed
             # this is essentially the expectation
-            # skipping an instance check here
-            # if a non iterable is passed, let an error be raised
-            _parameter = normalize(self._parameter) if self.norm else self._parameter
+            # bounds (tuples) become the columns of a 2-D array
+            _parameter = numpy.asarray(self._parameter, dtype=float)
+            if self.norm:
+                _parameter = scale(_parameter)
 
             # if the sample needs to be normalized
-            _parameter = [
-                (
-                    (self.nominal * i[0], self.nominal * i[1])
-                    if isinstance(i, tuple)
-                    else self.nominal * i
-                )
-                for i in _parameter
-            ]
-            return _parameter
+            # gana takes lists, convert back only here
+            # identical vectors are stored once in the pool of the scenario
+            self.vector = self.pool.intern(self.nominal * _parameter)
+            return self.pool.tolist(self.vector)
+
+        if isvector(self._parameter) and not isnested(self._parameter):
+            try:
+                _parameter = numpy.asarray(self._parameter)
+            except ValueError:
+                # ragged, e.g. bounds of different lengths, left to gana
+                return self._parameter
+            if _parameter.dtype.kind in "biuf":
+                # not interned if not numeric, e.g. a list of mode bounds
+                self.vector = self.pool.intern(_parameter)
+                return self.pool.tolist(self.vector)
         return self._parameter
 
     @cached_property
@@ -321,14 +346,7 @@ class Bind:
     def _check_existing(self) -> bool:
         """Checks if aspect already has been bound in that space"""
         if not self.iscalc and not self.domain.modes:
-            try:
-                if self.model.scenario[self.aspect][self.domain.primary][
-                    self.domain.space
-                ][self.domain.time][self.rel]:
-                    return True
-
-            except KeyError:
-                pass
+            return self.model.scenario.has(self.sample, self.rel)
 
         return False
 
@@ -346,13 +364,16 @@ class Bind:
         """Informs the aspect and domain about the bind constraint"""
 
         # let the aspect know about the new constraint
-        self.aspect.constraints.add(self.cons_name)
+        self.aspect.inform(self.cons)
 
         # let all objects in the domain know that
         # a constraint with this name contains it
-        self.domain.inform_components_of_cons(self.cons_name)
+        self.domain.inform_components_of_cons(self.cons)
+
+        self.model.scenario.update(self.sample, self.rel, self.P, self.vector)
 
-        self.model.scenario.update(self.sample, self.rel, self.P)
+        # demands and objective-relevant streams are targets in the graph
+        self.model.graph.bind(self)
 
     def _handshake(self):
         """Borrow attributes from sample"""
@@ -365,6 +386,7 @@ class Bind:
         self.report = self.sample.report
         self.program = self.sample.program
         self.of = self.sample.of
+        self.pool = self.model.scenario.pool
 
     @property
     def P(self):
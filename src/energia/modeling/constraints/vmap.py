@@ -359,8 +359,9 @@ class Map:
 
     def _inform(self, from_domain: Domain):
         """Inform components of new constraint"""
-        self.aspect.constraints.add(self.cons_name)
-        from_domain.inform_components_of_cons(self.cons_name)
+        cons: C = getattr(self.program, self.cons_name)
+        self.aspect.inform(cons)
+        from_domain.inform_components_of_cons(cons)
 
     def _handshake(self):
         """Borrow attributes from aspect"""
@@ -12,6 +12,7 @@ from ..._core._hash import _Hash
 if TYPE_CHECKING:
     from gana import I as Idx
     from gana import V
+    from gana.sets.constraint import C
 
     from ..._core._x import _X
     from ...components.commodities.commodity import Commodity
@@ -204,6 +205,14 @@ class Domain(_Hash):
         """Disposition"""
         return tuple(self._.keys())
 
+    @property
+    def uids(self) -> tuple[int, int, int]:
+        """Dense ids (see _X.uid) of the primary component, space and time,
+        -1 if not a component (samples as primary, lags)"""
+        return tuple(
+            getattr(i, "uid", -1) for i in (self.primary, self.space, self.time)
+        )
+
     # -----------------------------------------------------
     #                    Naming
     # -----------------------------------------------------
@@ -391,10 +400,17 @@ class Domain(_Hash):
     #                    Helpers
     # -----------------------------------------------------
 
-    def inform_components_of_cons(self, cons_name: str):
-        """Update the constraints declared at every index"""
+    def inform_components_of_cons(self, cons: C):
+        """Update the constraints declared at every index
+
+        :param cons: constraint set declared in the program
+        :type cons: C
+        """
+        if self.model is not None and self.model.lean:
+            # only needed to inspect components (show, cons)
+            return
         for idx in self.index:
-            idx.constraints.add(cons_name)
+            idx.inform(cons)
 
     def inform_components_of_domain(self, aspect: Aspect):
         """
@@ -404,10 +420,16 @@ class Domain(_Hash):
         :param aspect: Aspect being modeled
         :type aspect: Aspect
         """
+        lean = self.model is not None and self.model.lean
         for i, j in self._.items():
             if i == "samples" or (self.lag and i == "time"):
                 # lags disappear anyway, so dont bother
                 continue
+            if lean:
+                # only note that the component is modeled in the aspect
+                # the (shared) empty frozenset holds no domains
+                j.aspects.setdefault(aspect, frozenset())
+                continue
             # these are dependent variables, so do not update them
             if self not in j.domains:
                 # check and update the domains at each index
@@ -12,6 +12,7 @@ from gana import V, inf, sigma, sup
 
 from ..._core._hash import _Hash
 from ...utils.dictionary import merge_trees
+from ...utils.math import isvector
 from ..constraints.bind import Bind
 
 logger = logging.getLogger("energia")
@@ -174,8 +175,8 @@ class Sample(_Hash):
 
     def _match_time(self):
         """Matches an appropriate temporal scale"""
-        if isinstance(self.parameter, list):
-            # if list is given, find using length of the list
+        if isvector(self.parameter):
+            # if a list (array, Series) is given, find using its length
             if self.domain.modes is not None:
                 return self.aspect.time.find(
                     len(self.parameter) / len(self.domain.modes),
@@ -323,10 +324,12 @@ class Sample(_Hash):
             # if a variable has not been created for the self.I
             # create a variable
             # all energia variables are mutable by default
+            # lean models do not render LaTeX
+            ltx = "" if self.model.lean else self.aspect.latex
             setattr(
                 self.program,
                 self.aspect.name,
-                V(*self.I, mutable=True, ltx=self.aspect.latex),
+                V(*self.I, mutable=True, ltx=ltx),
             )
             self._inform()
 
@@ -359,11 +362,12 @@ class Sample(_Hash):
         #   calc = v * param
         #   calc_incidental = v_reporting * param_incidental
         # named with a superscript inc
-        ltx = (
-            self.aspect.latex + r"^{inc}"
-            if self.aspect.latex
-            else self.aspect.name + r"^{inc}"
-        )
+        if self.model.lean:
+            ltx = ""
+        elif self.aspect.latex:
+            ltx = self.aspect.latex + r"^{inc}"
+        else:
+            ltx = self.aspect.name + r"^{inc}"
 
         # create an incidental variable (continuous)
         setattr(
@@ -403,12 +407,13 @@ class Sample(_Hash):
         ):
 
             # if the bound variable has not been defined at the given space
-            logger.info(
-                "Aspect (%s) not defined at %s, a variable will be created assuming %s as the temporal index",
-                bound_aspect,
-                self.domain.space,
-                self.model.horizon,
-            )
+            if not self.model.lean:
+                logger.info(
+                    "Aspect (%s) not defined at %s, a variable will be created assuming %s as the temporal index",
+                    bound_aspect,
+                    self.domain.space,
+                    self.model.horizon,
+                )
 
             domain = self.domain.edit({"periods": self.model.horizon})
 
@@ -453,7 +458,9 @@ class Sample(_Hash):
 
         # these are basically named using a breve over the variable name or latex name
 
-        if self.aspect.latex:
+        if self.model.lean:
+            ltx = ""
+        elif self.aspect.latex:
             ltx = r"{\breve{" + self.aspect.latex + r"}}"
         else:
             ltx = r"{\breve{" + self.aspect.name + r"}}"
@@ -546,16 +553,19 @@ class Sample(_Hash):
 
         self.program.renumber()
 
-    def opt(self, maximize: bool = False):
+    def opt(self, maximize: bool = False, using: str | None = None, **options):
         """
         Optimize
 
         :param maximize: if maximization, defaults to False
         :type maximize: bool, optional
+        :param using: solver, defaults to None (the solver of the model)
+        :type using: str, optional
+        :param options: passed on to the solver backend
         """
         self.obj(maximize)
         # optimize!
-        self.program.opt()
+        self.program.opt(using=using, **options)
 
     def bounds(self):
         """Finds the bounds of the variable"""
@@ -595,11 +605,10 @@ class Sample(_Hash):
     def show(self, descriptive=False):
         """Pretty print constraints"""
 
-        for c in (
-            set(chain.from_iterable(i.constraints for i in self.index))
-            & self.aspect.constraints
+        for n in set(chain.from_iterable(i.cons_ids for i in self.index)) & set(
+            self.aspect.cons_ids
         ):
-            cons: C = getattr(self.program, c)
+            cons: C = self.program.constraint_sets[n]
             cons.show(descriptive)
 
     def bar(
@@ -776,12 +785,18 @@ class FuncOfSamples:
         setattr(self.program, f"ge_{self.F.name}", func)
         return func
 
-    def opt(self, maximize=False):
+    def opt(self, maximize: bool = False, using: str | None = None, **options):
         """Optimize the function
 
-        :param max: if maximization, defaults to False
-        :type max: bool, optional
+        :param maximize: if maximization, defaults to False
+        :type maximize: bool, optional
+        :param using: solver, defaults to None (the solver of the model)
+        :type using: str, optional
+        :param options: passed on to the solver backend
         """
 
-        setattr(self.program, f"min_{self.F.name}", inf(self.F))
-        self.program.opt(maximize=maximize)
+        if maximize:
+            setattr(self.program, f"max_{self.F.name}", sup(self.F))
+        else:
+            setattr(self.program, f"min_{self.F.name}", inf(self.F))
+        self.program.opt(using=using, **options)
@@ -6,9 +6,12 @@ from collections.abc import Mapping
 from functools import cached_property
 from typing import TYPE_CHECKING, Self
 
+import numpy
+
 from ..._core._hash import _Hash
 from ...components.temporal.lag import Lag
 from ...components.temporal.modes import Modes
+from ...utils.math import isvector, readonly, to_list
 
 if TYPE_CHECKING:
     from gana import Prg
@@ -55,6 +58,11 @@ class Conversion(Mapping, _Hash):
 
     """
 
+    # array * Conversion and Series * Conversion are left to __rmul__,
+    # not applied elementwise
+    __array_ufunc__ = None
+    __pandas_priority__ = 5000
+
     def __init__(
         self,
         aspect: str = "",
@@ -163,7 +171,7 @@ class Conversion(Mapping, _Hash):
             check_len = dict.fromkeys(conversion.keys(), 1)
 
             for res, par in conversion.items():
-                if isinstance(par, list):
+                if isvector(par):
                     check_list[res] = True
                     check_len[res] = len(par)
 
@@ -179,10 +187,16 @@ class Conversion(Mapping, _Hash):
             if any(check_list.values()):
                 length = next(iter(lengths))
                 # if any of the values are a list
-                #
+                # arrays are broadcast to read-only views, nothing is copied
+                arrays = not all(
+                    isinstance(par, list) for par in conversion.values() if isvector(par)
+                )
                 for res, par in conversion.items():
                     if isinstance(par, (float, int)):
-                        conversion[res] = [par] * length
+                        if arrays:
+                            conversion[res] = numpy.broadcast_to(float(par), length)
+                        else:
+                            conversion[res] = [par] * length
             return conversion
 
         self.balance = _balancer(self.balance)
@@ -245,7 +259,7 @@ class Conversion(Mapping, _Hash):
                 time = self.time_checker(res, space, time)
                 _ = self.model.balances[res].get(space, {})
 
-            eff = par if isinstance(par, list) else [par]
+            eff = to_list(numpy.asarray(par)) if isvector(par) else [par]
 
             decision = getattr(self.operation, self.aspect)
 
@@ -390,6 +404,10 @@ class Conversion(Mapping, _Hash):
     def __mul__(self, times: int | float | list) -> Self:
         if isinstance(times, list):
             self.balance = {res: [par * i for i in times] for res, par in self.items()}
+        elif isvector(times):
+            # broadcast against arrays and Series
+            times = readonly(times)
+            self.balance = {res: par * times for res, par in self.items()}
         else:
             self.balance = {res: par * times for res, par in self.items()}
         return self
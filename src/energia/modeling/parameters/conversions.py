@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy
+
+from ...utils.math import isvector, to_list
 from .conversion import Conversion
 
 if TYPE_CHECKING:
@@ -105,7 +108,7 @@ class Transportation(Conversion):
 
         par = self[res]
 
-        eff = par if isinstance(par, list) else [par]
+        eff = to_list(numpy.asarray(par)) if isvector(par) else [par]
 
         decision = getattr(self.operation, self.aspect)
 
@@ -0,0 +1,186 @@
+"""Pool of interned parameter vectors"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from weakref import WeakValueDictionary
+
+import numpy
+
+from ..._core._hash import _Hash
+from ...utils.math import readonly, to_list
+from ...utils.shared import SharedArrays, attach
+
+logger = logging.getLogger("energia")
+
+
+class Pool(_Hash):
+    """
+    Interned parameter vectors.
+    Every unique vector (by content) is stored once, as a read-only array,
+    binds with identical profiles (e.g. a demand shape shared by many cities)
+    reference the same array, as does the scenario (Scenario.vectors).
+
+    Vectors are held weakly, an entry is evicted once nothing else
+    (the scenario, or a caller) holds the array.
+    gana copies the values it is handed into its own parameter sets,
+    those copies are not shared, and are not counted here.
+    Only the array is kept, the list form is made when asked for.
+
+    :param name: Name of the pool. Defaults to 'Pool'.
+    :type name: str, optional
+
+    :ivar vectors: read-only vectors by content hash, while held elsewhere
+    :vartype vectors: WeakValueDictionary[str, numpy.ndarray]
+    :ivar interned: number of vectors interned
+    :vartype interned: int
+    """
+
+    def __init__(self, name: str = "Pool"):
+        self.name = name
+        self.vectors: WeakValueDictionary[str, numpy.ndarray] = WeakValueDictionary()
+        self.interned = 0
+        # views of shared memory (see attach), held as long as the pool
+        self._attached: dict[str, numpy.ndarray] = {}
+
+    @staticmethod
+    def key(data: numpy.ndarray) -> str:
+        """
+        Content hash of a vector
+
+        :param data: vector
+        :type data: numpy.ndarray
+
+        :returns: hash of the shape and values
+        :rtype: str
+        """
+        data = numpy.ascontiguousarray(data, dtype=float)
+        digest = hashlib.blake2b(str(data.shape).encode(), digest_size=16)
+        digest.update(data.tobytes())
+        return digest.hexdigest()
+
+    def intern(self, data) -> numpy.ndarray:
+        """
+        Stores a vector, if an identical one is not already stored
+
+        :param data: vector
+        :type data: list | numpy.ndarray | Series
+
+        :returns: the stored read-only vector
+        :rtype: numpy.ndarray
+        """
+        data = numpy.asarray(data, dtype=float)
+        key = self.key(data)
+        vector = self.vectors.get(key)
+        if vector is None:
+            vector = readonly(numpy.array(data))
+            self.vectors[key] = vector
+        self.interned += 1
+        return vector
+
+    @staticmethod
+    def tolist(
+        vector: numpy.ndarray,
+    ) -> float | list[float] | list[tuple[float, float]]:
+        """
+        List form of a stored vector, as handed over to gana.
+        Made when asked for, gana keeps its own copy
+
+        :param vector: a vector returned by intern
+        :type vector: numpy.ndarray
+
+        :returns: list form of the stored vector
+        :rtype: float | list[float] | list[tuple[float, float]]
+        """
+        return to_list(vector)
+
+    def share(
+        self, path: str | None = None, directory: str | None = None
+    ) -> SharedArrays:
+        """
+        Writes the stored vectors to shared memory, for worker processes to attach to.
+        Only vectors still held are shared, those bound in the scenario of a model are.
+        Send the handle of the returned SharedArrays to the workers, and close it when done.
+
+        :param path: file to write to. Defaults to None (a new file in directory).
+        :type path: str, optional
+        :param directory: where a new file is made, e.g. '/dev/shm'. Defaults to None (the temporary directory).
+        :type directory: str, optional
+
+        :returns: shared vectors
+        :rtype: SharedArrays
+        """
+        return SharedArrays(dict(self.vectors), path=path, directory=directory)
+
+    def delta(self, handle: dict) -> dict[str, numpy.ndarray]:
+        """
+        Vectors stored since the pool was shared, to be sent along with the handle
+
+        :param handle: handle of the shared vectors
+        :type handle: dict
+
+        :returns: vectors not in the shared memory, by key
+        :rtype: dict[str, numpy.ndarray]
+        """
+        return {k: v for k, v in self.vectors.items() if k not in handle["layout"]}
+
+    @classmethod
+    def attach(
+        cls,
+        handle: dict,
+        delta: dict[str, numpy.ndarray] | None = None,
+        name: str = "Pool",
+    ) -> Pool:
+        """
+        Pool of read-only views of shared vectors, used in worker processes
+
+        :param handle: handle of the shared vectors
+        :type handle: dict
+        :param delta: vectors stored since sharing, see delta. Defaults to None.
+        :type delta: dict[str, numpy.ndarray], optional
+        :param name: Name of the pool. Defaults to 'Pool'.
+        :type name: str, optional
+
+        :returns: pool with the shared and delta vectors
+        :rtype: Pool
+        """
+        pool = cls(name=name)
+        delta = {k: readonly(v) for k, v in (delta or {}).items()}
+        vectors = {**attach(handle), **delta}
+        for key, vector in vectors.items():
+            pool._attached[key] = vector
+            pool.vectors[key] = vector
+        return pool
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored vectors, that have not been evicted"""
+        return sum(v.nbytes for v in self.vectors.values())
+
+    def report(self) -> dict[str, int]:
+        """
+        Reports what the pool holds
+
+        :returns: number of vectors interned and held, memory held (bytes)
+        :rtype: dict[str, int]
+        """
+        report = {
+            "interned": self.interned,
+            "held": len(self.vectors),
+            "nbytes": self.nbytes,
+        }
+        logger.info(
+            "♻  %s holds %s unique of %s vectors interned, %.2f MB",
+            self,
+            report["held"],
+            report["interned"],
+            report["nbytes"] / 1e6,
+        )
+        return report
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __contains__(self, data) -> bool:
+        return self.key(data) in self.vectors
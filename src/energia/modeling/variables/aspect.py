@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from functools import cached_property
 from typing import TYPE_CHECKING, Self, Type
 
+from ..._core._cons import _Cons
 from ...components.commodities.commodity import Commodity
 from ...components.game.couple import Interact
 from ...components.game.player import Player
@@ -30,7 +31,6 @@ if TYPE_CHECKING:
     from gana import I as Idx
     from gana import Prg
     from gana import V as Var
-    from gana.sets.constraint import C
 
     from ..._core._component import _Component
     from ..._core._x import _X
@@ -39,7 +39,7 @@ if TYPE_CHECKING:
 
 
 @dataclass
-class Aspect:
+class Aspect(_Cons):
     r"""
     A particular facet of the system under consideration. A sample of an aspect at a
     specific disposition is represented by a variable (:math:`\overset{\*}{v} \in \overset{\*}{\mathcal{V}}`).
@@ -76,12 +76,16 @@ class Aspect:
     :vartype model: Model
     :ivar name: Name of the Aspect.
     :vartype name: str
+    :ivar uid: Dense integer id, position of the Aspect in Model.indexed. -1 until assigned.
+    :vartype uid: int
     :ivar indices: List of indices (Location, Periods) associated with the Aspect.
     :vartype indices: list[Location | Linkage, Periods]
     :ivar bound_spaces: Spaces where the Aspect has been already bound.
     :vartype bound_spaces: dict[Commodity | Process | Storage | Transport, list[Location | Linkage]]
     :ivar domains: List of domains associated with the Aspect.
     :vartype domains: list[Domain]
+    :ivar cons_ids: Ids of the constraint sets of the Aspect, see _Cons.
+    :vartype cons_ids: array[int]
 
 
     :raises ValueError: If `primary_type` is not defined.
@@ -99,6 +103,8 @@ class Aspect:
     def __post_init__(self):
         # will be set when added to model
         self.name: str = ""
+        # dense id, given by the model
+        self.uid: int = -1
 
         # name of the decision
         self.model: Model | None = None
@@ -120,7 +126,8 @@ class Aspect:
         # reporting variable
         self.reporting: Var | None = None
 
-        self.constraints: set[str] = set()
+        # constraint sets of the aspect
+        _Cons.__init__(self)
 
     @cached_property
     def maps(self) -> dict[str, dict[Domain, list[Domain]]]:
@@ -187,11 +194,6 @@ class Aspect:
         """Variable"""
         return getattr(self.program, self.name)
 
-    @property
-    def cons(self) -> list[C]:
-        """Constraints"""
-        return [getattr(self.program, c) for c in self.constraints]
-
     @property
     def network(self) -> Location:
         """Circumscribing Location (Spatial Scale)"""
@@ -291,6 +293,10 @@ class Aspect:
     def Balance(self, domain: Domain):
         """Add a general resource balance for the aspect over the domain"""
 
+        if self.model.graph.defer(self, domain):
+            # written once the targets are known, if pruning
+            return
+
         BalCons(aspect=self, domain=domain)
 
     def __neg__(self):
@@ -308,7 +314,7 @@ class Aspect:
         return len(self.domains)
 
     def __eq__(self, other: Self) -> bool:
-        return str(self) == str(other)
+        return self is other
 
     def __getitem__(self, item: _X) -> Sample:
         return self.dispositions[item]
@@ -405,7 +411,7 @@ class Aspect:
         return self.name
 
     def __hash__(self):
-        return hash(self.name)
+        return object.__hash__(self)
 
     def __iter__(self):
         """Iterate over domains"""
@@ -0,0 +1,321 @@
+"""Sparse canonical form of the program"""
+
+from __future__ import annotations
+
+import logging
+from itertools import chain
+from typing import TYPE_CHECKING
+
+import numpy
+from scipy.sparse import csr_array, diags_array, vstack
+
+from ..._core._hash import _Hash
+
+if TYPE_CHECKING:
+    from gana.sets.constraint import C
+
+    from .program import Program
+
+logger = logging.getLogger("energia")
+
+
+def _coefficients(
+    constraints: list[C], n: int, positions: str = "P", values: str = "A"
+) -> csr_array:
+    """
+    Assembles the coefficients of constraints into a sparse matrix.
+    A position repeated in a constraint takes the last coefficient,
+    as is the case with the dense gana matrices
+
+    :param constraints: rows of the matrix
+    :type constraints: list[C]
+    :param n: number of columns
+    :type n: int
+    :param positions: attribute of the constraints with the column positions. Defaults to 'P'.
+    :type positions: str, optional
+    :param values: attribute of the constraints with the coefficients. Defaults to 'A'.
+    :type values: str, optional
+
+    :returns: rows by columns
+    :rtype: scipy.sparse.csr_array
+    """
+    _positions = [getattr(c, positions) for c in constraints]
+    lengths = numpy.fromiter(map(len, _positions), dtype=int, count=len(_positions))
+
+    # positions can be None (e.g. constants), these are skipped
+    cols = numpy.array(list(chain.from_iterable(_positions)), dtype=float)
+    vals = numpy.fromiter(
+        chain.from_iterable(getattr(c, values) for c in constraints),
+        dtype=float,
+        count=len(cols),
+    )
+    rows = numpy.repeat(numpy.arange(len(constraints)), lengths)
+
+    keep = ~numpy.isnan(cols)
+    rows, cols, vals = rows[keep], cols[keep].astype(int), vals[keep]
+
+    # last of the duplicates
+    _, last = numpy.unique((rows * n + cols)[::-1], return_index=True)
+    last = len(rows) - 1 - last
+
+    return csr_array(
+        (vals[last], (rows[last], cols[last])), shape=(len(constraints), n)
+    )
+
+
+class Canonical(_Hash):
+    """
+    Sparse canonical form of a program
+
+    min C z s.t. G z <= h (leq rows), H z = b (eq rows), lb <= z <= ub
+
+    The matrices are assembled (as scipy.sparse CSR) when first asked for,
+    and kept until the program is changed.
+    Naming follows the (dense) gana matrices,
+    rows of A and B are ordered leq, eq, then non-negativity constraints.
+
+    :param program: program to assemble
+    :type program: Program
+
+    :ivar name: name of the canonical form
+    :vartype name: str
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.name = f"Canonical({program})"
+        self._cache: dict[str, numpy.ndarray | csr_array] = {}
+        self._key: tuple[int, ...] | None = None
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """Changes if the program is changed"""
+        program = self.program
+        return (
+            program.__dict__.get("_version", 0),
+            len(program.variables),
+            len(program.constraints),
+            len(program.thetas),
+            len(program.objectives),
+        )
+
+    def invalidate(self):
+        """Drops all assembled matrices"""
+        self._cache.clear()
+        self._key = None
+
+    def _get(self, name: str, assemble):
+        """Assembled matrix, reassembled if the program has changed"""
+        key = self.key
+        if key != self._key:
+            if self._cache:
+                logger.info("♻  %s is out of date, reassembling", self)
+            self._cache.clear()
+            self._key = key
+        if name not in self._cache:
+            assembled = assemble()
+            if isinstance(assembled, numpy.ndarray):
+                # shared by all who ask, not to be changed
+                assembled.flags.writeable = False
+            self._cache[name] = assembled
+        return self._cache[name]
+
+    # -----------------------------------------------------
+    #                    Rows
+    # -----------------------------------------------------
+
+    @property
+    def leqcons(self) -> list[C]:
+        """Less than or equal constraints"""
+        return self._get("leqcons", self.program.leqcons)
+
+    @property
+    def eqcons(self) -> list[C]:
+        """Equality constraints"""
+        return self._get("eqcons", self.program.eqcons)
+
+    @property
+    def nncons(self) -> list[C]:
+        """Non-negativity constraints"""
+        return self._get("nncons", self.program.nncons)
+
+    # -----------------------------------------------------
+    #                    Matrices
+    # -----------------------------------------------------
+
+    @property
+    def G(self) -> csr_array:
+        """Coefficient matrix of inequality (leq) constraints"""
+        return self._get(
+            "G", lambda: _coefficients(self.leqcons, len(self.program.variables))
+        )
+
+    @property
+    def H(self) -> csr_array:
+        """Coefficient matrix of equality constraints"""
+        return self._get(
+            "H", lambda: _coefficients(self.eqcons, len(self.program.variables))
+        )
+
+    @property
+    def A(self) -> csr_array:
+        """Matrix of variable coefficients, of all constraints"""
+
+        def _A():
+            nn = _coefficients(self.nncons, len(self.program.variables))
+            return vstack([self.G, self.H, nn], format="csr")
+
+        return self._get("A", _A)
+
+    @property
+    def F(self) -> csr_array:
+        """Matrix of parametric variable coefficients, of all constraints"""
+        return self._get(
+            "F",
+            lambda: _coefficients(
+                self.leqcons + self.eqcons + self.nncons,
+                len(self.program.thetas),
+                positions="Z",
+                values="F",
+            ),
+        )
+
+    @property
+    def NN(self) -> csr_array:
+        """Variable coefficients of non-negativity constraints, one row per variable"""
+
+        def _NN():
+            nn = -numpy.array([v.nn for v in self.program.variables], dtype=float)
+            return diags_array(nn, format="csr")
+
+        return self._get("NN", _NN)
+
+    @property
+    def A_with_NN(self) -> csr_array:
+        """Matrix of variable coefficients with non-negativity constraints"""
+        return self._get("A_with_NN", lambda: vstack([self.A, self.NN], format="csr"))
+
+    @property
+    def CrA(self) -> csr_array:
+        """Critical region A matrix"""
+
+        def _CrA():
+            n = len(self.program.thetas)
+            # rows alternate between upper and lower bounds
+            return csr_array(
+                (
+                    numpy.tile([1.0, -1.0], n),
+                    (numpy.arange(2 * n), numpy.repeat(numpy.arange(n), 2)),
+                ),
+                shape=(2 * n, n),
+            )
+
+        return self._get("CrA", _CrA)
+
+    # -----------------------------------------------------
+    #                    Vectors
+    # -----------------------------------------------------
+
+    @property
+    def B(self) -> numpy.ndarray:
+        """RHS parameter vector, of all constraints"""
+        return self._get(
+            "B",
+            lambda: numpy.array(
+                [c.B for c in self.leqcons + self.eqcons + self.nncons], dtype=float
+            ),
+        )
+
+    @property
+    def B_with_NN(self) -> numpy.ndarray:
+        """RHS parameter vector with non-negativity constraints"""
+        return self._get(
+            "B_with_NN",
+            lambda: numpy.concatenate(
+                [self.B, numpy.zeros(int(self.NN.count_nonzero()))]
+            ),
+        )
+
+    @property
+    def h(self) -> numpy.ndarray:
+        """RHS of inequality (leq) constraints"""
+        return self._get(
+            "h", lambda: numpy.array([c.B for c in self.leqcons], dtype=float)
+        )
+
+    @property
+    def b(self) -> numpy.ndarray:
+        """RHS of equality constraints"""
+        return self._get(
+            "b", lambda: numpy.array([c.B for c in self.eqcons], dtype=float)
+        )
+
+    @property
+    def CrB(self) -> numpy.ndarray:
+        """Critical region RHS vector"""
+        return self._get(
+            "CrB",
+            lambda: numpy.array(
+                [b for t in self.program.thetas for b in (t.ub, -t.lb)], dtype=float
+            ),
+        )
+
+    @property
+    def C(self) -> numpy.ndarray:
+        """Objective coefficients, of the last objective"""
+
+        def _C():
+            c = numpy.zeros(len(self.program.variables))
+            if self.program.objectives:
+                objective = self.program.objectives[-1]
+                c[objective.P] = objective.C
+            return c
+
+        return self._get("C", _C)
+
+    @property
+    def lb(self) -> numpy.ndarray:
+        """Lower bounds of the variables"""
+        return self._get(
+            "lb",
+            lambda: numpy.array(
+                [0 if v.nn else -numpy.inf for v in self.program.variables]
+            ),
+        )
+
+    @property
+    def ub(self) -> numpy.ndarray:
+        """Upper bounds of the variables"""
+        return self._get(
+            "ub",
+            lambda: numpy.array(
+                [1 if v.bnr else numpy.inf for v in self.program.variables]
+            ),
+        )
+
+    @property
+    def integrality(self) -> numpy.ndarray:
+        """1 for integer (and binary) variables, else 0"""
+        return self._get(
+            "integrality",
+            lambda: numpy.array(
+                [1 if v.itg or v.bnr else 0 for v in self.program.variables]
+            ),
+        )
+
+    def form(self) -> dict[str, numpy.ndarray | csr_array]:
+        """
+        Canonical form over leq then eq rows, as used by solvers
+
+        :returns: A, b, eq (mask of equality rows), c, lb, ub, integrality
+        :rtype: dict[str, numpy.ndarray | csr_array]
+        """
+        return {
+            "A": self._get("A_leq_eq", lambda: vstack([self.G, self.H], format="csr")),
+            "b": numpy.concatenate([self.h, self.b]),
+            "eq": numpy.repeat([False, True], [len(self.leqcons), len(self.eqcons)]),
+            "c": self.C,
+            "lb": self.lb,
+            "ub": self.ub,
+            "integrality": self.integrality,
+        }
@@ -0,0 +1,238 @@
+"""Estimate of the size of the program, before it is built"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy
+
+from ..._core._hash import _Hash
+from .profile import Profile, _memory
+
+if TYPE_CHECKING:
+    from ...components.operations.process import Process
+    from ...components.operations.storage import Storage
+    from ...components.operations.transport import Transport
+    from ...components.spatial.linkage import Linkage
+    from ...components.spatial.location import Location
+    from ...components.temporal.periods import Periods
+    from ..model import Model
+
+logger = logging.getLogger("energia")
+
+
+class Estimate(_Hash):
+    """
+    Predicted size of the program once all declared operations are located.
+
+    Bounds and calculations are written as they are declared,
+    what is built so far is profiled (see Profile).
+    Locating an operation writes the most:
+    capacity and operation (if not bound), one stream and calculation per commodity
+    in its conversion, balances of new commodities and maps to the horizon.
+    These are predicted, for every operation not located yet,
+    from the temporal scales (the densest at which it is bound to operate, else the horizon)
+    and the spaces it is bound or sampled in (else the network, or linkages for transports).
+
+    Peak memory is that of the gana objects held while building and the canonical form.
+
+    :param model: model to estimate
+    :type model: Model
+    :param name: name of the estimate. Defaults to 'Estimate(model)'.
+    :type name: str, optional
+
+    :ivar built: sizes of what is built
+    :vartype built: dict[str, int]
+    :ivar pending: predicted sizes of every operation yet to be located
+    :vartype pending: dict[str, dict[str, int]]
+    :ivar total: predicted sizes of the program
+    :vartype total: dict[str, int]
+    :ivar memory: predicted peak memory in bytes
+    :vartype memory: int
+    """
+
+    def __init__(self, model: Model, name: str = ""):
+        self.model = model
+        self.name = name or f"Estimate({model})"
+
+        self.built = Profile(model).total
+        self.pending: dict[str, dict[str, int]] = {}
+
+        aspects = {str(aspect): aspect for aspect in model.aspects}
+        # (primary, space, time) ids at which the aspects of operations are sampled,
+        # before locating, only by binds
+        self._sampled = {
+            name: (
+                model.ledger.rows("dispositions", aspect=aspects[name])[:, 1:]
+                if name in aspects
+                else numpy.empty((0, 3), dtype=int)
+            )
+            for name in ("operate", "capacity", "inventory", "invcapacity")
+        }
+        self._stored = [storage.stored for storage in model.storages]
+
+        for operation in model.processes + model.transports:
+            if not operation.space_times:
+                self.pending[str(operation)] = self._operation(operation)
+
+        for storage in model.storages:
+            if not storage.charge.space_times:
+                self.pending[str(storage)] = self._storage(storage)
+
+        self.total = {
+            measure: self.built[measure]
+            + sum(sizes[measure] for sizes in self.pending.values())
+            for measure in ("variables", "binaries", "constraints", "nonzeros")
+        }
+        self.memory = _memory(self.total)
+
+    @property
+    def horizon(self) -> Periods | None:
+        """Horizon, None if no periods are declared yet"""
+        if not self.model.time.periods:
+            return None
+        return self.model.horizon
+
+    def _size(self, time: Periods | None) -> int:
+        """Number of periods in the horizon"""
+        if time is None or self.horizon is None:
+            return 1
+        return round(self.horizon.howmany(time))
+
+    def _time(
+        self,
+        operation: Process | Transport,
+        space: Location | Linkage,
+        commodities: list,
+    ) -> int:
+        """Periods operated in, the densest bound,
+        else the densest at which its commodities are balanced, else the horizon"""
+        operated = self._sampled["operate"]
+        at = (operated[:, 0] == operation.uid) & (operated[:, 1] == space.uid)
+        times = self.model.ledger.components(operated[at, 2])
+        if not times:
+            for commodity in commodities:
+                times.extend(self._balanced(commodity, space))
+        return self._size(min(times)) if times else 1
+
+    def _balanced(self, commodity, space: Location | Linkage) -> list[Periods]:
+        """Periods the commodity's balance in the space has been written at"""
+        times = self.model.balances.get(commodity, {}).get(space, {})
+        # balances are noted when their constraint is written
+        return [time for time, aspects in times.items() if aspects]
+
+    @staticmethod
+    def _commodities(operation: Process | Transport) -> list:
+        """Commodities in the conversion of an operation"""
+        commodities = []
+
+        def _walk(balance):
+            for commodity, par in balance.items():
+                if hasattr(par, "balance"):
+                    # modes (or piece-wise segments) of the conversion
+                    _walk(par.balance)
+                elif commodity not in commodities:
+                    commodities.append(commodity)
+
+        if operation.balance:
+            _walk(operation.balance)
+        return commodities
+
+    def _bound(
+        self, aspect: str, primary, space: Location | Linkage, n: int = 1
+    ) -> bool:
+        """Has the aspect been bound for the primary in the space, over n periods"""
+        sampled = self._sampled[aspect]
+        at = (sampled[:, 0] == primary.uid) & (sampled[:, 1] == space.uid)
+        times = self.model.ledger.components(sampled[at, 2])
+        return any(self._size(time) >= n for time in times)
+
+    def _spaces(self, operation: Process | Transport) -> list[Location | Linkage]:
+        """Spaces the operation would be located in,
+        those its capacity or operation is bound in"""
+        ids = numpy.concatenate(
+            [
+                self._sampled[aspect][self._sampled[aspect][:, 0] == operation.uid, 1]
+                for aspect in ("capacity", "operate")
+            ]
+        )
+        spaces = self.model.ledger.components(ids)
+        if spaces:
+            return spaces
+
+        if operation in self.model.transports and self.model.space.linkages:
+            return self.model.space.linkages
+        return [self.model.network]
+
+    def _operation(self, operation: Process | Transport) -> dict[str, int]:
+        """Sizes written when locating an operation"""
+        commodities = self._commodities(operation)
+        sizes = dict.fromkeys(("variables", "binaries", "constraints", "nonzeros"), 0)
+        for space in self._spaces(operation):
+            n = self._time(operation, space, commodities)
+
+            if not self._bound("capacity", operation, space):
+                sizes["variables"] += 1
+            if not self._bound("operate", operation, space, n):
+                # operate <= capacity, over the horizon
+                sizes["variables"] += 1
+                sizes["constraints"] += 1
+                sizes["nonzeros"] += 2
+                if n > 1:
+                    # mapped from the periods operated in
+                    sizes["variables"] += n
+                    sizes["constraints"] += 1
+                    sizes["nonzeros"] += n + 1
+
+            for commodity in commodities:
+                # stream, its calculation from operate and its term in the balance
+                # at the scale the commodity is balanced at
+                times = self._balanced(commodity, space)
+                n_c = self._size(min(times)) if times else n
+                sizes["variables"] += n_c
+                sizes["constraints"] += n_c
+                sizes["nonzeros"] += 3 * n_c
+                # a new balance, that of a stored commodity is the inventory's
+                if not times and commodity not in self._stored:
+                    sizes["constraints"] += n_c
+
+        return sizes
+
+    def _storage(self, storage: Storage) -> dict[str, int]:
+        """Sizes written for the inventory when locating a storage,
+        charge and discharge are processes"""
+        sizes = dict.fromkeys(("variables", "binaries", "constraints", "nonzeros"), 0)
+        for space in self._spaces(storage.charge):
+            n = max(
+                self._time(charge, space, self._commodities(charge))
+                for charge in (storage.charge, storage.discharge)
+            )
+
+            if not self._bound("invcapacity", storage.stored, space):
+                sizes["variables"] += 1
+            if not self._bound("inventory", storage.stored, space, n):
+                # inventory <= invcapacity
+                sizes["variables"] += n
+                sizes["constraints"] += n
+                sizes["nonzeros"] += 2 * n
+                if n > 1:
+                    # mapped to the horizon
+                    sizes["constraints"] += 1
+                    sizes["nonzeros"] += n + 1
+            # inventory balance, with the last inventory, charge and discharge
+            sizes["constraints"] += n
+            sizes["nonzeros"] += 4 * n
+        return sizes
+
+    def within(self, memory_budget: int) -> bool:
+        """
+        Is the predicted peak memory within a budget
+
+        :param memory_budget: bytes available
+        :type memory_budget: int
+
+        :returns: True if the peak fits
+        :rtype: bool
+        """
+        return self.memory <= memory_budget
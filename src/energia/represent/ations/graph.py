@@ -2,21 +2,68 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import numpy
+
 from ..._core._hash import _Hash
 from ...components.graph.edge import Edge
 from ...components.graph.node import Node
+from ...components.spatial.linkage import Linkage
+from ...modeling.variables.states import IndStream
 
 if TYPE_CHECKING:
+    from ..._core._component import _Component
+    from ...components.commodities.commodity import Commodity
+    from ...components.operations.process import Process
+    from ...components.operations.storage import Storage
+    from ...components.operations.transport import Transport
+    from ...components.spatial.location import Location
+    from ...modeling.constraints.bind import Bind
+    from ...modeling.indices.domain import Domain
+    from ...modeling.variables.aspect import Aspect
     from ..model import Model
 
+logger = logging.getLogger("energia")
+
+# collections of commodities which flow through operations
+_COMMODITIES = ("resources", "lands", "emissions", "materials")
+
+# collections whose components are nodes of the graph
+_NODES = _COMMODITIES + (
+    "currencies",
+    "locations",
+    "processes",
+    "storages",
+    "transports",
+)
+
+
+def _at(spaces: dict[Commodity, list[Location | Linkage]]) -> str:
+    """Commodities and the spaces they are at, for logging"""
+    return "; ".join(f"{c} at {', '.join(map(str, at))}" for c, at in spaces.items())
+
 
 @dataclass
 class Graph(_Hash):
     """Graph representation
 
+    The resource-task network (RTN) of the model.
+    Commodities and operations are nodes,
+    an operation has edges from the commodities it consumes and to those it produces.
+    Locations are nodes too, with linkages as edges.
+
+    Pruning is done site by site. An operation located at a site is kept
+    if it can reach a target at the site, at a location the site is in (or has),
+    or at a site linked to it over which a transport carries the commodity.
+    With Model(prune=True), commodity balances are held back until the first locate,
+    and are not written at sites where the commodity cannot reach a target
+    and is not converted by any operation which can.
+    These are withheld, not discarded, and are written once a later locate or demand
+    makes them needed.
+
     :param model: Model to which the graph belongs.
     :type model: Model
 
@@ -26,6 +73,14 @@ class Graph(_Hash):
     :vartype nodes: list[Node]
     :ivar edges: List of edges in the graph.
     :vartype edges: list[Edge]
+    :ivar commodities: Commodities in the graph, currencies are not converted by operations.
+    :vartype commodities: list[Commodity]
+    :ivar targets: Components which have to be served (bound demands and objective-relevant streams), and where.
+    :vartype targets: dict[_Component, list[Location | Linkage]]
+    :ivar pruned: Operations not located, as they cannot reach any target, and where.
+    :vartype pruned: dict[Process | Storage | Transport, list[Location]]
+    :ivar dropped: Commodities whose balances are withheld, and where.
+    :vartype dropped: dict[Commodity, list[Location | Linkage]]
 
     .. note::
         - name is generated based on Model name
@@ -38,3 +93,393 @@ class Graph(_Hash):
         self.name = f"Graph({self.model})"
         self.nodes: list[Node] = []
         self.edges: list[Edge] = []
+        self.commodities: list[Commodity] = []
+        self.targets: dict[_Component, list[Location | Linkage]] = {}
+        self.pruned: dict[Process | Storage | Transport, list[Location]] = {}
+        self.dropped: dict[Commodity, list[Location | Linkage]] = {}
+        # balances held back until needed, see defer
+        self._withheld: list[tuple[Aspect, Domain]] = []
+        self._settled = False
+        # node of every component
+        self._nodes: dict[_Component, Node] = {}
+        # conversion edges of every operation
+        self._conversions: dict[Process | Transport, list[Edge]] = {}
+        self._signatures: dict[Process | Transport, tuple[list, list]] = {}
+
+    def node(self, component: _Component) -> Node:
+        """
+        Node of a component, made if not there
+
+        :param component: commodity, operation or location
+        :type component: _Component
+
+        :returns: node of the component
+        :rtype: Node
+        """
+        if component not in self._nodes:
+            node = Node(component=component, label=component.label)
+            node.name, node.graph = component.name, self
+            self._nodes[component] = node
+            self.nodes.append(node)
+        return self._nodes[component]
+
+    def edge(
+        self, source: _Component, sink: _Component, component: _Component | None = None
+    ) -> Edge:
+        """
+        Adds an edge between the nodes of two components
+
+        :param source: component the edge leaves
+        :type source: _Component
+        :param sink: component the edge enters
+        :type sink: _Component
+        :param component: component represented by the edge, e.g. a Linkage. Defaults to None.
+        :type component: _Component, optional
+
+        :returns: the edge
+        :rtype: Edge
+        """
+        edge = Edge(source=self.node(source), sink=self.node(sink), component=component)
+        edge.name = f"{source.name}->{sink.name}"
+        edge.graph = self
+        self.edges.append(edge)
+        return edge
+
+    def add(self, component: _Component, collection: str):
+        """
+        Adds a component as it is set on the model
+
+        :param component: component added to the model
+        :type component: _Component
+        :param collection: collection of the model the component belongs to
+        :type collection: str
+        """
+        if collection == "linkages":
+            self.edge(component.source, component.sink, component=component)
+        elif collection in _NODES:
+            self.node(component)
+            if collection in _COMMODITIES:
+                self.commodities.append(component)
+            if collection in ("processes", "transports"):
+                self.connect(component)
+
+    def connect(self, operation: Process | Transport):
+        """
+        (Re)writes the edges of an operation from its conversion
+
+        :param operation: operation with a primary conversion
+        :type operation: Process | Transport
+        """
+        produces, consumes = [], []
+
+        def _walk(balance):
+            for commodity, par in balance.items():
+                if commodity is None:
+                    # transports hold a place for the other end until located
+                    continue
+                if hasattr(par, "balance"):
+                    # modes (or piece-wise segments) of the conversion
+                    _walk(par.balance)
+                    continue
+                values = numpy.asarray(par, dtype=float)
+                if (values > 0).any() and commodity not in produces:
+                    produces.append(commodity)
+                if (values < 0).any() and commodity not in consumes:
+                    consumes.append(commodity)
+
+        if operation.balance:
+            _walk(operation.balance)
+        if operation in self.model.transports and operation.basis is not None:
+            # transports move their basis, which is what they serve
+            if operation.basis not in produces:
+                produces.append(operation.basis)
+
+        signature = (consumes, produces)
+        if self._signatures.get(operation) == signature:
+            return
+        self._signatures[operation] = signature
+
+        old = {id(edge) for edge in self._conversions.pop(operation, [])}
+        if old:
+            self.edges = [edge for edge in self.edges if id(edge) not in old]
+
+        self._conversions[operation] = [
+            self.edge(commodity, operation) for commodity in consumes
+        ] + [self.edge(operation, commodity) for commodity in produces]
+
+    def bind(self, bind: Bind):
+        """
+        Notes the targets in a bind:
+        components with a lower bound (or fixed), i.e. demands,
+        and components calculated in indicator streams (earn, emit, etc.)
+
+        :param bind: bind constraint written
+        :type bind: Bind
+        """
+        if bind.iscalc:
+            if isinstance(bind.aspect, IndStream) and bind.aspect.ispos:
+                served = [
+                    (s.domain.primary, s.domain.space) for s in bind.domain.samples
+                ]
+            else:
+                return
+        elif bind.rel in ("lb", "eq"):
+            served = [(bind.domain.primary, bind.domain.space)]
+        else:
+            return
+
+        added = False
+        for component, space in served:
+            spaces = self.targets.setdefault(component, [])
+            if space not in spaces:
+                spaces.append(space)
+                added = True
+
+        if added and self._settled:
+            # a new demand may need balances withheld so far
+            self.settle()
+
+    def _sites(self, space: Location | Linkage) -> set[Location | Linkage]:
+        """
+        Spaces whose targets an operation at a space can serve:
+        the space, the locations it is in and the locations in it
+        """
+        if isinstance(space, Linkage):
+            # linkages serve both ends
+            return {space} | self._sites(space.source) | self._sites(space.sink)
+
+        sites = {space, self.model.network}
+        parent = space.isin
+        while parent is not None:
+            sites.add(parent)
+            parent = parent.isin
+        stack = list(space.has)
+        while stack:
+            location = stack.pop()
+            sites.add(location)
+            stack.extend(location.has)
+        return sites
+
+    def _served(self, space: Location | Linkage | None) -> list[_Component]:
+        """Targets an operation at a space can serve, directly or over linkages"""
+        if space is None:
+            return list(self.targets)
+
+        sites = self._sites(space)
+        served = [c for c, at in self.targets.items() if sites & set(at)]
+
+        # commodities carried by transports, from the space to the sinks of linkages
+        carried = {
+            commodity
+            for transport in self.model.transports
+            for commodity in self._signatures.get(transport, ([], []))[1]
+        }
+        if not carried:
+            return served
+
+        linked, stack = set(), [s for s in sites if not isinstance(s, Linkage)]
+        while stack:
+            location = stack.pop()
+            for edge in self.edges:
+                if edge.component is None or edge.source.component is not location:
+                    continue
+                sink = edge.sink.component
+                if sink not in linked:
+                    linked.add(sink)
+                    stack.append(sink)
+
+        far = set().union(*(self._sites(location) for location in linked))
+        served += [
+            c
+            for c, at in self.targets.items()
+            if c in carried and c not in served and far & set(at)
+        ]
+        return served
+
+    def reachable(self, space: Location | Linkage | None = None) -> set[_Component]:
+        """
+        Components which can reach a target,
+        walking back from the targets over the resource-task network
+
+        :param space: site the components are at. Defaults to None (any site).
+        :type space: Location | Linkage, optional
+
+        :returns: commodities and operations which can reach a target
+        :rtype: set[_Component]
+        """
+        # conversions may have been set after the operations were added
+        for operation in self.model.processes + self.model.transports:
+            self.connect(operation)
+
+        feeds: dict[_Component, list[_Component]] = {}
+        for edges in self._conversions.values():
+            for edge in edges:
+                feeds.setdefault(edge.sink.component, []).append(edge.source.component)
+
+        served = self._served(space)
+        reached = set(served)
+        stack = list(served)
+        while stack:
+            for component in feeds.get(stack.pop(), []):
+                if component not in reached:
+                    reached.add(component)
+                    stack.append(component)
+
+        for storage in self.model.storages:
+            if {storage.charge, storage.discharge, storage.stored} & reached:
+                reached.add(storage)
+
+        return reached
+
+    def prune(
+        self,
+        operations: tuple[Process | Storage | Transport, ...],
+        space: Location | None = None,
+    ) -> tuple[Process | Storage | Transport, ...]:
+        """
+        Drops operations which cannot reach any target (bound demand or objective-relevant stream)
+        from a site, the balances held back are settled first
+
+        :param operations: operations to be located
+        :type operations: tuple[Process | Storage | Transport, ...]
+        :param space: site the operations are located at. Defaults to None (any site).
+        :type space: Location, optional
+
+        :returns: operations which can reach a target
+        :rtype: tuple[Process | Storage | Transport, ...]
+        """
+        if not self.targets:
+            # nothing to serve yet, nothing can be told apart
+            self.settle()
+            return operations
+
+        reached = self.reachable(space)
+        kept = tuple(opr for opr in operations if opr in reached or opr in self.targets)
+        pruned = [opr for opr in operations if opr not in kept]
+
+        if pruned:
+            for opr in pruned:
+                spaces = self.pruned.setdefault(opr, [])
+                if space not in spaces:
+                    spaces.append(space)
+            logger.info(
+                "✂  Pruned %s at %s, cannot reach any demand or objective",
+                ", ".join(str(opr) for opr in pruned),
+                space,
+            )
+
+        self.settle()
+        return kept
+
+    def needed(self, space: Location | Linkage | None = None) -> set[_Component]:
+        """
+        Components whose balances are needed at a site:
+        those which can reach a target, and all commodities of the operations which can
+
+        :param space: site. Defaults to None (any site).
+        :type space: Location | Linkage, optional
+
+        :returns: commodities and operations
+        :rtype: set[_Component]
+        """
+        reached = self.reachable(space)
+        needed = set(reached)
+        for operation, (consumes, produces) in self._signatures.items():
+            if operation in reached:
+                needed.update(consumes, produces)
+        return needed
+
+    def defer(self, aspect: Aspect, domain: Domain) -> bool:
+        """
+        Holds back the balance of a commodity stream, if pruning,
+        until settled, or while the commodity is dropped at the space
+
+        :param aspect: stream of the commodity
+        :type aspect: Aspect
+        :param domain: domain of the stream
+        :type domain: Domain
+
+        :returns: True if held back
+        :rtype: bool
+        """
+        if (
+            not self.model.prune
+            or domain.commodity is None
+            or domain.commodity not in self.commodities
+        ):
+            return False
+        dropped = self.dropped.get(domain.commodity, [])
+        if self._settled and domain.space not in dropped:
+            return False
+        self._withheld.append((aspect, domain))
+        return True
+
+    def settle(self):
+        """
+        Writes the balances held back where they are needed, withholds the rest.
+        Called on every locate, and as demands are added once settled
+        """
+        self._settled = True
+        if not self._withheld:
+            return
+
+        withheld, self._withheld = self._withheld, []
+        needed: dict[Location | Linkage, set[_Component]] = {}
+        for _, domain in withheld:
+            if domain.space not in needed:
+                needed[domain.space] = self.needed(domain.space)
+
+        dropped: dict[Commodity, list[Location | Linkage]] = {}
+        restored: dict[Commodity, list[Location | Linkage]] = {}
+        for aspect, domain in withheld:
+            commodity, space = domain.commodity, domain.space
+            if commodity not in needed[space]:
+                self._withheld.append((aspect, domain))
+                spaces = dropped.setdefault(commodity, [])
+                if space not in spaces:
+                    spaces.append(space)
+                continue
+            if space in self.dropped.get(commodity, []):
+                spaces = restored.setdefault(commodity, [])
+                if space not in spaces:
+                    spaces.append(space)
+            # written, not held back again
+            self._undrop(commodity, space)
+            aspect.Balance(domain)
+
+        new: dict[Commodity, list[Location | Linkage]] = {}
+        for commodity, spaces in dropped.items():
+            known = self.dropped.setdefault(commodity, [])
+            fresh = [space for space in spaces if space not in known]
+            if fresh:
+                known.extend(fresh)
+                new[commodity] = fresh
+
+        if new:
+            logger.info(
+                "✂  Withheld balances of %s, cannot reach any demand or objective",
+                _at(new),
+            )
+        if restored:
+            logger.info("🔗  Wrote balances of %s withheld so far", _at(restored))
+
+    def _undrop(self, commodity: Commodity, space: Location | Linkage):
+        """Notes that the balance of a commodity at a space is written"""
+        spaces = self.dropped.get(commodity, [])
+        if space in spaces:
+            spaces.remove(space)
+            if not spaces:
+                del self.dropped[commodity]
+
+    def unreachable(self, space: Location | Linkage | None = None) -> list[Commodity]:
+        """
+        Commodities which cannot reach any target
+
+        :param space: site. Defaults to None (any site).
+        :type space: Location | Linkage, optional
+
+        :returns: commodities which cannot reach any target from the site
+        :rtype: list[Commodity]
+        """
+        reached = self.reachable(space)
+        return [c for c in self.commodities if c not in reached]
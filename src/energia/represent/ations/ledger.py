@@ -0,0 +1,186 @@
+"""Ledger of dispositions, balances and maps as integer arrays"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy
+
+from ..._core._hash import _Hash
+
+if TYPE_CHECKING:
+    from ..._core._x import _X
+    from ...modeling.variables.aspect import Aspect
+    from ..model import Model
+
+# columns of every table, entries are dense ids (uid) of components and aspects
+COLUMNS = {
+    # aspect sampled for a primary component in a space and time
+    "dispositions": ("aspect", "primary", "space", "time"),
+    # balance (constraint set, by id) of a commodity in a space and time
+    "balances": ("commodity", "space", "time", "cons"),
+    # map of an aspect along a dimension (see MAPS), from a domain to another
+    "maps": ("aspect", "what", "primary", "space", "time", "to_space", "to_time"),
+}
+
+# dimensions maps are drawn along, position is the id in the 'what' column
+MAPS = ("time", "space", "modes", "samples")
+
+
+def _uid(index) -> int:
+    """Dense id of an index, -1 if it is not a component (e.g. a lag)"""
+    return getattr(index, "uid", -1)
+
+
+class Ledger(_Hash):
+    """
+    Dispositions, balances and maps of the model as rows of dense integer ids
+    (see _X.uid and Aspect.uid), so that they can be queried with array operations.
+
+    The trees (Model.dispositions, Model.balances and Model.maps) are what the build
+    writes to, the tables are read off them once and held until the program changes
+    (see Canonical.key), as every note in the trees comes with a change to the program.
+    Indices which are not components, e.g. lags or samples as the primary index, are -1.
+
+    :param model: model whose ledger this is
+    :type model: Model
+    :param name: name of the ledger. Defaults to 'Ledger(model)'.
+    :type name: str, optional
+    """
+
+    def __init__(self, model: Model, name: str = ""):
+        self.model = model
+        self.name = name or f"Ledger({model})"
+        self._cache: dict[str, numpy.ndarray] = {}
+        self._key: tuple[int, ...] | None = None
+
+    def _table(self, table: str) -> numpy.ndarray:
+        """All rows of a table, read off the trees again if the program has changed"""
+        key = self.model.program.matrices.key
+        if key != self._key:
+            self._cache.clear()
+            self._key = key
+        if table not in self._cache:
+            rows = numpy.array(getattr(self, f"_{table}")(), dtype=numpy.intc)
+            rows = rows.reshape(-1, len(COLUMNS[table]))
+            # shared by all who ask, not to be changed
+            rows.flags.writeable = False
+            self._cache[table] = rows
+        return self._cache[table]
+
+    def _dispositions(self) -> list[tuple[int, ...]]:
+        """Rows of the disposition tree, down to time"""
+        return [
+            (_uid(aspect), _uid(primary), _uid(space), _uid(time))
+            for aspect, primaries in self.model.dispositions.items()
+            for primary, spaces in primaries.items()
+            for space, times in spaces.items()
+            for time in times
+        ]
+
+    def _balances(self) -> list[tuple[int, ...]]:
+        """Rows of the balances written"""
+        program = self.model.program
+        return [
+            (
+                _uid(commodity),
+                _uid(space),
+                _uid(time),
+                getattr(program, f"{commodity}_{space}_{time}_grb").n,
+            )
+            for commodity, spaces in self.model.balances.items()
+            for space, times in spaces.items()
+            for time, aspects in times.items()
+            # balances are noted when their constraint is written
+            if aspects
+        ]
+
+    def _maps(self) -> list[tuple[int, ...]]:
+        """Rows of the maps drawn, of variables and of reporting variables"""
+        rows = []
+        for maps in (self.model.maps, self.model.maps_report):
+            for aspect, drawn in maps.items():
+                for what, to_domains in drawn.items():
+                    for to_domain, from_domains in to_domains.items():
+                        _, to_space, to_time = to_domain.uids
+                        rows.extend(
+                            (
+                                _uid(aspect),
+                                MAPS.index(what),
+                                *from_domain.uids,
+                                to_space,
+                                to_time,
+                            )
+                            for from_domain in from_domains
+                        )
+        return rows
+
+    def rows(self, table: str, **where: _X | Aspect | list) -> numpy.ndarray:
+        """
+        Rows of a table, filtered by the columns given
+
+        e.g. rows('dispositions', aspect=m.operate, primary=[m.wf, m.pv])
+
+        :param table: one of COLUMNS
+        :type table: str
+        :param where: column and the component(s) (or ids) it should be in
+        :type where: _X | Aspect | list
+
+        :returns: rows of ids, one column per entry in COLUMNS[table]
+        :rtype: numpy.ndarray
+
+        :raises ValueError: if the table or a column is not known
+        """
+        if table not in COLUMNS:
+            raise ValueError(f"No {table} in the ledger, choose from {tuple(COLUMNS)}")
+        columns = COLUMNS[table]
+        for column in where:
+            if column not in columns:
+                raise ValueError(f"No {column} in {table}, choose from {columns}")
+
+        rows = self._table(table)
+        mask = numpy.ones(len(rows), dtype=bool)
+        for column, value in where.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            ids = [MAPS.index(v) if column == "what" else _uid(v) for v in values]
+            mask &= numpy.isin(rows[:, columns.index(column)], ids)
+        return rows[mask]
+
+    def get(self, table: str, column: str, **where: _X | Aspect | list) -> list:
+        """
+        Components (or aspects) in a column of the filtered rows, once each
+
+        e.g. get('dispositions', 'time', aspect=m.operate, primary=m.wf, space=m.l0)
+
+        :param table: one of COLUMNS
+        :type table: str
+        :param column: column of the table
+        :type column: str
+        :param where: column and the component(s) (or ids) it should be in
+        :type where: _X | Aspect | list
+
+        :returns: components in the order they were noted
+        :rtype: list
+
+        :raises ValueError: if the table or a column is not known
+        """
+        columns = COLUMNS.get(table, ())
+        if column not in columns:
+            raise ValueError(f"No {column} in {table}, choose from {columns}")
+        ids = self.rows(table, **where)[:, columns.index(column)]
+        if column in ("what", "cons"):
+            return list(dict.fromkeys(ids.tolist()))
+        return self.components(ids)
+
+    def components(self, ids: numpy.ndarray) -> list:
+        """
+        Components (or aspects) of dense ids, once each, -1 are dropped
+
+        :param ids: dense ids
+        :type ids: numpy.ndarray
+
+        :returns: components in the order of the ids
+        :rtype: list
+        """
+        indexed = self.model.indexed
+        return [indexed[n] for n in dict.fromkeys(ids.tolist()) if n >= 0]
@@ -0,0 +1,238 @@
+"""Presolve of the canonical form, with the postsolve mapping back"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy
+from scipy.sparse import csr_array
+
+from ..._core._hash import _Hash
+
+logger = logging.getLogger("energia")
+
+# tolerance for zero, equal values and integrality
+_TOL = 1e-9
+
+
+class Presolve(_Hash):
+    """
+    Reduces the canonical form (see Canonical.form) before it is handed to a solver.
+    Rounds of the following are run till nothing changes:
+
+        - singleton equalities fix their variable, e.g. a commodity with no producers
+        - singleton inequalities become bounds, e.g. binds (v <= 0 fixes v to zero)
+        - variables with equal bounds are fixed and taken out of the rows
+        - rows with no variables left are dropped, e.g. empty balances
+        - variables in no row are set to their cheapest bound
+        - equalities of two variables (a v_parent + b v_child = 0), e.g. maps over one child,
+          are substituted out, if the bounds of the variable taken out are implied
+
+    Every variable of the program is then either kept, fixed, or a multiple of a kept (or fixed) variable,
+    postsolve restores the values of all variables from the reduced solution.
+
+    :param form: canonical form, A, b, eq, c, lb, ub, integrality
+    :type form: dict[str, numpy.ndarray | csr_array]
+    :param name: name of the presolve. Defaults to 'Presolve'.
+    :type name: str, optional
+
+    :ivar form: reduced canonical form
+    :vartype form: dict[str, numpy.ndarray | csr_array]
+    :ivar rows: positions of the rows kept
+    :vartype rows: numpy.ndarray
+    :ivar columns: positions of the variables kept
+    :vartype columns: numpy.ndarray
+    :ivar infeasible: True if the form is found to be infeasible
+    :vartype infeasible: bool
+    """
+
+    def __init__(self, form: dict, name: str = "Presolve"):
+        self.name = name
+
+        A = csr_array(form["A"])
+        m, n = A.shape
+        self.infeasible = False
+
+        # every variable is scale * the variable at root (or its fixed value)
+        self.root = numpy.arange(n)
+        self.scale = numpy.ones(n)
+        self.fixed = numpy.zeros(n, dtype=bool)
+        self.value = numpy.zeros(n)
+
+        lb = numpy.array(form["lb"], dtype=float)
+        ub = numpy.array(form["ub"], dtype=float)
+        integer = numpy.asarray(form["integrality"]).astype(bool)
+        eq = numpy.asarray(form["eq"]).astype(bool)
+        c = numpy.asarray(form["c"], dtype=float)
+        rows = numpy.ones(m, dtype=bool)
+
+        changed, rounds = True, 0
+        while changed and not self.infeasible:
+            changed = False
+            rounds += 1
+            A_r, rhs = self._reduce(A, form["b"])
+            counts = numpy.diff(A_r.indptr)
+
+            # --- rows with no variables
+            empty = rows & (counts == 0)
+            if empty.any():
+                violated = numpy.where(
+                    eq[empty], numpy.abs(rhs[empty]) > _TOL, rhs[empty] < -_TOL
+                )
+                if violated.any():
+                    self.infeasible = True
+                    break
+                rows[empty] = False
+                changed = True
+
+            # --- singleton rows
+            for i in numpy.flatnonzero(rows & (counts == 1)):
+                j = A_r.indices[A_r.indptr[i]]
+                if self.fixed[j]:
+                    continue
+                bound = rhs[i] / A_r.data[A_r.indptr[i]]
+                if eq[i]:
+                    if integer[j] and abs(bound - round(bound)) > _TOL:
+                        continue
+                    if not lb[j] - _TOL <= bound <= ub[j] + _TOL:
+                        self.infeasible = True
+                        break
+                    lb[j] = ub[j] = bound
+                elif A_r.data[A_r.indptr[i]] > 0:
+                    bound = numpy.floor(bound + _TOL) if integer[j] else bound
+                    ub[j] = min(ub[j], bound)
+                else:
+                    bound = numpy.ceil(bound - _TOL) if integer[j] else bound
+                    lb[j] = max(lb[j], bound)
+                rows[i] = False
+                changed = True
+
+            if self.infeasible or (lb > ub + _TOL).any():
+                self.infeasible = True
+                break
+
+            # --- variables with equal bounds
+            fix = self.live & (ub - lb <= _TOL)
+            if fix.any():
+                self._fix(fix, lb[fix])
+                changed = True
+
+            # --- variables in no row
+            c_r = self._objective(c)
+            used = numpy.zeros(n, dtype=bool)
+            used[A_r[rows].indices] = True
+            unused = self.live & ~used
+            for j in numpy.flatnonzero(unused):
+                if c_r[j] > 0:
+                    cheapest = lb[j]
+                elif c_r[j] < 0:
+                    cheapest = ub[j]
+                else:
+                    cheapest = min(max(0.0, lb[j]), ub[j])
+                # else the program is unbounded, left to the solver
+                if numpy.isfinite(cheapest):
+                    self._fix(numpy.array([j]), numpy.array([cheapest]))
+                    changed = True
+
+            # --- doubleton equalities with no constant
+            touched = numpy.zeros(n, dtype=bool)
+            doubletons = rows & eq & (counts == 2) & (numpy.abs(rhs) <= _TOL)
+            for i in numpy.flatnonzero(doubletons):
+                start = A_r.indptr[i]
+                x, y = A_r.indices[start : start + 2]
+                a_x, a_y = A_r.data[start : start + 2]
+                if touched[x] or touched[y] or self.fixed[x] or self.fixed[y]:
+                    continue
+                # the continuous one is taken out
+                if integer[y]:
+                    x, y, a_x, a_y = y, x, a_y, a_x
+                if integer[y]:
+                    continue
+                k = -a_x / a_y
+                implied = sorted((k * lb[x], k * ub[x]))
+                if not (lb[y] <= implied[0] + _TOL and ub[y] >= implied[1] - _TOL):
+                    continue
+                # y = k x
+                subs = self.root == y
+                self.root[subs] = x
+                self.scale[subs] *= k
+                touched[[x, y]] = True
+                rows[i] = False
+                changed = True
+
+        A_r, rhs = self._reduce(A, form["b"])
+        self.rows = numpy.flatnonzero(rows)
+        self.columns = numpy.flatnonzero(self.live)
+        self.rounds = rounds
+        self.form = {
+            "A": csr_array(A_r[self.rows][:, self.columns]),
+            "b": rhs[self.rows],
+            "eq": eq[self.rows],
+            "c": self._objective(c)[self.columns],
+            "lb": lb[self.columns],
+            "ub": ub[self.columns],
+            "integrality": numpy.asarray(form["integrality"])[self.columns],
+        }
+
+        if self.infeasible:
+            logger.warning("🛑 %s found the program infeasible 🛑", self)
+        else:
+            logger.info(
+                "✂  %s removed %s of %s rows and %s of %s variables in %s rounds",
+                self,
+                m - len(self.rows),
+                m,
+                n - len(self.columns),
+                n,
+                rounds,
+            )
+
+    @property
+    def live(self) -> numpy.ndarray:
+        """Variables neither fixed nor substituted out"""
+        return ~self.fixed & (self.root == numpy.arange(len(self.root)))
+
+    def _fix(self, columns: numpy.ndarray, values: numpy.ndarray):
+        """Fixes variables (roots) to values"""
+        self.fixed[columns] = True
+        self.value[columns] = values
+
+    def _constant(self) -> numpy.ndarray:
+        """Values of the variables which are (multiples of) fixed ones, else 0"""
+        fixed = self.fixed[self.root]
+        return numpy.where(fixed, self.scale * self.value[self.root], 0.0)
+
+    def _projection(self) -> csr_array:
+        """Maps every variable to the live variable it is a multiple of"""
+        n = len(self.root)
+        free = ~self.fixed[self.root]
+        return csr_array(
+            (self.scale[free], (numpy.flatnonzero(free), self.root[free])), shape=(n, n)
+        )
+
+    def _reduce(
+        self, A: csr_array, b: numpy.ndarray
+    ) -> tuple[csr_array, numpy.ndarray]:
+        """Coefficients over the live variables and RHS less the fixed variables"""
+        A_r = csr_array(A @ self._projection())
+        A_r.eliminate_zeros()
+        A_r.sort_indices()
+        return A_r, numpy.asarray(b, dtype=float) - A @ self._constant()
+
+    def _objective(self, c: numpy.ndarray) -> numpy.ndarray:
+        """Objective coefficients over the live variables"""
+        return self._projection().T @ c
+
+    def postsolve(self, x: numpy.ndarray) -> numpy.ndarray:
+        """
+        Restores the values of all variables from the reduced solution
+
+        :param x: values of the variables kept (columns)
+        :type x: numpy.ndarray
+
+        :returns: values of all variables
+        :rtype: numpy.ndarray
+        """
+        value = self.value.copy()
+        value[self.columns] = x
+        return self.scale * value[self.root]
@@ -0,0 +1,297 @@
+"""Size profile of the program, by component, aspect, category, location and period"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from ..._core._hash import _Hash
+from .canonical import _coefficients
+
+if TYPE_CHECKING:
+    from ..._core._x import _X
+    from ..model import Model
+
+# dimensions the sizes are broken down by
+DIMENSIONS = ("component", "aspect", "category", "location", "period")
+
+# measures of size
+MEASURES = ("variables", "binaries", "constraints", "nonzeros", "memory")
+
+# bytes of the gana objects (variables, constraints and their terms) held while building,
+# these dominate the peak over the canonical form.
+# Traced (tracemalloc) over the builds in tests/estimate_test.py, 24 to 384 periods,
+# at 2400 to 2800 bytes per variable, constraint or nonzero (see test_memory).
+# The three grow together, so they are not told apart.
+_OBJECTS = dict.fromkeys(("variables", "constraints", "nonzeros"), 2500)
+
+# bytes per entry of the canonical form handed to solvers
+_BYTES = {
+    # bounds, cost and integrality
+    "variables": 8 + 8 + 8 + 1,
+    # row pointer, RHS and type
+    "constraints": 8 + 8 + 1,
+    # coefficient and column index
+    "nonzeros": 8 + 8,
+}
+
+
+def _memory(sizes: dict[str, int]) -> int:
+    """Estimated bytes of the gana objects and the canonical form"""
+    return sum(
+        sizes[measure] * (_OBJECTS[measure] + _BYTES[measure]) for measure in _OBJECTS
+    )
+
+
+class Profile(_Hash):
+    """
+    Size of the program (variables, binaries, constraints, nonzeros and memory)
+    broken down by component, aspect, constraint category, location and period.
+
+    Variables are attributed to the components in their index (by the gana sets they are of)
+    and to the aspect (variable set) they belong to.
+    Constraints are attributed to the components informed of them (see _Cons)
+    and to the aspect they are written for, balances are of no aspect.
+    non-negativity is a bound and is not counted as a row.
+    A variable or constraint is counted under every component in its index,
+    so shares overlap within the component, location and period dimensions.
+
+    Memory is an estimate of the gana objects and the canonical form (see Canonical.form),
+    as in Estimate, so that what is profiled and what is predicted are alike.
+
+    :param model: model to profile
+    :type model: Model
+    :param name: name of the profile. Defaults to 'Profile(model)'.
+    :type name: str, optional
+
+    :ivar sizes: sizes of every entry of every dimension
+    :vartype sizes: dict[str, dict[str, dict[str, int]]]
+    :ivar total: sizes of the whole program
+    :vartype total: dict[str, int]
+    :ivar families: category, aspect and sizes of every constraint set
+    :vartype families: dict[str, dict]
+    """
+
+    def __init__(self, model: Model, name: str = ""):
+        self.model = model
+        self.name = name or f"Profile({model})"
+
+        program = model.program
+
+        # components by dense id (uid)
+        components: dict[int, _X] = {}
+        for represent, collection in model.familytree.values():
+            if represent == "problem":
+                continue
+            for component in getattr(getattr(model, represent), collection, []):
+                components[component.uid] = component
+        aspects = {str(aspect): aspect for aspect in model.aspects}
+        locations = {loc.uid for loc in model.space.locations}
+        periods = {per.uid for per in model.time.periods}
+
+        # uids of the gana sets of components (by id), elements of an index
+        # are these sets or members of them (e.g. periods, modes).
+        # Only sets already made are looked up, nothing is written to the program
+        owned: dict[int, int] = {}
+        for uid, component in components.items():
+            for made in (vars(component).get("I"), vars(component).get("i")):
+                if made is not None and not isinstance(made, tuple):
+                    owned[id(made)] = uid
+
+        def _owners(index: tuple) -> list[int]:
+            """uids of the components in an index, in the order of the index"""
+            uids = []
+            for element in index:
+                for of in getattr(element, "parent", None) or [element]:
+                    if id(of) in owned:
+                        uids.append(owned[id(of)])
+            return list(dict.fromkeys(uids))
+
+        def _dimension(uid: int) -> str:
+            if uid in locations:
+                return "location"
+            if uid in periods:
+                return "period"
+            return "component"
+
+        self.sizes: dict[str, dict[str, dict[str, int]]] = {
+            dim: defaultdict(lambda: dict.fromkeys(MEASURES, 0)) for dim in DIMENSIONS
+        }
+        self.total = dict.fromkeys(MEASURES, 0)
+        # variable sets of the program, by aspect and component
+        self._variables: dict[tuple[str, str], dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(MEASURES, 0)
+        )
+
+        def _add(dim: str, key: str, sizes: dict[str, int]):
+            entry = self.sizes[dim][key]
+            for measure, size in sizes.items():
+                entry[measure] += size
+
+        # --- variables
+        for var in program.variables:
+            sizes = dict.fromkeys(MEASURES, 0)
+            sizes["variables"] = 1
+            sizes["binaries"] = int(bool(var.bnr))
+            sizes["memory"] = _memory(sizes)
+
+            # binaries (x_) and incidental variables are of an aspect too
+            aspect = var.parent.name.removeprefix("x_").removesuffix("_incidental")
+            _add("aspect", aspect, sizes)
+
+            owners = _owners(var.index)
+            for uid in owners:
+                _add(_dimension(uid), str(components[uid]), sizes)
+
+            primary = next(
+                (str(components[u]) for u in owners if _dimension(u) == "component"),
+                "-",
+            )
+            stack = self._variables[(aspect, primary)]
+            for measure, size in sizes.items():
+                stack[measure] += size
+
+            for measure, size in sizes.items():
+                self.total[measure] += size
+
+        # --- constraints
+        # components informed of every constraint set (by id)
+        informed: dict[int, list[int]] = defaultdict(list)
+        for uid, component in components.items():
+            for cons_n in component.cons_n:
+                informed[cons_n].append(uid)
+        # constraints are named after the aspect they bound, calculate or map
+        # but all the aspects in them are informed, balances are of commodities
+        names = program.names_constraint_sets
+        of_aspect: dict[int, str] = {}
+        for key, aspect in sorted(aspects.items(), key=lambda item: len(item[0])):
+            for cons_n in aspect.cons_n:
+                if names[cons_n].startswith(f"{key}_"):
+                    of_aspect[cons_n] = key
+
+        n = len(program.variables)
+        self.families: dict[str, dict] = {}
+        for cons_n, (cons_name, cons) in enumerate(
+            zip(names, program.constraint_sets)
+        ):
+            if cons.nn:
+                continue
+            sizes = dict.fromkeys(MEASURES, 0)
+            sizes["constraints"] = len(cons._)
+            sizes["nonzeros"] = int(_coefficients(cons._, n).nnz) if cons._ else 0
+            sizes["memory"] = _memory(sizes)
+
+            category = str(cons.category) if cons.category else "Other"
+            aspect = of_aspect.get(cons_n, "-")
+            self.families[cons_name] = {
+                "category": category,
+                "aspect": aspect,
+                **sizes,
+            }
+
+            _add("category", category, sizes)
+            if aspect != "-":
+                _add("aspect", aspect, sizes)
+            for uid in dict.fromkeys(informed.get(cons_n, [])):
+                _add(_dimension(uid), str(components[uid]), sizes)
+
+            for measure in ("constraints", "nonzeros", "memory"):
+                self.total[measure] += sizes[measure]
+
+    def rank(self, by: str = "component", measure: str = "memory") -> list[tuple]:
+        """
+        Entries of a dimension, largest first
+
+        :param by: dimension, one of DIMENSIONS. Defaults to 'component'.
+        :type by: str, optional
+        :param measure: measure to rank by, one of MEASURES. Defaults to 'memory'.
+        :type measure: str, optional
+
+        :returns: (entry, sizes) pairs
+        :rtype: list[tuple[str, dict[str, int]]]
+
+        :raises ValueError: if the dimension or measure is not known
+        """
+        if by not in DIMENSIONS:
+            raise ValueError(f"Cannot rank by {by}, choose from {DIMENSIONS}")
+        if measure not in MEASURES:
+            raise ValueError(f"Cannot rank by {measure}, choose from {MEASURES}")
+        return sorted(
+            self.sizes[by].items(), key=lambda item: item[1][measure], reverse=True
+        )
+
+    def table(
+        self, by: str = "component", measure: str = "memory", top: int = 10
+    ) -> str:
+        """
+        Ranked table of a dimension
+
+        :param by: dimension, one of DIMENSIONS. Defaults to 'component'.
+        :type by: str, optional
+        :param measure: measure to rank by, one of MEASURES. Defaults to 'memory'.
+        :type measure: str, optional
+        :param top: number of entries shown. Defaults to 10.
+        :type top: int, optional
+
+        :returns: the table, one line per entry
+        :rtype: str
+        """
+        ranked = self.rank(by, measure)[:top]
+        width = max([len(by)] + [len(key) for key, _ in ranked])
+        lines = [f"{by:<{width}} " + " ".join(f"{m:>12}" for m in MEASURES)]
+        for key, sizes in ranked:
+            lines.append(
+                f"{key:<{width}} " + " ".join(f"{sizes[m]:>12}" for m in MEASURES)
+            )
+        return "\n".join(lines)
+
+    def stacks(self, measure: str = "memory") -> list[str]:
+        """
+        Nested report in the collapsed stack format of flame graphs
+        (e.g. flamegraph.pl or speedscope), one 'frame;frame;... value' line per leaf.
+        Constraints nest as category;aspect;constraint set,
+        variables as aspect;component
+
+        :param measure: measure used as the width of frames. Defaults to 'memory'.
+        :type measure: str, optional
+
+        :returns: lines of the report
+        :rtype: list[str]
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"Cannot report {measure}, choose from {MEASURES}")
+
+        root = str(self.model)
+        lines = []
+        for name, family in self.families.items():
+            if family[measure]:
+                frames = (
+                    root,
+                    "Constraints",
+                    family["category"],
+                    family["aspect"],
+                    name,
+                )
+                lines.append(f"{';'.join(frames)} {family[measure]}")
+        for (aspect, component), sizes in self._variables.items():
+            if sizes[measure]:
+                frames = (root, "Variables", aspect, component)
+                lines.append(f"{';'.join(frames)} {sizes[measure]}")
+        return lines
+
+    def flame(self, path: str, measure: str = "memory") -> str:
+        """
+        Writes the nested report (see stacks) to a file
+
+        :param path: file to write to
+        :type path: str
+        :param measure: measure used as the width of frames. Defaults to 'memory'.
+        :type measure: str, optional
+
+        :returns: path of the written file
+        :rtype: str
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.stacks(measure):
+                f.write(f"{line}\n")
+        return path
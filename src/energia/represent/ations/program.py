@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 from gana import I, Prg
 
+from ...utils.decorators import timer
+from .canonical import Canonical
+from .solvers import SOLVERS
+from .writer import write
+
 if TYPE_CHECKING:
+    import numpy
+
     from ..model import Model
 
+logger = logging.getLogger("energia")
+
 
 @dataclass
 class Program(Prg):
@@ -70,6 +81,88 @@ class Program(Prg):
         # Component Index Sets
         self.name = f"Program({self.model})"
 
+    @cached_property
+    def matrices(self) -> Canonical:
+        """Sparse canonical form, kept up to date with the program"""
+        return Canonical(self)
+
+    @timer(logger, kind="optimize")
+    def opt(self, using: str | None = None, **options):
+        """
+        Determines the optimal solution to the program
+
+        :param using: solver, 'gurobi' or any backend in SOLVERS (e.g. 'highs').
+            Defaults to None (the solver of the model).
+        :type using: str, optional
+        :param options: passed on to the solver backend, e.g. presolve=True (see Presolve),
+            not taken by gurobi
+
+        :returns: the program and the solver used, False if no solution is found
+        :rtype: tuple[Program, str] | bool
+
+        :raises ValueError: if the solver is not known, or options are given for gurobi
+        """
+        if using is None:
+            using = self.model.solver if self.model is not None else "gurobi"
+
+        if using == "gurobi":
+            if options:
+                raise ValueError(
+                    f"{self}: gurobi takes no options, {', '.join(options)} "
+                    f"are taken by the backends in SOLVERS {tuple(SOLVERS)}"
+                )
+            # gana's own (timed) opt, logged here instead
+            return Prg.opt.__wrapped__(self, using=using)
+
+        if using not in SOLVERS:
+            raise ValueError(
+                f"{self}: no solver {using}, use 'gurobi' or one of {tuple(SOLVERS)}"
+            )
+
+        solved = SOLVERS[using](**options).solve(self)
+        if solved is None:
+            logger.warning("🛑 No solution found. Check the model 🛑")
+            return False
+
+        self.load(*solved)
+        return self, using
+
+    def load(self, z: numpy.ndarray, objective: float):
+        """
+        Loads a solution as solutions[n]
+
+        :param z: values of all variables
+        :type z: numpy.ndarray
+        :param objective: objective value
+        :type objective: float
+        """
+        # solutions are loaded for variables which feature in constraints
+        values = [float(z[v.n]) for v in self.variables if v.cons_by]
+        self._load_values((values, objective))
+        self.optimized = True
+        self._birth_solution()
+
+    @timer(logger, kind="write")
+    def write(self, path: str) -> str:
+        """
+        Writes the program to a MPS or LP file, streamed line by line.
+        Constraints are grouped by category (Binds, Calculations, Mapping, Balance, ...)
+
+        :param path: file, .mps or .lp, compressed if it ends in .gz (e.g. 'model.mps.gz')
+        :type path: str
+
+        :returns: path of the written file
+        :rtype: str
+        """
+        return write(self, path)
+
+    def __setattr__(self, name, value):
+        if type(value).__module__.startswith("gana"):
+            # sets, constraints, objectives, etc. change the program
+            # the canonical form needs to be reassembled
+            self.__dict__["_version"] = self.__dict__.get("_version", 0) + 1
+        Prg.__setattr__(self, name, value)
+
     def __getattr__(self, item):
 
         if item in self.model.ancestry:
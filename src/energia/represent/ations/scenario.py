@@ -5,15 +5,29 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from ..._core._hash import _Hash
+from ...modeling.parameters.pool import Pool
 from ...utils.dictionary import merge_trees
 
 if TYPE_CHECKING:
+    import numpy
+
     from ...modeling.indices.sample import Sample
     from ...represent.model import Model
 
 
 class Scenario(_Hash):
-    """Scenario representation"""
+    """Scenario representation
+
+    :param model: Model of the scenario
+    :type model: Model
+
+    :ivar pool: Interned parameter vectors, every unique vector is stored once
+    :vartype pool: Pool
+    :ivar bound: What is bound (aspect, primary, space, time and relation), in lean models the tree is not kept
+    :vartype bound: set[tuple]
+    :ivar vectors: Interned vectors bound, by (aspect, primary, space, time and relation), not kept in lean models
+    :vartype vectors: dict[tuple, numpy.ndarray]
+    """
 
     def __init__(self, model: Model):
 
@@ -21,18 +35,62 @@ class Scenario(_Hash):
         self.name = rf"Scenario({self.model})"
 
         self._ = {}
+        self.bound: set[tuple] = set()
+        self.pool = Pool(name=rf"Pool({self.model})")
+        # holding these keeps them in the pool
+        self.vectors: dict[tuple, numpy.ndarray] = {}
 
     def update(
         self,
         sample: Sample,
         rel: str,
         parameter: float | list[float],
+        vector: numpy.ndarray | None = None,
     ):
         """Update the scenario representation"""
 
+        if self.model.lean:
+            # only what is bound, not the parameters
+            domain = sample.domain
+            self.bound.add(
+                (sample.aspect, domain.primary, domain.space, domain.time, rel)
+            )
+            return
+
         self._ = merge_trees(
             self._, {sample.aspect: sample.domain.param_tree(parameter, rel)}
         )
+        if vector is not None:
+            domain = sample.domain
+            key = (sample.aspect, domain.primary, domain.space, domain.time, rel)
+            self.vectors[key] = vector
+
+    @property
+    def saved(self) -> int:
+        """Memory deduplication saves on the vectors held, the same array is held once"""
+        unique = {id(vector): vector.nbytes for vector in self.vectors.values()}
+        return sum(v.nbytes for v in self.vectors.values()) - sum(unique.values())
+
+    def has(self, sample: Sample, rel: str) -> bool:
+        """
+        Has the aspect been bound for the primary component in the space and time
+
+        :param sample: aspect over a domain
+        :type sample: Sample
+        :param rel: relation, 'ub', 'lb' or 'eq'
+        :type rel: str
+
+        :returns: True if the bind exists
+        :rtype: bool
+        """
+        domain = sample.domain
+        key = (sample.aspect, domain.primary, domain.space, domain.time)
+        if (*key, rel) in self.bound:
+            return True
+        try:
+            return bool(self._[key[0]][key[1]][key[2]][key[3]][rel])
+        except KeyError:
+            return False
 
     def __getitem__(self, item):
         return self._[item]
@@ -0,0 +1,126 @@
+"""Solver backends for the program"""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+from ..._core._hash import _Hash
+from .presolve import Presolve
+
+if TYPE_CHECKING:
+    from .program import Program
+
+logger = logging.getLogger("energia")
+
+
+class Solver(ABC, _Hash):
+    """
+    A solver backend, finds the optimal solution to a program.
+    Backends are registered in SOLVERS by name,
+    and are used by Program.opt(using=name).
+
+    :param presolve: True to reduce the program (see Presolve) before it is solved. Defaults to False.
+    :type presolve: bool, optional
+    :param options: passed on to the solver
+    :type options: dict, optional
+
+    :ivar name: name of the backend
+    :vartype name: str
+    """
+
+    name: str = ""
+
+    def __init__(self, presolve: bool = False, **options):
+        self.presolve = presolve
+        self.options = options
+
+    def solve(self, program: Program) -> tuple[numpy.ndarray, float] | None:
+        """
+        Solves the program
+
+        :param program: program with an objective set
+        :type program: Program
+
+        :returns: values of all variables and objective value, None if no solution is found
+        :rtype: tuple[numpy.ndarray, float] | None
+        """
+        form = program.matrices.form()
+        if not self.presolve:
+            return self.optimize(form)
+
+        presolved = Presolve(form, name=f"Presolve({program})")
+        if presolved.infeasible:
+            return None
+        solved = self.optimize(presolved.form)
+        if solved is None:
+            return None
+        z = presolved.postsolve(solved[0])
+        return z, float(form["c"] @ z)
+
+    @abstractmethod
+    def optimize(self, form: dict) -> tuple[numpy.ndarray, float] | None:
+        """
+        Solves a canonical form
+
+        :param form: canonical form, see Canonical.form
+        :type form: dict[str, numpy.ndarray | csr_array]
+
+        :returns: values of the variables and objective value, None if no solution is found
+        :rtype: tuple[numpy.ndarray, float] | None
+        """
+
+
+class HiGHS(Solver):
+    """
+    HiGHS through scipy, needs no license.
+    LPs are solved with linprog, MILPs with milp,
+    both on the sparse canonical form of the program.
+
+    :param options: passed on to linprog or milp, e.g. time_limit, mip_rel_gap
+    :type options: dict, optional
+    """
+
+    name = "highs"
+
+    def optimize(self, form: dict) -> tuple[numpy.ndarray, float] | None:
+        A, b, eq = form["A"], form["b"], form["eq"]
+
+        if form["integrality"].any():
+            constraints = []
+            if (~eq).any():
+                constraints.append(LinearConstraint(A[~eq], -numpy.inf, b[~eq]))
+            if eq.any():
+                constraints.append(LinearConstraint(A[eq], b[eq], b[eq]))
+            result = milp(
+                form["c"],
+                constraints=constraints,
+                integrality=form["integrality"],
+                bounds=Bounds(form["lb"], form["ub"]),
+                options=self.options,
+            )
+        else:
+            result = linprog(
+                form["c"],
+                A_ub=A[~eq] if (~eq).any() else None,
+                b_ub=b[~eq] if (~eq).any() else None,
+                A_eq=A[eq] if eq.any() else None,
+                b_eq=b[eq] if eq.any() else None,
+                bounds=numpy.column_stack([form["lb"], form["ub"]]),
+                method="highs",
+                options=self.options,
+            )
+
+        if result.status != 0:
+            logger.warning("🛑 %s: %s 🛑", self, result.message)
+            return None
+
+        return result.x, float(result.fun)
+
+
+# backends by name, add to this to plug in a solver
+SOLVERS: dict[str, type[Solver]] = {"highs": HiGHS}
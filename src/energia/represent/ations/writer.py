@@ -0,0 +1,232 @@
+"""Writes the program to MPS and LP files"""
+
+from __future__ import annotations
+
+import gzip
+import re
+from typing import IO, TYPE_CHECKING, Iterator
+
+import numpy
+
+if TYPE_CHECKING:
+    from .program import Program
+
+# terms per line in LP files, lines are kept short for all readers
+_TERMS = 8
+
+# characters that are not allowed in names by some readers
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.()]")
+
+
+def _safe(name: str) -> str:
+    """Name usable in both MPS and LP files"""
+    return _UNSAFE.sub("_", name.replace("[", "(").replace("]", ")"))
+
+
+def _number(value: float) -> str:
+    """Shortest representation that reads back to the same float"""
+    return repr(float(value))
+
+
+def _open(path: str) -> IO[str]:
+    """Opens the file to write to, compressed if the path ends in .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def _format(path: str) -> str:
+    """Format from the extension, 'mps' or 'lp'"""
+    stem = path[: -len(".gz")] if path.endswith(".gz") else path
+    for fmt in ("mps", "lp"):
+        if stem.lower().endswith(f".{fmt}"):
+            return fmt
+    raise ValueError(
+        f"Cannot write {path}, the extension should be .mps or .lp (optionally .gz)"
+    )
+
+
+class _Rows:
+    """
+    Rows of the canonical form (leq, then eq),
+    in the order they are written: by category, then by constraint set
+
+    :param program: program to write
+    :type program: Program
+
+    :ivar names: name of every row of the canonical form
+    :vartype names: list[str]
+    :ivar groups: category and canonical rows of each group, in order
+    :vartype groups: list[tuple[str, list[int]]]
+    """
+
+    def __init__(self, program: Program):
+        matrices = program.matrices
+        position: dict[int, int] = {
+            id(c): n for n, c in enumerate(matrices.leqcons + matrices.eqcons)
+        }
+
+        self.names: list[str] = [""] * len(position)
+        groups: dict[str, list[int]] = {}
+
+        sets = zip(program.constraint_sets, program.names_constraint_sets)
+        for cons, name in sets:
+            rows = groups.setdefault(str(cons.category), [])
+            for i, c in enumerate(cons._):
+                n = position.get(id(c))
+                # non-negativity constraints are written as bounds
+                # and constraints can feature in more than one set
+                if n is None or self.names[n]:
+                    continue
+                self.names[n] = _safe(f"{name}({i})")
+                rows.append(n)
+
+        # constraints not in any set
+        other = [n for n, name in enumerate(self.names) if not name]
+        for n in other:
+            self.names[n] = f"R{n}"
+        if other:
+            groups.setdefault("Other", []).extend(other)
+
+        self.groups = [(category, rows) for category, rows in groups.items() if rows]
+
+    def __iter__(self) -> Iterator[tuple[str, list[int]]]:
+        return iter(self.groups)
+
+
+def _mps(program: Program, f: IO[str]):
+    """Writes the program in free MPS format"""
+    form = program.matrices.form()
+    eq, b, c = form["eq"], form["b"], form["c"]
+    integrality, lb, ub = form["integrality"], form["lb"], form["ub"]
+    # column by column, as MPS lists coefficients
+    A = form["A"].tocsc()
+    rows = _Rows(program)
+    variables = [_safe(str(v)) for v in program.variables]
+
+    f.write(f"NAME {_safe(program.name)}\n")
+    f.write("ROWS\n")
+    f.write(" N obj\n")
+    for category, group in rows:
+        f.write(f"* {category}\n")
+        for n in group:
+            f.write(f" {'E' if eq[n] else 'L'} {rows.names[n]}\n")
+
+    f.write("COLUMNS\n")
+    integer = False
+    for j, var in enumerate(variables):
+        if integrality[j] != integer:
+            integer = not integer
+            marker = "INTORG" if integer else "INTEND"
+            f.write(f" MARKER 'MARKER' '{marker}'\n")
+        start, end = A.indptr[j], A.indptr[j + 1]
+        # every variable is written, those in no row with a zero cost
+        if c[j] or start == end:
+            f.write(f" {var} obj {_number(c[j])}\n")
+        for n, a in zip(A.indices[start:end], A.data[start:end]):
+            f.write(f" {var} {rows.names[n]} {_number(a)}\n")
+    if integer:
+        f.write(" MARKER 'MARKER' 'INTEND'\n")
+
+    f.write("RHS\n")
+    for n in numpy.flatnonzero(b):
+        f.write(f" RHS {rows.names[n]} {_number(b[n])}\n")
+
+    f.write("BOUNDS\n")
+    for j, var in enumerate(variables):
+        if ub[j] == 1 and integrality[j]:
+            f.write(f" BV BND {var}\n")
+        elif lb[j] == -numpy.inf:
+            f.write(f" FR BND {var}\n")
+        elif integrality[j]:
+            # some readers take integers with no bounds as binary
+            f.write(f" PL BND {var}\n")
+    f.write("ENDATA\n")
+
+
+def _terms(coefficients, variables: list[str]) -> Iterator[str]:
+    """Terms of a linear expression, in lines of a few terms each"""
+    line = []
+    for j, (a, var) in enumerate(coefficients):
+        sign = "-" if a < 0 else "+"
+        if j == 0 and sign == "+":
+            line.append(f"{_number(a)} {variables[var]}")
+        else:
+            line.append(f"{sign} {_number(abs(a))} {variables[var]}")
+        if len(line) == _TERMS:
+            yield " ".join(line)
+            line = []
+    if line:
+        yield " ".join(line)
+
+
+def _lp(program: Program, f: IO[str]):
+    """Writes the program in CPLEX LP format"""
+    form = program.matrices.form()
+    eq, b, c = form["eq"], form["b"], form["c"]
+    integrality, lb, ub = form["integrality"], form["lb"], form["ub"]
+    A = form["A"]
+    rows = _Rows(program)
+    variables = [_safe(str(v)) for v in program.variables]
+
+    f.write(f"\\ {program.name}\n")
+    f.write("Minimize\n")
+    objective = [(c[j], j) for j in numpy.flatnonzero(c)]
+    f.write(" obj:")
+    for line in _terms(objective, variables) if objective else ["0"]:
+        f.write(f" {line}\n")
+
+    f.write("Subject To\n")
+    for category, group in rows:
+        f.write(f"\\ {category}\n")
+        for n in group:
+            start, end = A.indptr[n], A.indptr[n + 1]
+            terms = list(zip(A.data[start:end], A.indices[start:end]))
+            # rows with no variables still need one
+            lines = list(_terms(terms or [(0.0, 0)], variables))
+            lines[-1] += f" {'=' if eq[n] else '<='} {_number(b[n])}"
+            f.write(f" {rows.names[n]}:")
+            for line in lines:
+                f.write(f" {line}\n")
+
+    # variables which feature nowhere else are declared in the bounds
+    unused = (numpy.diff(A.tocsc().indptr) == 0) & (c == 0)
+    f.write("Bounds\n")
+    for j, var in enumerate(variables):
+        if lb[j] == -numpy.inf:
+            f.write(f" {var} free\n")
+        elif unused[j] and not integrality[j]:
+            f.write(f" {var} >= 0\n")
+
+    generals = [v for j, v in enumerate(variables) if integrality[j] and ub[j] != 1]
+    binaries = [v for j, v in enumerate(variables) if integrality[j] and ub[j] == 1]
+    for section, names in (("General", generals), ("Binary", binaries)):
+        if names:
+            f.write(f"{section}\n")
+            for var in names:
+                f.write(f" {var}\n")
+    f.write("End\n")
+
+
+def write(program: Program, path: str) -> str:
+    """
+    Writes the program to a MPS or LP file, line by line.
+    Constraints are grouped by category, in the order the program stores them
+
+    :param program: program to write
+    :type program: Program
+    :param path: file, .mps or .lp, compressed if it ends in .gz (e.g. 'model.mps.gz')
+    :type path: str
+
+    :returns: path of the written file
+    :rtype: str
+
+    :raises ValueError: if the extension is not .mps or .lp
+    """
+    fmt = _format(path)
+    with _open(path) as f:
+        if fmt == "mps":
+            _mps(program, f)
+        else:
+            _lp(program, f)
+    return path
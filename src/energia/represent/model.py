@@ -46,7 +46,11 @@ from ..modeling.parameters.instruction import Instruction
 from ..modeling.variables.control import Control
 from ..modeling.variables.recipe import Recipe
 from ..modeling.variables.states import Consequence, State, Stream
+from ..utils.aggregation import Aggregation, aggregate
+from .ations.estimate import Estimate
 from .ations.graph import Graph
+from .ations.ledger import Ledger
+from .ations.profile import Profile
 from .ations.program import Program
 from .ations.scenario import Scenario
 
@@ -64,6 +68,8 @@ if TYPE_CHECKING:
     from enum import Enum
     from typing import DefaultDict
 
+    from scipy.sparse import csr_array
+
     from .._core._component import _Component
     from ..components.commodities.commodity import Commodity
     from ..modeling.indices.domain import Domain
@@ -89,9 +95,17 @@ class Model:
     :type default: bool
     :param capacitate: True if process capacities should be determined to bound operations.
     :type capacitate: bool
+    :param solver: Solver used by .opt(), 'gurobi' or a backend in SOLVERS, e.g. 'highs'. Defaults to 'gurobi'.
+    :type solver: str
+    :param prune: True if operations (and commodity balances) which cannot reach any demand are not written, site by site, see Graph. Defaults to False.
+    :type prune: bool
+    :param lean: True to skip the bookkeeping only needed to inspect the model, see note. Defaults to False.
+    :type lean: bool
 
     :ivar added: List of added objects to the Model.
     :vartype added: list[str]
+    :ivar indexed: Components and aspects added to the Model, positions are their dense ids (uid).
+    :vartype indexed: list[_X | Aspect]
     :ivar update_map: maps component type to representation and collection.
     :vartype update_map: dict
     :ivar time: time representation of the Model.
@@ -130,15 +144,31 @@ class Model:
     :vartype maps: dict[Aspect, dict[Domain, dict[str, list[Domain]]]]
     :ivar maps_report: Maps of aspects to domains for reporting variables.
     :vartype maps_report: dict[Aspect, dict[Domain, dict[str, list[Domain]]]]
-
+    :ivar ledger: Dispositions, balances and maps as integer arrays of dense ids, read off the trees once per change of the program.
+    :vartype ledger: Ledger
+    :ivar aggregations: Time-series aggregations into representative periods.
+    :vartype aggregations: list[Aggregation]
 
     :raises ValueError: If an attribute name already exists in the Model.
+
+    .. note::
+        Lean models build the same program, without:
+            - the constraint sets of components (_X.cons_ids), so _X.cons, _X.show, Sample.show
+              are empty and profile_size attributes no constraints to components, locations or periods
+            - the domains of components (_X.domains), _X.aspects only notes the aspects (no domains)
+            - the parameter tree of the scenario (Scenario[aspect]), only what is bound is noted
+            - LaTeX names of variables
+            - info logs made while building (e.g. 🔗 Bound, 🧭 Mapped), the energia logger is left as is
+        Maps (maps and maps_report) are kept, they tell whether a map is written or extended.
     """
 
     name: str = "m"
     init: list[Callable[[Self]]] | None = None
     default: bool = True
     capacitate: bool = False
+    solver: str = "gurobi"
+    prune: bool = False
+    lean: bool = False
 
     def __post_init__(self):
 
@@ -146,6 +176,8 @@ class Model:
 
         # what components have been added to the model
         self.added: list[str] = []
+        # components (and aspects) by their dense ids
+        self.indexed: list[_X | Aspect] = []
         # map of what representation and collection within that representation
         # an object of a particular type belongs to
 
@@ -294,9 +326,15 @@ class Model:
             "P",
         ]
 
-        self.reserved_names += _program_matrices
+        self.reserved_names += _program_matrices + ["matrices"]
 
-        self.properties = {i: self.program for i in _program_matrices}
+        # matrices are assembled sparse, and cached until the program changes
+        # P and Z (ordinals) come from the program
+        self.properties = {
+            i: self.program.matrices for i in _program_matrices if i not in ("P", "Z")
+        }
+        self.properties.update({"P": self.program, "Z": self.program})
+        self.properties["matrices"] = self.program
 
         # --------------------------------------------------------------------
         # * Default Components
@@ -363,12 +401,18 @@ class Model:
         self.maps: dict[Aspect, dict[str, dict[Domain, list[Domain]]]] = {}
         self.maps_report: dict[Aspect, dict[str, dict[Domain, list[Domain]]]] = {}
 
+        # * Ledger of the above, as dense ids (read off, not kept)
+        self.ledger = Ledger(self)
+
         # * Generated Modes
         self.modes_dict: dict[Sample, Modes] = {}
 
         # * Conversion Matrix
         self.convmatrix: dict[Process, dict[Resource, int | float | list]] = {}
 
+        # * Time-Series Aggregations
+        self.aggregations: list[Aggregation] = []
+
         # --------------------------------------------------------------------
         # * Measurement Related
         # --------------------------------------------------------------------
@@ -512,6 +556,9 @@ class Model:
             raise AttributeError(f"{name} already defined")
             # added is the list of all components that have been added to the model
         self.added.append(name)
+        # dense id, components and aspects are hashed by identity
+        value.uid = len(self.indexed)
+        self.indexed.append(value)
 
         # if not subset:
         #     # ignore subsets
@@ -520,6 +567,9 @@ class Model:
         # the set that needs to be updated
         model_set.append(value)
 
+        # commodities, operations and locations are nodes of the graph
+        self.graph.add(value, collection)
+
         # update the index set for index elements
         if collection in [
             "resources",
@@ -794,6 +844,67 @@ class Model:
         periods.modes.append(modes)
         return modes
 
+    def aggregate(
+        self,
+        profiles: dict[str, list[float]],
+        length: int,
+        k: int,
+        method: Literal["kmedoids", "hierarchical", "chronological"] = "kmedoids",
+        names: list[str] | None = None,
+        seed: int = 0,
+        connectivity: csr_array | None = None,
+    ) -> Aggregation:
+        """
+        Clusters profiles into k representative periods and sets the temporal scales,
+        [k representative periods, length time steps each]
+
+        The weights (number of original periods each representative stands for)
+        are not applied to anything bound, bind the reduced profiles
+        and weigh what accrues over time (operational costs, emissions) yourself::
+
+            agg = m.aggregate(profiles, length=24, k=12)
+            _ = m.power.release.prep(100, norm=False) >= agg.reduced["demand"]
+            _ = m.usd.spend(m.wf.operate) == agg.weigh([10] * 12 * 24)
+
+        :param profiles: profiles over the full horizon, by name
+        :type profiles: dict[str, list[float]]
+        :param length: number of time steps in a representative period
+        :type length: int
+        :param k: number of representative periods
+        :type k: int
+        :param method: clustering method. Defaults to 'kmedoids'.
+        :type method: Literal['kmedoids', 'hierarchical', 'chronological'], optional
+        :param names: names of the horizon, representative and dense periods. Defaults to ['y', 'd', 'h'].
+        :type names: list[str], optional
+        :param seed: seed for k-medoids initialization. Defaults to 0.
+        :type seed: int, optional
+        :param connectivity: periods that can be merged for chronological clustering. Defaults to adjacent periods.
+        :type connectivity: csr_array, optional
+
+        :returns: Aggregation with weights and profiles reduced to the representative periods
+        :rtype: Aggregation
+
+        :raises ValueError: if periods have already been declared
+        """
+        if self.time.periods:
+            raise ValueError(
+                f"{self}: Periods already declared, aggregate before declaring Periods"
+            )
+
+        _aggregation = aggregate(
+            profiles,
+            length=length,
+            k=k,
+            method=method,
+            seed=seed,
+            connectivity=connectivity,
+        )
+
+        self.TemporalScales([1, _aggregation.k, length], names or ["y", "d", "h"])
+        self.aggregations.append(_aggregation)
+
+        return _aggregation
+
     # ------------------------------------------------------------------------
     # * Illustrations from Different Perspectives
     # ------------------------------------------------------------------------
@@ -908,6 +1019,89 @@ class Model:
         return self.program.eval(*theta_vals, n_sol=n_sol, roundoff=roundoff)
 
     # * Saving
+    def write(self, path: str) -> str:
+        """Write the program to a MPS or LP file
+
+        :param path: file, .mps or .lp, compressed if it ends in .gz (e.g. 'model.mps.gz')
+        :type path: str
+
+        :return: path of the written file
+        :rtype: str
+        """
+        return self.program.write(path)
+
+    def profile_size(
+        self, by: str = "component", measure: str = "memory", flame: str = ""
+    ) -> Profile:
+        """Profile the size of the program, to see where the model bloats
+
+        :param by: dimension logged, ranked by measure, one of 'component', 'aspect',
+            'category', 'location' or 'period'. Defaults to 'component'.
+        :type by: str, optional
+        :param measure: 'variables', 'binaries', 'constraints', 'nonzeros'
+            or 'memory' (estimated bytes). Defaults to 'memory'.
+        :type measure: str, optional
+        :param flame: file to write the nested (flame graph) report to. Defaults to ''.
+        :type flame: str, optional
+
+        :return: sizes by component, aspect, category, location and period
+        :rtype: Profile
+        """
+        profile = Profile(self)
+        logger.info(
+            "📏  %s has %s variables (%s binary), %s constraints, %s nonzeros, ~%s bytes",
+            self,
+            *(profile.total[m] for m in profile.total),
+        )
+        logger.info("📏  Largest by %s:\n%s", by, profile.table(by, measure))
+        if flame:
+            profile.flame(flame, measure)
+        return profile
+
+    def estimate(
+        self,
+        memory_budget: int | None = None,
+        on_budget: Literal["raise", "lean"] = "raise",
+    ) -> Estimate:
+        """Predict the size of the program, before the operations are located
+
+        :param memory_budget: bytes available to build the program. Defaults to None.
+        :type memory_budget: int, optional
+        :param on_budget: if the predicted peak exceeds the budget, 'raise' a MemoryError
+            or build 'lean' (without inspection bookkeeping). Defaults to 'raise'.
+        :type on_budget: Literal['raise', 'lean'], optional
+
+        :return: predicted variables, constraints, nonzeros and peak memory
+        :rtype: Estimate
+
+        :raises MemoryError: if the budget is exceeded and on_budget is 'raise'
+        :raises ValueError: if on_budget is not known
+        """
+        if on_budget not in ("raise", "lean"):
+            raise ValueError(f"on_budget should be 'raise' or 'lean', not {on_budget}")
+
+        estimate = Estimate(self)
+        logger.info(
+            "🔮  %s will have ~%s variables, ~%s constraints, ~%s nonzeros, peak ~%s bytes",
+            self,
+            estimate.total["variables"],
+            estimate.total["constraints"],
+            estimate.total["nonzeros"],
+            estimate.memory,
+        )
+
+        if memory_budget is None or estimate.within(memory_budget):
+            return estimate
+
+        if on_budget == "raise":
+            raise MemoryError(
+                f"{self} needs ~{estimate.memory} bytes, over the budget of {memory_budget}"
+            )
+
+        logger.warning("🪶  %s is over the memory budget, building lean", self)
+        self.lean = True
+        return estimate
+
     def save(self, as_type: str = "dill"):
         """Save the Model to a file"""
         if as_type == "dill":
@@ -0,0 +1,295 @@
+"""Time-series aggregation into representative periods"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Literal
+
+import numpy
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.sparse import csr_array
+
+from .math import sparse_connectivity_matrix
+
+
+def kmedoids(
+    data: numpy.ndarray,
+    k: int,
+    max_iter: int = 100,
+    seed: int = 0,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    k-medoids clustering (alternating, with k-medoids++ initialization)
+
+    :param data: observations as rows, features as columns
+    :type data: numpy.ndarray
+    :param k: number of clusters
+    :type k: int
+    :param max_iter: maximum number of iterations. Defaults to 100.
+    :type max_iter: int, optional
+    :param seed: seed for the initialization. Defaults to 0.
+    :type seed: int, optional
+
+    :returns: cluster label of each observation, positions of the medoids
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    n = len(data)
+    # pairwise squared euclidean distances
+    sq = numpy.einsum("ij,ij->i", data, data)
+    dist = numpy.maximum(sq[:, None] + sq[None, :] - 2 * data @ data.T, 0)
+
+    rng = numpy.random.default_rng(seed)
+    # k-medoids++, start with the most central observation
+    medoids = [int(numpy.argmin(dist.sum(axis=1)))]
+    for _ in range(1, k):
+        closest = dist[:, medoids].min(axis=1)
+        if not closest.sum():
+            # all remaining observations coincide with a medoid
+            medoids.append(int(rng.choice(numpy.setdiff1d(numpy.arange(n), medoids))))
+            continue
+        medoids.append(int(rng.choice(n, p=closest / closest.sum())))
+    medoids = numpy.array(medoids)
+
+    for _ in range(max_iter):
+        labels = numpy.argmin(dist[:, medoids], axis=1)
+        new = medoids.copy()
+        for c in range(k):
+            members = numpy.flatnonzero(labels == c)
+            if members.size:
+                # member with the least distance to all other members
+                cost = dist[numpy.ix_(members, members)].sum(axis=1)
+                new[c] = members[numpy.argmin(cost)]
+        if numpy.array_equal(new, medoids):
+            break
+        medoids = new
+
+    return numpy.argmin(dist[:, medoids], axis=1), medoids
+
+
+def chronological(
+    data: numpy.ndarray,
+    k: int,
+    connectivity: csr_array | numpy.ndarray | None = None,
+) -> numpy.ndarray:
+    """
+    Agglomerative (Ward) clustering where only connected clusters can merge.
+    With the default chronological connectivity, clusters are contiguous in time.
+
+    :param data: observations as rows, features as columns
+    :type data: numpy.ndarray
+    :param k: number of clusters
+    :type k: int
+    :param connectivity: observations that can be merged, [..1,0,1..] if None
+    :type connectivity: csr_array | numpy.ndarray, optional
+
+    :returns: cluster label of each observation
+    :rtype: numpy.ndarray
+    """
+    n = len(data)
+    if connectivity is None:
+        connectivity = sparse_connectivity_matrix(n)
+
+    # only the sparsity pattern is needed, memory stays O(n + connections)
+    connectivity = csr_array(connectivity)
+    indptr, indices = connectivity.indptr, connectivity.indices
+
+    # cluster -> number of members, sum of members
+    sizes = dict.fromkeys(range(n), 1)
+    sums = {i: numpy.array(data[i], dtype=float) for i in range(n)}
+    neighbors = {
+        i: set(indices[indptr[i] : indptr[i + 1]].tolist()) - {i} for i in range(n)
+    }
+    # the connectivity may be given one way only
+    for i in range(n):
+        for j in neighbors[i]:
+            neighbors[j].add(i)
+
+    def ward(a: int, b: int) -> float:
+        """Increase in within cluster variance if a and b are merged"""
+        na, nb = sizes[a], sizes[b]
+        diff = sums[a] / na - sums[b] / nb
+        return na * nb / (na + nb) * float(diff @ diff)
+
+    heap = [(ward(a, b), a, b) for a in neighbors for b in neighbors[a] if a < b]
+    heapq.heapify(heap)
+
+    parent = list(range(n))
+    new = n
+    while len(sizes) > k and heap:
+        _, a, b = heapq.heappop(heap)
+        if a not in sizes or b not in sizes:
+            # stale entry, one of the clusters has been merged
+            continue
+        sizes[new] = sizes.pop(a) + sizes.pop(b)
+        sums[new] = sums.pop(a) + sums.pop(b)
+        neighbors[new] = (neighbors.pop(a) | neighbors.pop(b)) - {a, b}
+        for c in neighbors[new]:
+            neighbors[c] -= {a, b}
+            neighbors[c].add(new)
+            heapq.heappush(heap, (ward(c, new), c, new))
+        parent[a] = parent[b] = new
+        parent.append(new)
+        new += 1
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    # number the clusters in order of first appearance
+    roots = [root(i) for i in range(n)]
+    order = {r: c for c, r in enumerate(dict.fromkeys(roots))}
+    return numpy.array([order[r] for r in roots])
+
+
+@dataclass
+class Aggregation:
+    """
+    Representative periods of a set of time-series profiles.
+
+    :param length: Number of time steps in a representative period.
+    :type length: int
+    :param labels: Representative (cluster) of each original period.
+    :type labels: numpy.ndarray
+    :param medoids: Original period chosen as each representative.
+    :type medoids: numpy.ndarray
+    :param profiles: Input profiles by name.
+    :type profiles: dict[str, numpy.ndarray]
+
+    :ivar k: Number of representative periods.
+    :vartype k: int
+    :ivar weights: Number of original periods each representative stands for.
+    :vartype weights: list[int]
+    :ivar reduced: Profiles over the representative periods, ready to be bound.
+    :vartype reduced: dict[str, list[float]]
+    """
+
+    length: int
+    labels: numpy.ndarray
+    medoids: numpy.ndarray
+    profiles: dict[str, numpy.ndarray] = field(repr=False)
+
+    def __post_init__(self):
+        self.k = len(self.medoids)
+        self.weights: list[int] = numpy.bincount(
+            self.labels, minlength=self.k
+        ).tolist()
+        self.reduced: dict[str, list[float]] = {
+            name: self.reduce(profile) for name, profile in self.profiles.items()
+        }
+
+    def reduce(self, profile: list[float] | numpy.ndarray) -> list[float]:
+        """
+        Picks the representative periods out of a full length profile
+
+        :param profile: profile over the original periods
+        :type profile: list[float] | numpy.ndarray
+
+        :returns: profile over the representative periods
+        :rtype: list[float]
+        """
+        blocks = numpy.asarray(profile, dtype=float).reshape(-1, self.length)
+        return blocks[self.medoids].ravel().tolist()
+
+    def expand(self, values: list[float] | numpy.ndarray) -> list[float]:
+        """
+        Maps values over the representative periods back to the original chronology
+
+        :param values: values over the representative periods
+        :type values: list[float] | numpy.ndarray
+
+        :returns: values over the original periods
+        :rtype: list[float]
+        """
+        blocks = numpy.asarray(values, dtype=float).reshape(self.k, self.length)
+        return blocks[self.labels].ravel().tolist()
+
+    def weigh(self, values: list[float] | numpy.ndarray) -> list[float]:
+        """
+        Scales values over the representative periods by their weights.
+        Useful for operational costs and emissions.
+
+        :param values: values over the representative periods
+        :type values: list[float] | numpy.ndarray
+
+        :returns: weighted values
+        :rtype: list[float]
+        """
+        blocks = numpy.asarray(values, dtype=float).reshape(self.k, self.length)
+        return (blocks * numpy.array(self.weights)[:, None]).ravel().tolist()
+
+
+def aggregate(
+    profiles: dict[str, list[float] | numpy.ndarray],
+    length: int,
+    k: int,
+    method: Literal["kmedoids", "hierarchical", "chronological"] = "kmedoids",
+    seed: int = 0,
+    connectivity: csr_array | None = None,
+) -> Aggregation:
+    """
+    Clusters profiles into representative periods
+
+    :param profiles: profiles of the same length, by name
+    :type profiles: dict[str, list[float] | numpy.ndarray]
+    :param length: number of time steps in a period, e.g. 24 for days of hours
+    :type length: int
+    :param k: number of representative periods
+    :type k: int
+    :param method: clustering method. Defaults to 'kmedoids'.
+    :type method: Literal['kmedoids', 'hierarchical', 'chronological'], optional
+    :param seed: seed for k-medoids initialization. Defaults to 0.
+    :type seed: int, optional
+    :param connectivity: periods that can be merged for chronological clustering. Defaults to adjacent periods.
+    :type connectivity: csr_array, optional
+
+    :returns: Aggregation with labels, weights and reduced profiles
+    :rtype: Aggregation
+
+    :raises ValueError: if profiles do not split evenly into k or more periods
+    """
+    _profiles = {
+        name: numpy.asarray(profile, dtype=float) for name, profile in profiles.items()
+    }
+    sizes = {len(profile) for profile in _profiles.values()}
+    if len(sizes) != 1:
+        raise ValueError("All profiles need to be of the same length")
+    size = sizes.pop()
+    if size % length:
+        raise ValueError(f"Profiles of length {size} cannot be split into {length}")
+    n = size // length
+    if not 0 < k <= n:
+        raise ValueError(f"k needs to be between 1 and {n}")
+
+    # each profile is scaled to its peak so that none dominates the distance
+    features = numpy.hstack(
+        [
+            (profile / (numpy.abs(profile).max() or 1)).reshape(n, length)
+            for profile in _profiles.values()
+        ]
+    )
+
+    if method == "kmedoids":
+        labels, medoids = kmedoids(features, k, seed=seed)
+
+    elif method in ["hierarchical", "chronological"]:
+        if method == "hierarchical":
+            labels = fcluster(linkage(features, method="ward"), k, "maxclust") - 1
+        else:
+            labels = chronological(features, k, connectivity=connectivity)
+        # the member closest to the cluster centroid is the representative
+        medoids = numpy.empty(labels.max() + 1, dtype=int)
+        for c in range(len(medoids)):
+            members = numpy.flatnonzero(labels == c)
+            centroid = features[members].mean(axis=0)
+            medoids[c] = members[
+                numpy.argmin(((features[members] - centroid) ** 2).sum(axis=1))
+            ]
+
+    else:
+        raise ValueError(f"Unknown aggregation method {method}")
+
+    return Aggregation(
+        length=length, labels=labels, medoids=medoids, profiles=_profiles
+    )
@@ -1,8 +1,11 @@
 """Data management utilities"""
 
-import numpy as np
+import numpy
 import pandas as pd
 
+from .preprocess import convert, fill, replace_outliers
+from .preprocess import stretch as stretch_
+
 # from ..solution.result import Result
 
 
@@ -33,67 +36,23 @@ def make_henry_price_df(
         DataFrame containing varying natural gas prices with missing values filled.
     """
 
-    df = pd.read_csv(file_name, skiprows=5, names=["date", "CH4"])
-
-    df[["month", "day", "year"]] = df["date"].str.split("/", expand=True)
-    df = df[df["year"] == str(year)].astype({"month": int, "day": int, "year": int})
-    # , format='%d%b%Y:%H:%M:%S.%f')
-    df["date"] = pd.to_datetime(df["date"])
-    df["doy"] = df["date"].dt.dayofyear
-    df = df.sort_values(by=["doy"])
-    df = df.drop(columns="date").dropna(axis="rows")
-    doy_list = list(df["doy"])
+    df = pd.read_csv(file_name, skiprows=5, names=["date", "CH4"]).dropna(axis="rows")
+    df.index = pd.to_datetime(df.pop("date"))
+    df = df[df.index.year == year]
 
     # fixes values for weekends and holidays to last active day
-    for i in np.arange(1, 366):
-        if i not in doy_list:
-            if i == 1:  # onetime fix if first day has no value, takes value from day 2
-                df = pd.concat(
-                    [
-                        df,
-                        pd.DataFrame.from_records(
-                            [
-                                {
-                                    "CH4": df["CH4"][df["doy"] == 2].values[0],
-                                    "month": 1,
-                                    "day": 1,
-                                    "year": year,
-                                    "doy": 1,
-                                },
-                            ],
-                        ),
-                    ],
-                )
-            else:
-                df = pd.concat(
-                    [
-                        df,
-                        pd.DataFrame.from_records(
-                            [
-                                {
-                                    "CH4": df["CH4"][df["doy"] == i - 1].values[0],
-                                    "month": df["month"][df["doy"] == i - 1].values[0],
-                                    "day": df["day"][df["doy"] == i - 1].values[0],
-                                    "year": df["year"][df["doy"] == i - 1].values[0],
-                                    "doy": i,
-                                },
-                            ],
-                        ),
-                    ],
-                )
-
-    df = df.sort_values(by=["doy"])
-    df = df.reset_index(drop=True)
-    df["CH4"] = df["CH4"] / 22.4  # convert from $/MMBtu to $/kg
-    df = df[["CH4", "doy"]].rename(columns={"doy": "day"})
+    start = pd.Timestamp(year=year, month=1, day=1)
+    df = fill(df, start=start, end=start + pd.Timedelta(days=364))
+    df = convert(df, 1 / 22.4)  # convert from $/MMBtu to $/kg
+
+    days = numpy.arange(365)
     if stretch is False:
-        df = df
-        df["scales"] = [(0, int(i - 1)) for i in df["day"]]
+        df = df.reset_index(drop=True)
+        df["scales"] = [(0, int(i)) for i in days]
 
     else:
-        df = df.loc[df.index.repeat(24)].reset_index(drop=True)
-        df["hour"] = [int(i) for i in range(0, 24)] * 365
-        df["scales"] = [(0, int(i - 1), int(j)) for i, j in zip(df["day"], df["hour"])]
+        df = stretch_(df, by=24, freq=None)
+        df["scales"] = [(0, int(i), int(j)) for i in days for j in range(24)]
     df = df[["CH4", "scales"]]
     return df
 
@@ -107,6 +66,7 @@ def remove_outliers(
     Removes outliers up to a chosen number of standard deviations.
 
     Outliers are replaced with the mean of data points on both sides of the point.
+    See preprocess.replace_outliers for rolling windows.
 
     Parameters
     ----------
@@ -122,22 +82,7 @@ def remove_outliers(
     :class:`pandas.DataFrame`
         DataFrame with outliers replaced by local means.
     """
-    data_mean, data_std = data.mean(), data.std()
-    # identify outliers
-    cut_off = data_std * sd_cuttoff
-    lower, upper = data_mean - cut_off, data_mean + cut_off
-    for i in range(len(data)):
-        x = data.iloc[i].values[0]
-        if x < float(lower.iloc[0]) or x > float(upper.iloc[0]):
-            data.iloc[i] = (
-                (
-                    sum(data.iloc[i - (j + 1)] for j in range(mean_range))
-                    + sum(data.iloc[i + (j + 1)] for j in range(mean_range))
-                )
-                / 2
-                * mean_range
-            )
-    return data
+    return replace_outliers(data, sd_cutoff=sd_cuttoff, mean_range=mean_range)
 
 
 # def get_data(file_name: str) -> dict:
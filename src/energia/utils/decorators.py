@@ -16,6 +16,11 @@ def once(func):
     return wrapper
 
 
+def _lean(obj) -> bool:
+    """Is the object (or the model it is in) lean"""
+    return bool(getattr(getattr(obj, "model", obj), "lean", False))
+
+
 def timer(
     logger: logging.Logger,
     kind=None,
@@ -33,7 +38,12 @@ def timer(
             result = func(*args, **kwargs)
             elapsed = time.time() - start
 
-            if result is not False:
+            # messages are not made if they are not logged, or the model is lean
+            if (
+                result is not False
+                and not (args and _lean(args[0]))
+                and logger.isEnabledFor(level)
+            ):
 
                 if kind == 'balance-update':
 
@@ -79,6 +89,12 @@ def timer(
                 elif kind == 'construction':
                     msg = f"🏗  Construction streams introduced for {result[0]} in {', '.join([str(s) for s in result[1]])}"
 
+                elif kind == 'optimize':
+                    msg = f"✅  {result[0]} optimized using {result[1]}. Display using .output()"
+
+                elif kind == 'write':
+                    msg = f"📝  Wrote {result}"
+
                 else:
                     msg = f"  Executed {func.__name__}"
 
@@ -87,6 +103,8 @@ def timer(
                     f"{msg:<75} ⏱ {elapsed:.4f} s",
                 )
 
+            return result
+
         return wrapper
 
     return decorator
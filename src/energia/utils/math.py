@@ -3,6 +3,8 @@
 from math import erf, exp, pi, sqrt
 
 import numpy
+from pandas import Series
+from scipy.sparse import coo_array, csr_array
 
 
 def norm_constant(p, mu, sigma) -> float:
@@ -39,57 +41,178 @@ def find_euclidean_distance(a: list, b: list) -> float:
     return distance_
 
 
-def generate_connectivity_matrix(scale_len) -> numpy.array:
+def generate_connectivity_matrix(scale_len: int, cyclic: bool = False) -> numpy.array:
     """
     Generates a connectivity matrix to maintain chronology [..1,0,1..]
 
+    .. note::
+        - dense, use sparse_connectivity_matrix for long scales
+
     :param scale_len: length of the scale
     :type scale_len: int
+    :param cyclic: connect the last period to the first. Defaults to False.
+    :type cyclic: bool, optional
 
     :returns: connectivity matrix
     :rtype: numpy.array
     """
-    connect_ = numpy.zeros((scale_len, scale_len), dtype=int)
-    for i_ in range(len(connect_)):
+    return sparse_connectivity_matrix(scale_len, cyclic=cyclic).toarray().astype(int)
+
+
+def sparse_connectivity_matrix(
+    scale_len: int,
+    cyclic: bool = False,
+    offsets: list[int] | None = None,
+) -> csr_array:
+    """
+    Generates a sparse (CSR) connectivity matrix to maintain chronology
 
-        if i_ == 0:
-            # connect_[i,364] = 1 #uncomment these to generate a cyclic matrix
-            connect_[i_, 1] = 1
-        elif i_ == scale_len - 1:
-            connect_[i_, scale_len - 2] = 1
-            # connect_[i,0] = 1
+    Every period is connected to the periods offset before and after it.
+    Multi-scale connectivity is achieved by passing multiple offsets,
+    e.g. [1, 24] connects an hour to the adjacent hours
+    and to the same hour on adjacent days.
+
+    :param scale_len: length of the scale
+    :type scale_len: int
+    :param cyclic: wrap around the end of the scale. Defaults to False.
+    :type cyclic: bool, optional
+    :param offsets: offsets of the connected periods. Defaults to [1].
+    :type offsets: list[int], optional
+
+    :returns: symmetric connectivity matrix with 1 for connected periods
+    :rtype: scipy.sparse.csr_array
+    """
+    rows, cols = [], []
+    idx = numpy.arange(scale_len)
+
+    for offset in offsets or [1]:
+        if cyclic:
+            src, dst = idx, (idx + offset) % scale_len
         else:
-            connect_[i_, i_ - 1] = 1
-            connect_[i_, i_ + 1] = 1
+            src, dst = idx[: max(scale_len - offset, 0)], idx[offset:]
+        rows += [src, dst]
+        cols += [dst, src]
+
+    rows = numpy.concatenate(rows)
+    cols = numpy.concatenate(cols)
+    # self loops are not connections
+    keep = rows != cols
+
+    connect_ = coo_array(
+        (numpy.ones(keep.sum(), dtype=numpy.int8), (rows[keep], cols[keep])),
+        shape=(scale_len, scale_len),
+    ).tocsr()
+    # duplicates (e.g. cyclic scales of length 2) are summed, clip back to 1
+    connect_.data[:] = 1
     return connect_
 
 
+def isvector(data) -> bool:
+    """
+    Checks if a parameter is a set of values (list, array, Series)
+    rather than a single value
+
+    :param data: parameter
+    :type data: float | list | numpy.ndarray | Series
+
+    :return: True if a set of values
+    :rtype: bool
+    """
+    return isinstance(data, (list, numpy.ndarray, Series)) and numpy.ndim(data) > 0
+
+
+def isnested(data) -> bool:
+    """
+    Checks if a parameter is a list of lists (e.g. values for modes),
+    which are handled list by list, and may be of different lengths
+
+    :param data: parameter
+    :type data: float | list | numpy.ndarray | Series
+
+    :return: True if a list of lists
+    :rtype: bool
+    """
+    return isinstance(data, list) and any(isinstance(i, list) for i in data)
+
+
+def readonly(data: numpy.ndarray | Series) -> numpy.ndarray:
+    """
+    Read-only view of an array or the values of a Series, nothing is copied
+
+    :param data: array or Series
+    :type data: numpy.ndarray | Series
+
+    :return: read-only view
+    :rtype: numpy.ndarray
+    """
+    view = numpy.asarray(data).view()
+    view.flags.writeable = False
+    return view
+
+
+def scale(data, how: str = "max") -> numpy.ndarray:
+    """
+    Scales data column-wise, without leaving numpy
+
+    A 2-D array of (lower, upper) bounds has each bound scaled individually.
+    Constant columns are left unscaled rather than divided by zero.
+
+    :param data: time-series data
+    :type data: list | numpy.ndarray | Series | DataFrame
+    :param how: 'max', 'min_max' (or 'minmax'), 'standard'. Defaults to 'max'.
+    :type how: str, optional
+
+    :return: scaled data
+    :rtype: numpy.ndarray
+
+    :raises ValueError: if how is not recognized
+    """
+    data = numpy.asarray(data, dtype=float)
+
+    if how == "max":
+        shift, spread = 0.0, data.max(axis=0)
+    elif how in ("min_max", "minmax"):
+        shift = data.min(axis=0)
+        spread = data.max(axis=0) - shift
+    elif how == "standard":
+        # population standard deviation, as sklearn's StandardScaler
+        shift, spread = data.mean(axis=0), data.std(axis=0)
+    else:
+        raise ValueError(f"{how} scaling is not recognized")
+
+    spread = numpy.where(spread == 0, 1.0, spread)
+    return (data - shift) / spread
+
+
+def to_list(data: numpy.ndarray) -> float | list[float] | list[tuple[float, float]]:
+    """
+    Converts an array back to the form gana accepts
+
+    :param data: scalar, vector, or (lower, upper) bounds
+    :type data: numpy.ndarray
+
+    :return: float, list, or list of (lower, upper) tuples
+    :rtype: float | list[float] | list[tuple[float, float]]
+    """
+    if data.ndim == 2:
+        return list(map(tuple, data.tolist()))
+    return data.tolist()
+
+
 def normalize(data: list, how: str = "max") -> list:
     """
     min max normalization of data
 
     :param data: time-series data
-    :type data: numpy.array | DataFrame
-    :param how: min-max or max, defaults to "max"
+    :type data: list | numpy.ndarray | Series
+    :param how: min_max, max, or standard, defaults to "max"
     :type how: str, optional
 
     :return: normalized data
-    :rtype: numpy.array | DataFrame
-    """
-    if all(isinstance(i, tuple) for i in data):
-        # lower bound
-        lb = [i[0] for i in data]
-        # upper bound
-        ub = [i[1] for i in data]
-        # normalize lower and upper bounds individually
-        lb_norm = normalize(lb, how=how)
-        ub_norm = normalize(ub, how=how)
-        return list(zip(lb_norm, ub_norm))
-
-    if how == "min_max":
-        min_ = min(data)
-        max_ = max(data)
-        return [(i - min_) / (max_ - min_) for i in data]
+    :rtype: list
+    """
+    if len(data) and all(isinstance(i, list) for i in data):
+        # every nested list is normalized by itself
+        return [normalize(i, how=how) for i in data]
 
-    if how == "max":
-        return [normalize(i) if isinstance(i, list) else i / max(data) for i in data]
+    return to_list(scale(data, how=how))
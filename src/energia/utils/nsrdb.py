@@ -1,9 +1,13 @@
 """Fetch data from NREL's NSRDB database"""
 
+import hashlib
+import json
 import logging
+import os
 
+import numpy
 from numpy import array, average
-from pandas import DataFrame, to_datetime
+from pandas import DataFrame, MultiIndex, to_datetime
 from scipy.spatial import cKDTree
 
 logger = logging.getLogger("energia")
@@ -15,6 +19,359 @@ try:
 except ImportError:
     import_all = True
 
+# local mirrors, either as HDF5 or Zarr
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+
+# columns of the meta table needed to look up sites
+META_COLUMNS = [
+    "latitude",
+    "longitude",
+    "state",
+    "county",
+    "population",
+    "elevation",
+    "landcover",
+]
+
+# number of native (halfhourly) time steps averaged over
+TIMESTEPS = {
+    "halfhourly": 1,  # native data set at 30 mins
+    "hourly": 2,  # averages over the hour
+    "daily": 48,  # averages over the day
+}
+
+
+class SiteIndex:
+    """
+    KD-tree over the coordinates of the NSRDB sites along with
+    the part of the meta table used to look up sites by county.
+    Built once and persisted (as arrays in an .npz), so later look ups do not read the
+    coordinates or meta table again. The tree is rebuilt from the coordinates on load.
+
+    :param coords: (latitude, longitude) of every site
+    :type coords: numpy.ndarray
+    :param meta: meta table of the sites, with META_COLUMNS
+    :type meta: DataFrame
+
+    :ivar tree: KD-tree over the coordinates
+    :vartype tree: cKDTree
+    """
+
+    def __init__(self, coords: numpy.ndarray, meta: DataFrame):
+        self.coords = numpy.asarray(coords, dtype=float)
+        self.meta = meta
+        self.tree = cKDTree(self.coords)
+
+    @classmethod
+    def from_file(cls, nsrdb_data) -> "SiteIndex":
+        """
+        Builds the index from an (open) NSRDB file
+
+        :param nsrdb_data: NSRDB file, remote or local
+        :type nsrdb_data: h5pyd.File | h5py.File | zarr.Group
+
+        :returns: index over the sites
+        :rtype: SiteIndex
+        """
+        meta = DataFrame(nsrdb_data["meta"][...])
+        meta = meta[[col for col in META_COLUMNS if col in meta.columns]]
+        for col in ["state", "county"]:
+            if col in meta.columns and meta[col].dtype == object:
+                meta[col] = meta[col].str.decode("utf-8")
+        return cls(nsrdb_data["coordinates"][...], meta)
+
+    @classmethod
+    def load(cls, path: str) -> "SiteIndex":
+        """
+        Loads a persisted index
+
+        :param path: .npz file the index was saved to
+        :type path: str
+
+        :returns: index over the sites
+        :rtype: SiteIndex
+        """
+        with numpy.load(path, allow_pickle=False) as data:
+            columns = [col for col in META_COLUMNS if f"meta_{col}" in data]
+            meta = DataFrame(
+                {col: data[f"meta_{col}"] for col in columns}, index=data["sites"]
+            )
+            return cls(data["coords"], meta)
+
+    def save(self, path: str):
+        """
+        Persists the index
+
+        :param path: .npz file to save to
+        :type path: str
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        meta = {}
+        for col in self.meta.columns:
+            values = self.meta[col].to_numpy()
+            # strings are kept as unicode arrays, which need no pickling
+            if values.dtype == object:
+                values = values.astype(str)
+            meta[f"meta_{col}"] = values
+        numpy.savez(
+            path, coords=self.coords, sites=self.meta.index.to_numpy(), **meta
+        )
+
+    def nearest(self, lat_lons: list[tuple[float, float]]) -> numpy.ndarray:
+        """
+        Finds the sites closest to many coordinates in one go
+
+        :param lat_lons: (latitude, longitude) to look up
+        :type lat_lons: list[tuple[float, float]]
+
+        :returns: positions of the closest sites
+        :rtype: numpy.ndarray
+        """
+        return self.tree.query(numpy.atleast_2d(lat_lons))[1]
+
+    def county(
+        self, state: str, county: str, get: str = "max-population"
+    ) -> tuple[int, tuple[float, float]]:
+        """
+        Finds the site in a county matching a 'get' metric
+
+        :param state: capitalized state name, e.g. 'Texas'
+        :type state: str
+        :param county: capitalized county name, e.g. 'Brazos'
+        :type county: str
+        :param get: e.g. 'max-population', 'min-elevation'. Defaults to 'max-population'.
+        :type get: str
+
+        :returns: position of the site, (latitude, longitude)
+        :rtype: tuple[int, tuple[float, float]]
+        """
+        county_data = self.meta.loc[
+            (self.meta["state"] == state) & (self.meta["county"] == county)
+        ]
+        # splits the get string, e.g. max - population, gives [max,
+        # population(get_metric)]
+        extreme, get_metric = get.split("-")
+        if extreme == "min":
+            idx = county_data[get_metric].idxmin()
+        else:
+            idx = county_data[get_metric].idxmax()
+        return idx, (
+            float(county_data.loc[idx, "latitude"]),
+            float(county_data.loc[idx, "longitude"]),
+        )
+
+
+def open_nsrdb(year: int, mirror: str | None = None):
+    """
+    Opens the NSRDB file for a year, from a local mirror if given
+
+    The mirror is a directory with nsrdb_{year}.h5 (HDF5) or nsrdb_{year}.zarr (Zarr)
+    laid out as the remote file, i.e. with time_index, coordinates, meta
+    and a (time, site) dataset for every attribute.
+
+    :param year: year of choice, e.g. 2019
+    :type year: int
+    :param mirror: directory with the local copy. Defaults to None (remote).
+    :type mirror: str | None
+
+    :returns: open NSRDB file
+    :rtype: h5pyd.File | h5py.File | zarr.Group | None
+    """
+    if mirror is None:
+        if import_all:
+            logger.warning(
+                "⚠ This is an optional feature. Please install h5pyd, or pip install energiapy[all] ⚠",
+            )
+            return None
+        return h5pyd.File(f"/nrel/nsrdb/v3/nsrdb_{year!s}.h5", "r")
+
+    path = os.path.join(mirror, f"nsrdb_{year!s}")
+    if os.path.exists(path + ".zarr"):
+        if zarr is None:
+            logger.warning("⚠ Please install zarr to read the mirror ⚠")
+            return None
+        return zarr.open(path + ".zarr", mode="r")
+
+    if h5py is None:
+        logger.warning("⚠ Please install h5py to read the mirror ⚠")
+        return None
+    return h5py.File(path + ".h5", "r")
+
+
+def index_file(index: str, year: int, mirror: str | None = None) -> str:
+    """
+    File the site index of an NSRDB file is persisted to,
+    keyed by the year and the file read (the mirror, or remote)
+
+    :param index: directory to persist the index in
+    :type index: str
+    :param year: year of choice, e.g. 2019
+    :type year: int
+    :param mirror: directory with the local copy. Defaults to None (remote).
+    :type mirror: str | None
+
+    :returns: path to the .npz file
+    :rtype: str
+    """
+    source = "remote" if mirror is None else os.path.abspath(mirror)
+    key = hashlib.sha256(json.dumps([source, year]).encode()).hexdigest()[:16]
+    return os.path.join(index, f"nsrdb_{year!s}_{key}.npz")
+
+
+def site_index(
+    nsrdb_data, index: str | None = None, year: int = 0, mirror: str | None = None
+) -> SiteIndex:
+    """
+    Loads the persisted site index, builds (and persists) it if missing
+
+    :param nsrdb_data: open NSRDB file
+    :type nsrdb_data: h5pyd.File | h5py.File | zarr.Group
+    :param index: directory to persist the index in. Defaults to None (not persisted).
+    :type index: str | None
+    :param year: year of the NSRDB file. Defaults to 0.
+    :type year: int
+    :param mirror: directory with the local copy. Defaults to None (remote).
+    :type mirror: str | None
+
+    :returns: index over the sites
+    :rtype: SiteIndex
+    """
+    if index is None:
+        return SiteIndex.from_file(nsrdb_data)
+
+    path = index_file(index, year, mirror)
+    if os.path.exists(path):
+        return SiteIndex.load(path)
+
+    _index = SiteIndex.from_file(nsrdb_data)
+    _index.save(path)
+    logger.info("🌲  Persisted NSRDB site index to %s", path)
+    return _index
+
+
+def _columns(dataset, idx: numpy.ndarray) -> numpy.ndarray:
+    """
+    Reads the columns (sites) of a (time, site) dataset
+
+    Contiguous HDF5 datasets in a local file are memory mapped,
+    others are read chunk by chunk.
+    Sites are read in increasing order, as HDF5 requires, and put back in place.
+
+    :param dataset: dataset of an attribute
+    :type dataset: h5pyd.Dataset | h5py.Dataset | zarr.Array
+    :param idx: positions of the sites
+    :type idx: numpy.ndarray
+
+    :returns: values with a column for every site
+    :rtype: numpy.ndarray
+    """
+    unique, inverse = numpy.unique(idx, return_inverse=True)
+
+    if h5py is not None and isinstance(dataset, h5py.Dataset):
+        offset = dataset.id.get_offset()
+        if offset is not None and dataset.chunks is None:
+            data = _mapped(
+                dataset.file.filename, dataset.dtype, offset, dataset.shape
+            )
+            return numpy.asarray(data[:, unique])[:, inverse]
+
+    # zarr arrays (and anything else) that select along axes independently
+    if hasattr(dataset, "get_orthogonal_selection"):
+        return dataset.get_orthogonal_selection((slice(None), unique))[:, inverse]
+
+    return dataset[:, unique][:, inverse]
+
+
+def _mapped(
+    filename: str, dtype: numpy.dtype, offset: int, shape: tuple[int, int]
+) -> numpy.memmap:
+    """
+    Memory maps a contiguous (time, site) dataset stored in a file
+
+    :param filename: file the dataset is in
+    :type filename: str
+    :param dtype: type of the values
+    :type dtype: numpy.dtype
+    :param offset: position of the first value in the file, in bytes
+    :type offset: int
+    :param shape: (time, site)
+    :type shape: tuple[int, int]
+
+    :returns: read-only map of the dataset
+    :rtype: numpy.memmap
+    """
+    return numpy.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def fetch_nsrdb_sites(
+    attrs: list[str],
+    year: int,
+    lat_lons: list[tuple[float, float]],
+    resolution: str = "hourly",
+    mirror: str | None = None,
+    index: str | None = None,
+) -> tuple[list[tuple[float, float]], DataFrame] | None:
+    """
+    Fetches nsrdb data for many sites in one go
+
+    :param attrs: attributes to fetch
+    :type attrs: list[str]
+    :param year: year of choice, e.g. 2019
+    :type year: int
+    :param lat_lons: (latitude, longitude) to fetch closest data points
+    :type lat_lons: list[tuple[float, float]]
+    :param resolution: choose from 'halfhourly', 'hourly', 'daily'. Defaults to 'hourly'.
+    :type resolution: str
+    :param mirror: directory with a local copy. Defaults to None (remote).
+    :type mirror: str | None
+    :param index: directory to persist the site index in, one file per year and mirror. Defaults to None.
+    :type index: str | None
+
+    :return: (latitude, longitude) of the sites found, DataFrame with (site, attribute) columns
+    :rtype: tuple[list[tuple[float, float]], DataFrame] | None
+    """
+    nsrdb_data = open_nsrdb(year, mirror)
+    if nsrdb_data is None:
+        return None
+
+    _index = site_index(nsrdb_data, index, year, mirror)
+    idx = _index.nearest(lat_lons)
+
+    return [tuple(_index.coords[i]) for i in idx], _read(
+        nsrdb_data, attrs, idx, resolution
+    )
+
+
+def _read(
+    nsrdb_data, attrs: list[str], idx: numpy.ndarray, resolution: str
+) -> DataFrame:
+    """Reads attributes for sites, averaged over the resolution"""
+    step = TIMESTEPS[resolution]
+    time_index = to_datetime(nsrdb_data["time_index"][...].astype(str))
+
+    output = {}
+    for attr in attrs:
+        dataset = nsrdb_data[attr]
+        values = _columns(dataset, idx)
+        # averages over resolution, all sites at once
+        values = values.reshape(-1, step, len(idx)).mean(axis=1)
+        values = values / dataset.attrs["psm_scale_factor"]
+        for site in range(len(idx)):
+            output[(site, attr)] = values[:, site]
+
+    output = DataFrame(output, index=time_index[::step])
+    output.columns = MultiIndex.from_tuples(output.columns)
+    return output
+
 
 def fetch_nsrdb_data(
     attrs: list[str],
@@ -25,6 +382,8 @@ def fetch_nsrdb_data(
     resolution: str = "",
     get: str = "max-population",
     save: str | None = None,
+    mirror: str | None = None,
+    index: str | None = None,
 ) -> DataFrame | tuple:
     """
     Fetches nsrdb data from nearest coordinates (latitude, longitude)
@@ -46,19 +405,35 @@ def fetch_nsrdb_data(
     :type get: str
     :param save: path to save the data. Defaults to None.
     :type save: str | None
+    :param mirror: directory with a local copy (HDF5 or Zarr). Defaults to None (remote).
+    :type mirror: str | None
+    :param index: directory to persist the site index in, one file per year and mirror. Defaults to None.
+    :type index: str | None
 
     :return: DataFrame with output data, (latitude, longitude)
     :rtype: DataFrame | tuple
     """
 
-    if import_all:
-        logger.warning(
-            "⚠ This is an optional feature. Please install h5pyd, or pip install energiapy[all] ⚠",
-        )
+    # fetches nsrdb data for the year
+    nsrdb_data = open_nsrdb(year, mirror)
+    if nsrdb_data is None:
         return None
 
-    # fetches nsrdb data for the year
-    nsrdb_data = h5pyd.File(f"/nrel/nsrdb/v3/nsrdb_{year!s}.h5", "r")
+    if mirror is not None or index is not None:
+        # the site index is read from disk if persisted
+        _index = site_index(nsrdb_data, index, year, mirror)
+        if lat_lon is not None:
+            idx = int(_index.nearest([lat_lon])[0])
+        else:
+            idx, lat_lon = _index.county(state, county, get)
+
+        output = _read(nsrdb_data, attrs, array([idx]), resolution)[0]
+
+        if save is not None:
+            output.to_csv(save + ".csv")
+
+        return lat_lon, output
+
     time_index = to_datetime(nsrdb_data["time_index"][...].astype(str))
 
     if lat_lon is not None:
@@ -123,11 +498,6 @@ def fetch_nsrdb_data(
         idx = loc_data.index[0]
         lat_lon = (latitude, longitude)
 
-    timestep_dict = {
-        "halfhourly": 1,  # native data set at 30 mins
-        "hourly": 2,  # averages over the hour
-        "daily": 48,  # averages over the day
-    }
     averaged_output = DataFrame()
 
     psm_scale_dict = {
@@ -137,11 +507,11 @@ def fetch_nsrdb_data(
     for attr in attrs:
         full_output = nsrdb_data[attr][:, idx]  # native data set at 30 mins
         averaged_output[attr] = average(
-            full_output.reshape(-1, timestep_dict[resolution]),
+            full_output.reshape(-1, TIMESTEPS[resolution]),
             axis=1,
         )  # averages over resolution
     averaged_output = averaged_output.set_index(
-        time_index[:: timestep_dict[resolution]],
+        time_index[:: TIMESTEPS[resolution]],
     )
 
     for attr in attrs:
@@ -0,0 +1,212 @@
+"""Vectorized cleaning of time-series data"""
+
+from __future__ import annotations
+
+import numpy
+import pandas as pd
+
+
+def read_csv_chunked(
+    file_name: str,
+    years: list[int] | None = None,
+    chunksize: int = 100_000,
+    date_column: str | int = 0,
+    date_format: str | None = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Reads a (multi-year) CSV in chunks, keeping only the years of interest
+
+    :param file_name: path to the CSV file
+    :type file_name: str
+    :param years: years to keep. Defaults to None (all).
+    :type years: list[int], optional
+    :param chunksize: number of rows read at a time. Defaults to 100_000.
+    :type chunksize: int, optional
+    :param date_column: column with the dates, becomes the index. Defaults to 0.
+    :type date_column: str | int, optional
+    :param date_format: format of the dates, inferred if None. Defaults to None.
+    :type date_format: str, optional
+    :param kwargs: passed on to pandas.read_csv
+
+    :returns: data indexed by date, sorted
+    :rtype: pandas.DataFrame
+    """
+    chunks = []
+    for chunk in pd.read_csv(file_name, chunksize=chunksize, **kwargs):
+        column = (
+            chunk.columns[date_column] if isinstance(date_column, int) else date_column
+        )
+        dates = pd.to_datetime(chunk.pop(column), format=date_format, errors="coerce")
+        chunk.index = pd.DatetimeIndex(dates)
+        dated = chunk[chunk.index.notna()]
+        if years is not None:
+            dated = dated[dated.index.year.isin(years)]
+        chunks.append(dated)
+
+    data = pd.concat(chunks) if chunks else pd.DataFrame()
+    return data.sort_index()
+
+
+def fill(
+    data: pd.DataFrame,
+    freq: str = "D",
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """
+    Reindexes to a complete range of dates. Gaps (weekends, holidays)
+    take the last available value, leading gaps take the first.
+
+    :param data: data indexed by date
+    :type data: pandas.DataFrame
+    :param freq: frequency of the complete range. Defaults to 'D'.
+    :type freq: str, optional
+    :param start: start of the range. Defaults to None (first date).
+    :type start: str | pandas.Timestamp, optional
+    :param end: end of the range. Defaults to None (last date).
+    :type end: str | pandas.Timestamp, optional
+
+    :returns: data over the complete range
+    :rtype: pandas.DataFrame
+    """
+    index = pd.date_range(
+        start if start is not None else data.index.min(),
+        end if end is not None else data.index.max(),
+        freq=freq,
+    )
+    # duplicated dates keep the last value
+    data = data[~data.index.duplicated(keep="last")]
+    return data.reindex(index).ffill().bfill()
+
+
+def replace_outliers(
+    data: pd.DataFrame,
+    sd_cutoff: float = 2,
+    mean_range: int = 1,
+    window: int | None = None,
+) -> pd.DataFrame:
+    """
+    Replaces points beyond a number of standard deviations from the mean
+    with the mean of the points on both sides
+
+    :param data: input data, every column is treated separately
+    :type data: pandas.DataFrame
+    :param sd_cutoff: points beyond this many standard deviations are outliers. Defaults to 2.
+    :type sd_cutoff: float, optional
+    :param mean_range: number of neighboring points on each side averaged over. Defaults to 1.
+    :type mean_range: int, optional
+    :param window: size of a centered rolling window for the mean and standard deviation. Defaults to None (whole series).
+    :type window: int, optional
+
+    :returns: data with outliers replaced
+    :rtype: pandas.DataFrame
+    """
+    if window is None:
+        mean, std = data.mean(), data.std()
+    else:
+        rolling = data.rolling(window, center=True, min_periods=1)
+        mean, std = rolling.mean(), rolling.std()
+
+    outlier = ((data - mean).abs() > sd_cutoff * std).to_numpy()
+
+    # mean of the neighbors, the point itself excluded
+    values = data.to_numpy(dtype=float)
+    padded = numpy.pad(values, ((mean_range, mean_range), (0, 0)), mode="edge")
+    n = len(values)
+    neighbors = sum(
+        padded[mean_range - j : mean_range - j + n]
+        + padded[mean_range + j : mean_range + j + n]
+        for j in range(1, mean_range + 1)
+    ) / (2 * mean_range)
+
+    return pd.DataFrame(
+        numpy.where(outlier, neighbors, values),
+        index=data.index,
+        columns=data.columns,
+    )
+
+
+def convert(
+    data: pd.DataFrame, factors: float | dict[str, float]
+) -> pd.DataFrame:
+    """
+    Converts units by scaling columns
+
+    :param data: input data
+    :type data: pandas.DataFrame
+    :param factors: factor for all columns, or by column
+    :type factors: float | dict[str, float]
+
+    :returns: converted data
+    :rtype: pandas.DataFrame
+    """
+    if isinstance(factors, dict):
+        factors = pd.Series(factors).reindex(data.columns, fill_value=1)
+    return data * factors
+
+
+def stretch(data: pd.DataFrame, by: int = 24, freq: str | None = "h") -> pd.DataFrame:
+    """
+    Repeats every row, e.g. days to hours
+
+    :param data: input data
+    :type data: pandas.DataFrame
+    :param by: number of repetitions. Defaults to 24.
+    :type by: int, optional
+    :param freq: frequency of the new dates, positions are used if None. Defaults to 'h'.
+    :type freq: str, optional
+
+    :returns: stretched data
+    :rtype: pandas.DataFrame
+    """
+    values = numpy.repeat(data.to_numpy(), by, axis=0)
+    if freq is not None and isinstance(data.index, pd.DatetimeIndex):
+        index = pd.date_range(data.index[0], periods=len(values), freq=freq)
+    else:
+        index = pd.RangeIndex(len(values))
+    return pd.DataFrame(values, index=index, columns=data.columns)
+
+
+def clean(
+    data: pd.DataFrame,
+    freq: str | None = "D",
+    sd_cutoff: float | None = None,
+    mean_range: int = 1,
+    window: int | None = None,
+    factors: float | dict[str, float] | None = None,
+    stretch_by: int | None = None,
+) -> pd.DataFrame:
+    """
+    Fills gaps, replaces outliers, converts units and stretches, in that order.
+    Each step is skipped if not asked for.
+
+    :param data: data indexed by date, every column is treated separately
+    :type data: pandas.DataFrame
+    :param freq: frequency to fill gaps at. Defaults to 'D'.
+    :type freq: str, optional
+    :param sd_cutoff: standard deviations beyond which points are outliers. Defaults to None.
+    :type sd_cutoff: float, optional
+    :param mean_range: neighbors on each side to replace outliers with. Defaults to 1.
+    :type mean_range: int, optional
+    :param window: rolling window to find outliers in. Defaults to None (whole series).
+    :type window: int, optional
+    :param factors: unit conversion factors. Defaults to None.
+    :type factors: float | dict[str, float], optional
+    :param stretch_by: repeat every row, e.g. 24 for days to hours. Defaults to None.
+    :type stretch_by: int, optional
+
+    :returns: cleaned data
+    :rtype: pandas.DataFrame
+    """
+    if freq is not None:
+        data = fill(data, freq=freq)
+    if sd_cutoff is not None:
+        data = replace_outliers(
+            data, sd_cutoff=sd_cutoff, mean_range=mean_range, window=window
+        )
+    if factors is not None:
+        data = convert(data, factors)
+    if stretch_by is not None:
+        data = stretch(data, by=stretch_by)
+    return data
@@ -3,7 +3,8 @@
 from typing import Literal
 
 from pandas import DataFrame
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from .math import scale
 
 
 def scaling(data: DataFrame, how: Literal['max', 'minmax', 'standard']) -> DataFrame:
@@ -22,14 +23,4 @@ def scaling(data: DataFrame, how: Literal['max', 'minmax', 'standard']) -> DataF
     if not isinstance(data, DataFrame):
         raise ValueError("please provide DataFrame")
 
-    if how == "max":
-        data = data / data.max()
-
-    else:
-        if how == "standard":
-            scaler = StandardScaler()
-        if how == "minmax":
-            scaler = MinMaxScaler()
-        data = DataFrame(scaler.fit_transform(data))
-
-    return data
+    return DataFrame(scale(data, how=how), index=data.index, columns=data.columns)
@@ -0,0 +1,123 @@
+"""Arrays shared between processes through memory-mapped files"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from typing import Any
+
+import numpy
+
+# arrays start at cache line boundaries
+_ALIGN = 64
+
+# files mapped in this process, mapped only once
+_MAPPED: dict[str, numpy.memmap] = {}
+
+
+class SharedArrays:
+    """
+    Arrays written once to a memory-mapped file,
+    which worker processes attach to as read-only views, nothing is copied or pickled.
+    Only the (small) handle needs to be sent to the workers.
+
+    :param arrays: arrays by key
+    :type arrays: dict[str, numpy.ndarray]
+    :param path: file to write to. Defaults to None (a new file in directory).
+    :type path: str, optional
+    :param directory: where a new file is made, e.g. '/dev/shm' to keep it in memory on Linux. Defaults to None (the temporary directory).
+    :type directory: str, optional
+
+    :ivar handle: path of the file and (offset, shape, dtype) of every array, picklable
+    :vartype handle: dict[str, Any]
+    :ivar nbytes: size of the file
+    :vartype nbytes: int
+    """
+
+    def __init__(
+        self,
+        arrays: dict[str, Any],
+        path: str | None = None,
+        directory: str | None = None,
+    ):
+        arrays = {key: numpy.ascontiguousarray(a) for key, a in arrays.items()}
+
+        layout: dict[str, tuple[int, tuple[int, ...], str]] = {}
+        offset = 0
+        for key, array in arrays.items():
+            offset = -(-offset // _ALIGN) * _ALIGN
+            layout[key] = (offset, array.shape, array.dtype.str)
+            offset += array.nbytes
+
+        # the file is removed on close only if made here
+        self._owned = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(
+                suffix=".energia", dir=directory or tempfile.gettempdir()
+            )
+            os.close(fd)
+
+        self.nbytes = offset
+        # empty files cannot be mapped
+        buffer = numpy.memmap(path, dtype=numpy.uint8, mode="w+", shape=max(offset, 1))
+        for key, array in arrays.items():
+            start = layout[key][0]
+            buffer[start : start + array.nbytes] = array.reshape(-1).view(numpy.uint8)
+        buffer.flush()
+        del buffer
+
+        self.handle: dict[str, Any] = {"path": path, "layout": layout}
+
+    @property
+    def path(self) -> str:
+        """Path of the file"""
+        return self.handle["path"]
+
+    def close(self):
+        """Removes the file, views already attached stay valid"""
+        _MAPPED.pop(self.path, None)
+        if self._owned and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getitem__(self, key: str) -> numpy.ndarray:
+        return attach(self.handle)[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.handle["layout"]
+
+    def __len__(self) -> int:
+        return len(self.handle["layout"])
+
+    def __enter__(self) -> SharedArrays:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def attach(handle: dict[str, Any]) -> dict[str, numpy.ndarray]:
+    """
+    Attaches to shared arrays, the file is mapped once per process
+
+    :param handle: handle of SharedArrays
+    :type handle: dict[str, Any]
+
+    :returns: read-only views of the arrays, by key
+    :rtype: dict[str, numpy.ndarray]
+    """
+    path = handle["path"]
+    if path not in _MAPPED:
+        _MAPPED[path] = numpy.memmap(path, dtype=numpy.uint8, mode="r")
+    buffer = _MAPPED[path]
+
+    arrays = {}
+    for key, (offset, shape, dtype) in handle["layout"].items():
+        if not numpy.prod(shape):
+            # empty arrays take no space in the file
+            arrays[key] = numpy.empty(shape, dtype=dtype)
+            arrays[key].flags.writeable = False
+            continue
+        arrays[key] = numpy.ndarray(
+            shape, dtype=numpy.dtype(dtype), buffer=buffer, offset=offset
+        )
+    return arrays
@@ -83,3 +83,10 @@ def test_attrs(m):
         'attr_name': '',
         'use_max_time': False,
     }
+
+
+def test_func_opt():
+    m = scheduling()
+    # maximizing the negative is minimizing, gana reports the minimum
+    (0 - m.usd.spend).opt(maximize=True, using="highs")
+    assert m.program.obj() == pytest.approx(1081000.0, rel=1e-9)
@@ -0,0 +1,114 @@
+import numpy
+import pytest
+
+from energia import Currency, Model, Process, Resource
+from energia.utils.aggregation import aggregate
+from energia.utils.math import (generate_connectivity_matrix,
+                                sparse_connectivity_matrix)
+
+
+@pytest.fixture
+def profiles():
+    # 3 kinds of day repeated over 12 days
+    days = numpy.array(
+        [
+            [0.2, 0.5, 0.9, 0.4],
+            [0.6, 0.6, 0.7, 0.6],
+            [0.1, 0.2, 0.3, 0.1],
+        ]
+    )
+    pattern = [0, 0, 1, 2, 0, 1, 1, 2, 2, 0, 1, 0]
+    demand = days[pattern].ravel()
+    return {"demand": demand, "cf": 1 - demand}
+
+
+@pytest.mark.parametrize("method", ["kmedoids", "hierarchical", "chronological"])
+def test_aggregate(profiles, method):
+    k = 10 if method == "chronological" else 3
+    agg = aggregate(profiles, length=4, k=k, method=method)
+    assert sum(agg.weights) == 12
+    assert len(agg.reduced["demand"]) == agg.k * 4
+    if method != "chronological":
+        assert sorted(agg.weights) == [3, 4, 5]
+        assert agg.expand(agg.reduced["demand"]) == pytest.approx(
+            profiles["demand"].tolist()
+        )
+    assert sum(agg.weigh([1] * agg.k * 4)) == 12 * 4
+
+
+def test_chronological_contiguous(profiles):
+    agg = aggregate(profiles, length=4, k=4, method="chronological")
+    # labels never return to an earlier cluster
+    assert all(numpy.diff(agg.labels) >= 0)
+
+
+def test_model_aggregate(profiles):
+    # seed and connectivity are passed on
+    connectivity = sparse_connectivity_matrix(12, cyclic=True)
+    agg = Model("chronological").aggregate(
+        profiles, length=4, k=4, method="chronological", connectivity=connectivity
+    )
+    direct = aggregate(
+        profiles, length=4, k=4, method="chronological", connectivity=connectivity
+    )
+    assert agg.labels.tolist() == direct.labels.tolist()
+
+    agg = Model("seeded").aggregate(profiles, length=4, k=3, seed=7)
+    assert agg.labels.tolist() == aggregate(profiles, 4, 3, seed=7).labels.tolist()
+
+
+@pytest.fixture
+def m(profiles):
+    _m = Model("aggregated")
+    agg = _m.aggregate(profiles, length=4, k=3)
+    _m.usd = Currency()
+    _m.wind, _m.power = Resource(), Resource()
+    _ = _m.wind.consume <= 400
+    _ = _m.power.release.prep(100, norm=False) >= agg.reduced["demand"]
+    _m.wf = Process()
+    _ = _m.wf(_m.power) == -1 * _m.wind
+    _ = _m.usd.spend(_m.wf.operate) == agg.weigh([10] * 12)
+    _m.network.locate(_m.wf)
+    _m.usd.spend.opt()
+    return _m
+
+
+def test_aggregated_model(m, profiles):
+    agg = m.aggregations[0]
+    assert m.horizon == m.y
+    assert m.y.howmany(m.d) == 3
+    assert m.y.howmany(m.h) == 12
+    # the weighted operating cost matches that of the full series
+    assert m.release.output(aslist=True) == pytest.approx(
+        [100 * i for i in agg.reduced["demand"]]
+    )
+    assert sum(m.spend.output(aslist=True)) == pytest.approx(
+        1000 * sum(profiles["demand"])
+    )
+
+
+def test_sparse_connectivity():
+    dense = generate_connectivity_matrix(5)
+    assert dense.tolist() == [
+        [0, 1, 0, 0, 0],
+        [1, 0, 1, 0, 0],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 0, 1],
+        [0, 0, 0, 1, 0],
+    ]
+    assert generate_connectivity_matrix(5, cyclic=True)[0, 4] == 1
+
+    hourly = sparse_connectivity_matrix(8760 * 5)
+    assert hourly.nnz == 2 * (8760 * 5 - 1)
+
+    multi = sparse_connectivity_matrix(48, cyclic=True, offsets=[1, 24])
+    assert multi[0, 24] == 1 and multi[0, 47] == 1 and multi[0, 1] == 1
+    # cyclic with offset 24 on 48 periods connects both ways to the same period
+    assert multi.nnz == 48 * 3
+
+
+def test_chronological_long():
+    series = numpy.sin(numpy.linspace(0, 20 * numpy.pi, 8760))
+    agg = aggregate({"s": series}, length=1, k=40, method="chronological")
+    assert agg.k == 40
+    assert all(numpy.diff(agg.labels) >= 0)
@@ -0,0 +1,47 @@
+"""Tests for arrays and Series as parameters"""
+
+import numpy
+import pandas as pd
+import pytest
+
+from energia import Currency, Model, Periods, Process, Resource
+
+
+def scheduling(vector) -> Model:
+    m = Model(f"scheduling_{vector.__name__}")
+    m.q = Periods()
+    m.y = 4 * m.q
+    m.usd = Currency()
+    m.wind, m.power = Resource(), Resource()
+    _ = m.wind.consume <= vector([100, 100, 150, 100])
+    _ = m.power.release.prep(100) >= vector([0.6, 0.7, 1, 0.3])
+    m.wf = Process()
+    _ = m.wf(m.power) == vector([-1, -1.1, -1.2, -1]) * m.wind
+    _ = m.wf.operate.prep(200, norm=False) <= vector([0.9, 0.8, 0.5, 0.7])
+    _ = m.usd.spend(m.wf.operate) == vector([4000, 4200, 4300, 3900])
+    m.network.locate(m.wf)
+    m.usd.spend.opt()
+    return m
+
+
+@pytest.mark.parametrize("vector", [numpy.array, pd.Series])
+def test_vector(vector):
+    m = scheduling(vector)
+    assert m.spend.output(aslist=True) == pytest.approx(
+        scheduling(list).spend.output(aslist=True)
+    )
+    assert m.consume.output(aslist=True) == pytest.approx([60, 77, 120, 30])
+
+
+def test_conversion():
+    m = Model()
+    m.a, m.b = Resource(), Resource()
+    profile = numpy.array([1.0, 2.0, 3.0])
+    conv = profile * m.a - m.b
+    # read-only views, not copies
+    assert numpy.shares_memory(conv[m.a], profile)
+    assert not conv[m.a].flags.writeable
+
+    conv.balancer()
+    assert conv[m.b].tolist() == [-1.0] * 3
+    assert conv[m.b].strides == (0,)
@@ -0,0 +1,43 @@
+import numpy
+import pytest
+from scipy.sparse import csr_array
+
+from energia.decomposition.benders import Benders, _solve_block
+from energia.library.examples.energy import design_scheduling
+
+
+@pytest.fixture
+def m():
+    _m = design_scheduling()
+    _m.usd.spend.obj()
+    return _m
+
+
+def test_benders(m):
+    benders = Benders(m, workers=1)
+    # capacities and their binaries make up the master
+    assert len(benders.design) == 8
+    assert benders.solve() == pytest.approx(300649735.8950616)
+    lower, upper = benders.bounds[-1]
+    assert upper - lower <= 1e-6 * upper
+    assert m.program.optimized
+    assert m.program.obj() == pytest.approx(300649735.8950616)
+    assert m.wf.capacity.output(aslist=True) == pytest.approx([100.0])
+
+
+def test_block_bounds():
+    # min -x - y, x + y <= 3, x <= 2 (bound), y <= 2 (bound)
+    block = {
+        "A": csr_array(numpy.array([[1.0, 1.0]])),
+        "eq": numpy.array([False]),
+        "c": numpy.array([-1.0, -2.0]),
+        "lb": numpy.array([0.0, 0.0]),
+        "ub": numpy.array([2.0, 2.0]),
+    }
+    rhs = numpy.array([3.0])
+    ok, value, u, bound, x = _solve_block(block, rhs)
+    assert ok
+    assert x == pytest.approx([1.0, 2.0])
+    # the active bound on y is in the dual objective (and the cut)
+    assert bound != 0
+    assert value == pytest.approx(u @ rhs + bound)
@@ -0,0 +1,24 @@
+"""Tests for the constraint sets components are informed of"""
+
+from array import array
+
+from energia.library.examples.energy import design_scheduling
+
+
+def test_cons_ids():
+    m = design_scheduling()
+    program = m.program
+
+    assert isinstance(m.wf.cons_ids, array)
+    assert m.wf.cons_n
+    # names are rendered from the ids
+    assert m.wf.constraints == [
+        program.names_constraint_sets[n] for n in m.wf.cons_n
+    ]
+    assert all(
+        getattr(program, name) is cons
+        for name, cons in zip(m.wf.constraints, m.wf.cons)
+    )
+    # balances are updated in place, informed once
+    assert len(m.power.cons_n) == len(set(m.power.cons_n))
+    assert any(name.startswith("operate_") for name in m.operate.constraints)
@@ -0,0 +1,94 @@
+"""Tests for the size estimate, before operations are located"""
+
+import tracemalloc
+
+import pytest
+
+from energia import Location, Model, Periods, Process, Resource, Storage
+from energia.components.commodities.currency import Currency
+
+
+def build(n: int = 24) -> Model:
+    m = Model("estimate")
+    m.q = Periods()
+    m.y = n * m.q
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind", "solar"])
+    _ = m.solar.consume(m.q) <= 100
+    _ = m.wind.consume <= 400
+    _ = m.power.release.prep(180) >= [0.6] * n
+
+    m.wf = Process(m.power == -1 * m.wind)
+    _ = m.wf.capacity.x <= 100
+    _ = m.wf.operate.prep(norm=True) <= [0.9] * n
+    _ = m.usd.spend(m.wf.capacity) == 990637
+
+    m.pv = Process(m.power == -1 * m.solar)
+    _ = m.pv.capacity.x <= 100
+    _ = m.pv.operate.prep(norm=True) <= [0.6] * n
+
+    m.lii = Storage(m.power == 0.9)
+    _ = m.lii.capacity.x <= 100
+    _ = m.usd.spend(m.lii.inventory) == 2000
+    return m
+
+
+@pytest.mark.parametrize("n", [4, 24, 96])
+def test_estimate(n):
+    m = build(n)
+    estimate = m.estimate()
+    assert set(estimate.pending) == {"wf", "pv", "lii", "lii.charge", "lii.discharge"}
+
+    m.network.locate(m.wf, m.pv, m.lii)
+    built = m.profile_size().total
+    for measure in ("variables", "constraints", "nonzeros"):
+        assert built[measure] <= 1.25 * estimate.total[measure]
+        assert estimate.total[measure] <= 1.25 * built[measure]
+
+    # everything is located, nothing is pending
+    assert not m.estimate().pending
+
+
+def test_budget():
+    m = build()
+    with pytest.raises(MemoryError):
+        m.estimate(memory_budget=1000)
+
+    with pytest.raises(ValueError):
+        m.estimate(on_budget="swap")
+
+
+def test_memory():
+    # how the bytes per gana object (_OBJECTS) were measured
+    tracemalloc.start()
+    try:
+        m = build(96)
+        estimate = m.estimate()
+        m.network.locate(m.wf, m.pv, m.lii)
+        traced, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert 0.75 * traced <= estimate.memory <= 1.25 * traced
+
+
+def test_locations():
+    m = Model("estimate_sites")
+    m.q = Periods()
+    m.y = 24 * m.q
+    m.usd = Currency()
+    m.declare(Location, ["a", "b"])
+    m.declare(Resource, ["power", "wind"])
+    m.wf = Process(m.power == -1 * m.wind)
+    for loc in (m.a, m.b):
+        _ = m.wind.consume(loc) <= 1000
+        _ = m.power.release(loc, m.q).prep(100) >= [0.6] * 24
+        _ = m.wf.capacity(loc) <= 400
+        _ = m.wf.operate(loc, m.q).prep(norm=True) <= [0.9] * 24
+
+    # located at both sites, not the network
+    estimate = m.estimate()
+    m.wf.locate(m.a, m.b)
+    built = m.profile_size().total
+    for measure in ("variables", "constraints", "nonzeros"):
+        assert built[measure] <= 1.25 * estimate.total[measure]
+        assert estimate.total[measure] <= 1.25 * built[measure]
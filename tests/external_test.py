@@ -0,0 +1,91 @@
+import numpy
+import pytest
+from pandas import DataFrame, date_range
+
+from energia.library import external
+from energia.library.external import (
+    pvlib,
+    pvlib_fleet,
+    sam_database,
+    turbine_curves,
+    windpowerlib,
+    windpowerlib_fleet,
+)
+
+
+def weather(scale):
+    ghi = numpy.sin(numpy.linspace(-numpy.pi / 2, 3 * numpy.pi / 2, 24)).clip(0)
+    ghi = ghi * 800 * scale
+    return DataFrame(
+        {
+            "ghi": ghi,
+            "dni": ghi * 0.8,
+            "dhi": ghi * 0.2,
+            "temp_air": 25.0,
+            "wind_speed": 2.0,
+        },
+        index=date_range("2019-06-01", periods=24, freq="h", tz="UTC"),
+    )
+
+
+@pytest.mark.skipif(not external.has_pvlib, reason="pvlib is not installed")
+def test_pvlib_fleet():
+    data = [weather(1), weather(0.5)]
+    coords = [(30, -96), (40, -100)]
+    configs = [{}, {"aoi_model": "physical"}]
+    fleet = pvlib_fleet(data, coords, configs=configs, workers=2)
+    assert fleet.shape == (4, 24)
+    assert fleet[0] == pytest.approx(pvlib(data[0], coords[0]))
+    assert fleet[3] == pytest.approx(pvlib(data[1], coords[1], aoi_model="physical"))
+    # the databases are parsed once
+    assert sam_database.cache_info().currsize == 2
+
+    with pytest.raises(ValueError):
+        pvlib_fleet([weather(1), weather(1)[:12]], coords)
+
+
+@pytest.mark.skipif(
+    not external.has_windpowerlib, reason="windpowerlib is not installed"
+)
+@pytest.mark.parametrize("model", ["power_coefficient_curve", "power_curve"])
+def test_windpowerlib_fleet(model):
+    rng = numpy.random.default_rng(0)
+    data = [
+        DataFrame(
+            {
+                "wind_speed": rng.uniform(0, 20, 48),
+                "air_temperature": rng.uniform(-5, 35, 48),
+                "surface_pressure": rng.uniform(950, 1030, 48),
+            }
+        )
+        for _ in range(2)
+    ]
+    before = [d.copy() for d in data]
+    turbines, heights = ["V100/1800", "E-126/4200"], [92, 135]
+
+    fleet = windpowerlib_fleet(data, turbines, heights, power_output_model=model)
+    assert fleet.shape == (2, 2, 48)
+    for n, d in enumerate(data):
+        for m, (turbine, height) in enumerate(zip(turbines, heights)):
+            assert fleet[n, m] == pytest.approx(
+                windpowerlib(
+                    d.copy(),
+                    turbine_type=turbine,
+                    hub_height=height,
+                    power_output_model=model,
+                )
+            )
+    # the weather data is left as is
+    assert all(d.equals(b) for d, b in zip(data, before))
+    assert turbine_curves.cache_info().currsize == 2
+
+
+def test_missing(monkeypatch):
+    # a library missing only turns off its own models
+    monkeypatch.setattr(external, "has_pvlib", False)
+    assert pvlib_fleet([weather(1)], [(30, -96)]) is None
+    if external.has_windpowerlib:
+        data = DataFrame(
+            {"wind_speed": [5.0], "air_temperature": [20.0], "surface_pressure": [1000]}
+        )
+        assert windpowerlib_fleet([data], ["V100/1800"], [92]) is not None
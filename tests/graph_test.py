@@ -0,0 +1,141 @@
+"""Tests for the resource-task network graph and pruning"""
+
+import pytest
+
+from energia import (
+    Linkage,
+    Location,
+    Model,
+    Periods,
+    Process,
+    Resource,
+    Storage,
+    Transport,
+)
+from energia.components.commodities.currency import Currency
+
+
+def catalog(prune: bool) -> Model:
+    m = Model("catalog", prune=prune)
+    m.q = Periods()
+    m.y = 4 * m.q
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind", "h2", "ammonia"])
+    _ = m.wind.consume <= 400
+    _ = m.h2.consume(m.q) <= 50
+    _ = m.power.release.prep(180) >= [0.6, 0.7, 0.8, 0.3]
+
+    m.wf = Process(m.power == -1 * m.wind)
+    _ = m.wf.capacity.x <= 100
+    _ = m.wf.operate.prep(norm=True) <= [0.9, 0.8, 0.5, 0.7]
+    _ = m.usd.spend(m.wf.capacity) == 990637
+    _ = m.usd.spend(m.wf.operate) == 49
+
+    # nothing asks for hydrogen or ammonia
+    m.ely = Process(m.h2 == -1.5 * m.power)
+    m.hb = Process(m.ammonia == -0.2 * m.h2)
+    _ = m.usd.spend(m.ely.capacity) == 500000
+
+    m.lii = Storage(m.power == 0.9)
+    _ = m.lii.capacity.x <= 100
+    _ = m.usd.spend(m.lii.capacity) == 1302182
+    m.network.locate(m.wf, m.ely, m.hb, m.lii)
+    return m
+
+
+def test_graph():
+    m = catalog(prune=False)
+    names = {node.name for node in m.graph.nodes}
+    assert {"power", "wind", "h2", "wf", "ely", "lii", "l0"} <= names
+    edges = {edge.name for edge in m.graph.edges}
+    assert {"wind->wf", "wf->power", "power->ely", "ely->h2"} <= edges
+    # the power demand
+    assert m.power in m.graph.targets
+    assert m.ely not in m.graph.reachable()
+    assert m.graph.unreachable() == [m.h2, m.ammonia]
+    assert not m.graph.pruned and not m.graph.dropped
+    assert m.ely.locations
+
+
+def test_prune():
+    m = catalog(prune=True)
+    assert m.graph.pruned == {m.ely: [m.network], m.hb: [m.network]}
+    # hydrogen can be bought, but nothing asks for it
+    assert m.graph.dropped == {m.h2: [m.network]}
+    assert "h2_l0_q_grb" not in m.program.names_constraint_sets
+    assert not m.ely.locations and not m.hb.locations
+    assert m.wf.locations and m.lii.charge.locations
+
+    m.usd.spend.opt(using="highs")
+    full = catalog(prune=False)
+    full.usd.spend.opt(using="highs")
+    assert m.program.objectives[-1].X == pytest.approx(full.program.objectives[-1].X)
+    assert len(m.program.constraints) < len(full.program.constraints)
+    assert "h2_l0_q_grb" in full.program.names_constraint_sets
+
+
+def test_prune_later():
+    m = catalog(prune=True)
+    # hydrogen is asked for once the catalog is located
+    _ = m.h2.release(m.q) >= 10
+    assert not m.graph.dropped
+    assert "h2_l0_q_grb" in m.program.names_constraint_sets
+    m.network.locate(m.ely)
+    assert m.ely.locations
+
+    full = catalog(prune=False)
+    _ = full.h2.release(full.q) >= 10
+    for model in (m, full):
+        model.usd.spend.opt(using="highs")
+    assert m.program.objectives[-1].X == pytest.approx(full.program.objectives[-1].X)
+    assert m.h2.consume.output(aslist=True) == pytest.approx(
+        full.h2.consume.output(aslist=True)
+    )
+
+
+def test_linkages():
+    m = Model()
+    m.htown = Location()
+    m.sd = Location()
+    m.grid = Linkage(source=m.htown, sink=m.sd, dist=1400, bi=True)
+    edges = [edge for edge in m.graph.edges if edge.component is not None]
+    assert [(e.source.component, e.sink.component) for e in edges] == [
+        (m.htown, m.sd),
+        (m.sd, m.htown),
+    ]
+
+
+def sites(link: bool) -> Model:
+    m = Model("sites", prune=True)
+    m.q = Periods()
+    m.usd = Currency()
+    m.declare(Location, ["a", "b"])
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume(m.a) <= 400
+    _ = m.wind.consume(m.b) <= 400
+    # only a asks for power
+    _ = m.power.release(m.a) >= 50
+
+    m.wf = Process(m.power == -1 * m.wind)
+    _ = m.wf.operate(m.a) <= 100
+    _ = m.wf.operate(m.b) <= 100
+    if link:
+        m.Link(m.b, m.a, dist=1)
+        m.grid = Transport()
+        _ = m.grid(m.power) == 1.0
+    m.a.locate(m.wf)
+    m.b.locate(m.wf)
+    return m
+
+
+def test_prune_sites():
+    m = sites(link=False)
+    assert m.graph.pruned == {m.wf: [m.b]}
+    assert m.graph.dropped == {m.wind: [m.b]}
+    assert m.graph.unreachable(m.b) == [m.power, m.wind]
+    assert not m.graph.unreachable(m.a)
+
+    # power made at b can be sent to a
+    m = sites(link=True)
+    assert not m.graph.pruned and not m.graph.dropped
+    assert m.wf in m.graph.reachable(m.b)
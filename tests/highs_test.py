@@ -0,0 +1,46 @@
+"""Tests for the HiGHS solver backend"""
+
+import pytest
+
+from energia import Model
+from energia.library.examples.energy import design_scheduling, scheduling
+from energia.represent.ations.solvers import SOLVERS, HiGHS
+
+
+def test_lp():
+    m = scheduling()
+    m.usd.spend.opt(using="highs")
+    assert m.program.objectives[-1].X == pytest.approx(1081000.0)
+    assert m.consume.output(aslist=True) == pytest.approx([260.0])
+    assert len(m.program.solutions) == 1
+
+
+def test_milp():
+    m = design_scheduling()
+    m.usd.spend.opt(using="highs", mip_rel_gap=1e-9)
+    highs = m.program.objectives[-1].X
+    m.usd.spend.opt(using="gurobi")
+    assert highs == pytest.approx(m.program.objectives[-1].X, rel=1e-6)
+    assert len(m.program.solutions) == 2
+
+
+def test_model_solver():
+    assert Model(solver="highs").solver == "highs"
+    assert SOLVERS["highs"] is HiGHS
+
+    m = scheduling()
+    m.solver = "highs"
+    m.usd.spend.opt()
+    # gurobi was never called
+    assert not m.program.formulations
+    assert m.program.objectives[-1].X == pytest.approx(1081000.0)
+
+
+def test_unknown_solver():
+    m = scheduling()
+    with pytest.raises(ValueError):
+        m.usd.spend.opt(using="hihgs")
+    # options are not dropped on the gurobi path
+    with pytest.raises(ValueError):
+        m.usd.spend.opt(using="gurobi", presolve=True)
+    assert not m.program.formulations
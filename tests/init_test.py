@@ -45,7 +45,10 @@ def test_init():
     with pytest.raises(ValueError):
         m.Link(m.l1, m.l2)
 
-    assert m.A == [[-1.0, 0, 0], [0, 1, 0], [-1.0, 1, 0], [0, 0, 1]]
+    assert m.A.toarray().tolist() == [[-1.0, 0, 0], [0, 1, 0], [-1.0, 1, 0], [0, 0, 1]]
+    # cached until the program changes
+    assert m.A is m.A
+    assert m.A.toarray().tolist() == m.program.A
 
     assert m.__repr__() == "mm"
 
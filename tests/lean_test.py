@@ -0,0 +1,81 @@
+"""Tests for lean models, built without inspection bookkeeping"""
+
+import logging
+
+import pytest
+
+from energia import Model, Periods, Process, Resource, Storage
+from energia.components.commodities.currency import Currency
+
+
+def build(**kwargs) -> Model:
+    m = Model("lean", **kwargs)
+    m.q = Periods()
+    m.y = 4 * m.q
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume <= 1000
+    _ = m.power.release.prep(180) >= [0.6, 0.7, 0.8, 0.3]
+
+    m.wf = Process(m.power == -1 * m.wind)
+    _ = m.wf.capacity.x <= 200
+    _ = m.wf.capacity.x >= 10
+    # bound again, is skipped
+    _ = m.wf.capacity.x <= 200
+    _ = m.wf.operate.prep(norm=True) <= [0.9, 0.8, 0.5, 0.7]
+    _ = m.usd.spend(m.wf.capacity) == 990637 + 3354
+    _ = m.usd.spend(m.wf.operate) == 49
+
+    m.lii = Storage(m.power == 0.9)
+    _ = m.lii.capacity.x <= 100
+    _ = m.usd.spend(m.lii.capacity) == 1302182 + 41432
+    m.network.locate(m.wf, m.lii)
+    return m
+
+
+def test_lean():
+    full = build()
+    m = build(lean=True)
+
+    # the same program
+    assert len(m.program.variables) == len(full.program.variables)
+    assert len(m.program.constraints) == len(full.program.constraints)
+    full.usd.spend.opt(using="highs")
+    m.usd.spend.opt(using="highs")
+    assert m.program.objectives[-1].X == pytest.approx(
+        full.program.objectives[-1].X, rel=1e-6
+    )
+
+    # without the bookkeeping
+    assert not m.wf.constraints and not m.l0.constraints
+    assert not m.wf.domains and not m.power.domains
+    assert m.capacity in m.wf.aspects and not m.wf.aspects[m.capacity]
+    assert not m.scenario._ and m.scenario.bound
+    # LaTeX is rendered by gana from the name
+    assert m.program.consume.ltx == r"{\mathbf{consume}}"
+    assert full.program.consume.ltx != m.program.consume.ltx
+    components = m.profile_size().sizes["component"]
+    assert not any(sizes["constraints"] for sizes in components.values())
+
+    assert full.wf.constraints and full.wf.aspects[full.capacity]
+
+
+def test_logs(caplog):
+    logger = logging.getLogger("energia")
+    level = logger.level
+    with caplog.at_level(logging.INFO, logger="energia"):
+        build(lean=True)
+        assert not caplog.records
+        # the level is left as is, other models still log
+        assert logger.level == logging.INFO
+        build()
+        assert any("Bound" in record.message for record in caplog.records)
+    assert logger.level == level
+
+
+def test_budget():
+    level = logging.getLogger("energia").level
+    m = build()
+    m.estimate(memory_budget=1000, on_budget="lean")
+    assert m.lean
+    assert logging.getLogger("energia").level == level
@@ -0,0 +1,76 @@
+"""Tests for the dense ids of components and the ledger"""
+
+import copy
+
+import pytest
+
+from energia import Model, Process, Resource
+from energia.library.examples.energy import design_scheduling
+
+
+@pytest.fixture(scope="module")
+def m():
+    return design_scheduling()
+
+
+def test_uid(m):
+    assert all(x.uid == n for n, x in enumerate(m.indexed))
+    assert m.indexed[m.wf.uid] is m.wf
+    assert m.indexed[m.operate.uid] is m.operate
+    # compared by identity, not by name
+    assert m.wf != "wf" and m.wf in m.processes
+
+
+def test_dispositions(m):
+    for aspect, primaries in m.dispositions.items():
+        for primary, spaces in primaries.items():
+            for space, times in spaces.items():
+                assert set(
+                    m.ledger.get(
+                        "dispositions",
+                        "time",
+                        aspect=aspect,
+                        primary=primary,
+                        space=space,
+                    )
+                ) == set(times)
+
+    rows = m.ledger.rows("dispositions", aspect=[m.operate, m.capacity])
+    assert len(rows) and set(rows[:, 0]) == {m.operate.uid, m.capacity.uid}
+
+
+def test_balances(m):
+    for cons_n in m.ledger.get("balances", "cons", commodity=m.power):
+        assert m.program.names_constraint_sets[cons_n].startswith("power_")
+    assert m.ledger.get("balances", "time", commodity=m.power) == [m.q]
+    assert "time" in {
+        ("time", "space", "modes", "samples")[n]
+        for n in m.ledger.get("maps", "what", aspect=m.operate)
+    }
+
+    with pytest.raises(ValueError):
+        m.ledger.rows("dispositions", commodity=m.power)
+
+
+def test_cached():
+    m = design_scheduling()
+    table = m.ledger._table("dispositions")
+    assert m.ledger._table("dispositions") is table
+    assert not table.flags.writeable
+
+    # read off the trees again once the program changes
+    assert m.wind.uid not in m.ledger.rows("dispositions", space=m.l0, time=m.q)[:, 1]
+    _ = m.wind.consume(m.l0, m.q) <= 300
+    assert m.ledger._table("dispositions") is not table
+    assert m.wind.uid in m.ledger.rows("dispositions", space=m.l0, time=m.q)[:, 1]
+
+
+def test_modes():
+    m = Model()
+    m.a = Resource()
+    m.b = Resource()
+    m.proc = Process()
+    _ = m.proc(m.b) == [[1, 2, 3] * m.a, m.a]
+    modes = m.proc.primary_conversion.modes
+    # compared by identity, not by name
+    assert modes == modes and modes != copy.copy(modes)
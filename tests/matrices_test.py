@@ -0,0 +1,39 @@
+"""Tests for the sparse canonical form"""
+
+import numpy
+import pytest
+
+from energia import Resource
+from energia.library.examples.energy import design_scheduling
+
+
+@pytest.fixture
+def m():
+    return design_scheduling()
+
+
+def test_matrices(m):
+    program = m.program
+    assert m.matrices is program.matrices
+    assert numpy.array_equal(m.A.toarray(), numpy.array(program.A, dtype=float))
+    assert numpy.array_equal(m.G.toarray(), numpy.array(program.G, dtype=float))
+    assert numpy.array_equal(m.H.toarray(), numpy.array(program.H, dtype=float))
+    assert numpy.array_equal(m.NN.toarray(), numpy.array(program.NN, dtype=float))
+    assert m.B.tolist() == program.B
+    assert m.B_with_NN.tolist() == program.B_with_NN
+    assert m.P == program.P
+
+    form = m.matrices.form()
+    assert form["A"].shape == (len(form["b"]), len(program.variables))
+    assert form["eq"].sum() == len(program.eqcons())
+    assert not form["c"].flags.writeable
+
+
+def test_invalidation(m):
+    A = m.A
+    assert m.A is A
+    m.h2 = Resource()
+    _ = m.h2.consume <= 50
+    assert m.A is not A
+    assert m.A.shape[0] > A.shape[0]
+    assert numpy.array_equal(m.A.toarray(), numpy.array(m.program.A, dtype=float))
@@ -0,0 +1,133 @@
+import numpy
+import pytest
+
+from energia.utils.nsrdb import (
+    SiteIndex,
+    _columns,
+    _mapped,
+    fetch_nsrdb_data,
+    fetch_nsrdb_sites,
+    index_file,
+)
+
+# 48 halfhours over a day
+HALFHOURS = 48
+
+
+@pytest.fixture
+def nsrdb():
+    coords = numpy.array([[30.0, -96.0], [30.5, -96.5], [40.0, -100.0], [45.0, -120.0]])
+    meta = numpy.array(
+        [
+            (30.0, -96.0, b"Texas", b"Brazos", 100, 10, 1),
+            (30.5, -96.5, b"Texas", b"Brazos", 500, 5, 2),
+            (40.0, -100.0, b"Nebraska", b"Frontier", 50, 700, 3),
+            (45.0, -120.0, b"Oregon", b"Gilliam", 20, 300, 4),
+        ],
+        dtype=[
+            ("latitude", "f4"),
+            ("longitude", "f4"),
+            ("state", "S10"),
+            ("county", "S10"),
+            ("population", "i4"),
+            ("elevation", "i4"),
+            ("landcover", "i4"),
+        ],
+    )
+    ghi = numpy.arange(HALFHOURS * 4, dtype="i2").reshape(HALFHOURS, 4) * 10
+    time_index = numpy.array(
+        [
+            f"2019-01-01 {h:02d}:{m:02d}:00+00:00".encode()
+            for h in range(24)
+            for m in (0, 30)
+        ]
+    )
+    return {"coordinates": coords, "meta": meta, "ghi": ghi, "time_index": time_index}
+
+
+def test_site_index(nsrdb, tmp_path):
+    index = SiteIndex.from_file(nsrdb)
+    path = index_file(str(tmp_path), 2019)
+    index.save(path)
+    loaded = SiteIndex.load(path)
+    # many sites in one query
+    assert loaded.nearest([(45.1, -119.9), (30.1, -96.1), (40, -100)]).tolist() == [
+        3,
+        0,
+        2,
+    ]
+    assert loaded.county("Texas", "Brazos") == (1, (30.5, -96.5))
+    assert loaded.county("Texas", "Brazos", "max-elevation")[0] == 0
+
+
+def test_mirror(nsrdb, tmp_path):
+    h5py = pytest.importorskip("h5py")
+    with h5py.File(tmp_path / "nsrdb_2019.h5", "w") as f:
+        for name, data in nsrdb.items():
+            f.create_dataset(name, data=data)
+        f["ghi"].attrs["psm_scale_factor"] = 10
+
+    lat_lons, data = fetch_nsrdb_sites(
+        ["ghi"],
+        2019,
+        [(45, -120), (30, -96)],
+        resolution="hourly",
+        mirror=str(tmp_path),
+        index=str(tmp_path / "index"),
+    )
+    assert lat_lons == [(45.0, -120.0), (30.0, -96.0)]
+    assert len(data) == 24
+    assert data[(0, "ghi")].iloc[0] == pytest.approx(5)
+    assert data[(1, "ghi")].iloc[0] == pytest.approx(2)
+
+    # the persisted index answers the county lookup
+    lat_lon, data = fetch_nsrdb_data(
+        ["ghi"],
+        2019,
+        state="Texas",
+        county="Brazos",
+        resolution="daily",
+        mirror=str(tmp_path),
+        index=str(tmp_path / "index"),
+    )
+    assert lat_lon == (30.5, -96.5)
+    assert len(data) == 1
+
+
+def test_index_file(tmp_path):
+    # one index per year and per file read
+    assert len(
+        {
+            index_file(str(tmp_path), 2019),
+            index_file(str(tmp_path), 2020),
+            index_file(str(tmp_path), 2019, mirror="a"),
+            index_file(str(tmp_path), 2019, mirror="b"),
+        }
+    ) == 4
+
+
+class Orthogonal:
+    """Selects along axes independently, as zarr arrays do"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_orthogonal_selection(self, selection):
+        rows, cols = selection
+        return self.data[rows][:, cols]
+
+
+def test_columns(nsrdb, tmp_path):
+    ghi = nsrdb["ghi"]
+    idx = numpy.array([3, 0, 3])
+
+    # contiguous values after a header, as in an HDF5 file
+    path = tmp_path / "ghi.bin"
+    with open(path, "wb") as f:
+        f.write(b"header")
+        ghi.tofile(f)
+    mapped = _mapped(str(path), ghi.dtype, len(b"header"), ghi.shape)
+    assert numpy.array_equal(mapped, ghi)
+
+    assert numpy.array_equal(_columns(Orthogonal(ghi), idx), ghi[:, idx])
+    assert numpy.array_equal(_columns(mapped, idx), ghi[:, idx])
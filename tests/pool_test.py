@@ -0,0 +1,118 @@
+"""Tests for the parameter pool"""
+
+import gc
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+import pytest
+
+from energia import Model, Periods, Resource
+from energia.modeling.parameters.pool import Pool
+
+
+def test_pool():
+    pool = Pool()
+    a = pool.intern([1, 2, 3])
+    b = pool.intern(numpy.array([1.0, 2.0, 3.0]))
+    assert a is b
+    assert not a.flags.writeable
+    assert pool.tolist(a) == [1.0, 2.0, 3.0]
+    # same values, different shape
+    pair, flat = pool.intern([(1, 2)]), pool.intern([1, 2])
+    assert pair is not flat
+    assert len(pool) == 3
+    assert [1, 2, 3] in pool
+    assert pool.report() == {
+        "interned": 4,
+        "held": 3,
+        "nbytes": a.nbytes + pair.nbytes + flat.nbytes,
+    }
+
+    # evicted once not held elsewhere
+    del a, b, pair
+    gc.collect()
+    assert len(pool) == 1
+    assert [1, 2, 3] not in pool
+    assert pool.report()["interned"] == 4
+
+
+def build(profile: list[float], n: int = 5) -> Model:
+    m = Model("pool")
+    m.q = Periods()
+    m.y = 4 * m.q
+    for i in range(n):
+        setattr(m, f"r{i}", Resource())
+        _ = getattr(m, f"r{i}").release.prep(100) >= profile
+    return m
+
+
+def test_shared_profiles():
+    profile = [0.6, 0.7, 1, 0.3]
+    m = build(profile)
+    gc.collect()
+
+    # after the build, the scenario holds the one array for all five binds
+    pool = m.scenario.pool
+    vectors = list(m.scenario.vectors.values())
+    assert len(vectors) == 5
+    assert all(vector is vectors[0] for vector in vectors)
+    assert pool.report() == {"interned": 5, "held": 1, "nbytes": 4 * 8}
+    assert pool.vectors[Pool.key(vectors[0])] is vectors[0]
+    assert m.scenario.saved == 4 * 4 * 8
+    assert pool.tolist(vectors[0]) == pytest.approx([60.0, 70.0, 100.0, 30.0])
+
+
+def _worker(args):
+    handle, delta, key = args
+    pool = Pool.attach(handle, delta)
+    vector = pool.vectors[key]
+    return vector.flags.writeable, float(vector.sum())
+
+
+def test_shared_pool(tmp_path):
+    pool = Pool()
+    base = pool.intern(numpy.arange(8760.0))
+    with pool.share(directory=str(tmp_path)) as shared:
+        assert os.path.dirname(shared.path) == str(tmp_path)
+        new = pool.intern([1.0, 2.0])
+        delta = pool.delta(shared.handle)
+        assert list(delta) == [Pool.key(new)]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(
+                    _worker,
+                    [
+                        (shared.handle, delta, Pool.key(base)),
+                        (shared.handle, delta, Pool.key(new)),
+                    ],
+                )
+            )
+        assert results == [(False, base.sum()), (False, 3.0)]
+
+        # attached vectors are views of the file
+        attached = Pool.attach(shared.handle)
+        assert isinstance(attached.vectors[Pool.key(base)].base, numpy.memmap)
+        assert attached.tolist(attached.vectors[Pool.key(base)])[-1] == 8759.0
+
+    assert not os.path.exists(shared.path)
+
+
+def test_shared_model(tmp_path):
+    # the bound vectors of a built model are shared, nothing else holds them
+    m = build([0.6, 0.7, 1, 0.3])
+    _ = m.r0.consume.prep(10) <= [0.1, 0.2, 0.3, 0.4]
+    gc.collect()
+    vectors = {Pool.key(v): v for v in m.scenario.vectors.values()}
+    assert len(vectors) == 2
+
+    with m.scenario.pool.share(directory=str(tmp_path)) as shared:
+        assert set(shared.handle["layout"]) == set(vectors)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(
+                executor.map(
+                    _worker, [(shared.handle, {}, key) for key in vectors]
+                )
+            )
+    assert results == [(False, float(v.sum())) for v in vectors.values()]
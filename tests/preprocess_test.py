@@ -0,0 +1,52 @@
+import numpy
+import pandas as pd
+import pytest
+
+from energia.utils.data import make_henry_price_df, remove_outliers
+from energia.utils.preprocess import clean, read_csv_chunked, replace_outliers
+
+
+@pytest.fixture
+def prices(tmp_path):
+    # weekdays only, over two years
+    dates = pd.bdate_range("2018-12-01", "2020-01-31")
+    values = numpy.arange(len(dates), dtype=float)
+    path = tmp_path / "henry.csv"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n" * 5)
+        for date, value in zip(dates, values):
+            f.write(f"{date:%m/%d/%Y},{value}\n")
+    return path
+
+
+def test_henry(prices):
+    daily = make_henry_price_df(prices, 2019)
+    assert len(daily) == 365
+    # 2019-01-05 is a saturday, takes friday's price
+    assert daily["CH4"][4] == daily["CH4"][3]
+    assert daily["scales"][364] == (0, 364)
+
+    hourly = make_henry_price_df(prices, 2019, stretch=True)
+    assert len(hourly) == 8760
+    assert hourly["CH4"][:24].nunique() == 1
+    assert hourly["scales"][25] == (0, 1, 1)
+
+
+def test_read_csv_chunked(prices):
+    data = read_csv_chunked(prices, years=[2019], chunksize=50, skiprows=5, header=None)
+    assert data.index.year.unique().tolist() == [2019]
+    assert len(clean(data, factors=2, stretch_by=24)) == 365 * 24
+
+
+def test_outliers():
+    data = pd.DataFrame({"a": [1.0, 1, 1, 50, 1, 1, 1, 1], "b": [2.0] * 7 + [-40]})
+    cleaned = replace_outliers(data)
+    assert cleaned["a"].tolist() == [1.0] * 8
+    # the last point takes the mean of its neighbor and itself
+    assert cleaned["b"].iloc[-1] == -19
+    assert remove_outliers(data[["a"]])["a"].tolist() == [1.0] * 8
+
+    # a rolling window catches local outliers only
+    data = pd.DataFrame({"a": [1.0] * 10 + [1000.0] * 9 + [1200] + [1000.0] * 10})
+    assert replace_outliers(data)["a"].iloc[19] == 1200
+    assert replace_outliers(data, window=9)["a"].iloc[19] == 1000
@@ -0,0 +1,63 @@
+"""Tests for the presolve of the canonical form"""
+
+import numpy
+import pytest
+from scipy.sparse import csr_array
+
+from energia.library.examples.energy import design_scheduling, scheduling
+from energia.represent.ations.presolve import Presolve
+from energia.represent.ations.solvers import HiGHS
+
+
+def form(A, b, eq, c, lb=None, ub=None, integrality=None):
+    n = len(c)
+    return {
+        "A": csr_array(numpy.array(A, dtype=float)),
+        "b": numpy.array(b, dtype=float),
+        "eq": numpy.array(eq, dtype=bool),
+        "c": numpy.array(c, dtype=float),
+        "lb": numpy.zeros(n) if lb is None else numpy.array(lb, dtype=float),
+        "ub": numpy.full(n, numpy.inf) if ub is None else numpy.array(ub, dtype=float),
+        "integrality": numpy.zeros(n) if integrality is None else numpy.array(integrality),
+    }
+
+
+def test_reductions():
+    # x0 <= 0 (bind), x1 - x2 = 0 (map), x1 + x3 >= 5, x4 in no row
+    p = Presolve(
+        form(
+            A=[[1, 0, 0, 0, 0], [0, 1, -1, 0, 0], [0, -1, 0, -1, 0]],
+            b=[0, 0, -5],
+            eq=[False, True, False],
+            c=[1, 0, 2, 3, 1],
+        )
+    )
+    assert not p.infeasible
+    # x0 and x4 fixed to 0, x2 substituted by x1
+    assert p.form["A"].shape == (1, 2)
+    assert list(p.columns) == [1, 3]
+    z = p.postsolve(numpy.array([5.0, 0.0]))
+    assert list(z) == [0.0, 5.0, 5.0, 0.0, 0.0]
+
+
+def test_infeasible():
+    p = Presolve(form(A=[[1, 0], [1, 1]], b=[2, -1], eq=[True, False], c=[1, 1]))
+    assert p.infeasible
+
+
+@pytest.mark.parametrize("example", [scheduling, design_scheduling])
+def test_presolve(example):
+    m = example()
+    m.usd.spend.opt(using="highs", mip_rel_gap=1e-9)
+    full = m.program.objectives[-1].X
+    m.usd.spend.opt(using="highs", presolve=True, mip_rel_gap=1e-9)
+    assert m.program.objectives[-1].X == pytest.approx(full, rel=1e-6)
+
+    # the restored solution is feasible in the full program
+    f = m.program.matrices.form()
+    assert len(Presolve(f).rows) < f["A"].shape[0]
+    z, _ = HiGHS(presolve=True, mip_rel_gap=1e-9).solve(m.program)
+    assert ((z >= f["lb"] - 1e-6) & (z <= f["ub"] + 1e-6)).all()
+    residual = f["A"] @ z - f["b"]
+    assert (residual[~f["eq"]] <= 1e-6).all()
+    assert numpy.abs(residual[f["eq"]]).max() <= 1e-6
@@ -0,0 +1,72 @@
+"""Tests for the size profile of the program"""
+
+import pytest
+
+from energia.library.examples.energy import design_scheduling
+from energia.represent.ations.estimate import Estimate
+from energia.represent.ations.profile import Profile
+
+
+@pytest.fixture(scope="module")
+def profile():
+    m = design_scheduling()
+    return m.profile_size()
+
+
+def test_total(profile):
+    program = profile.model.program
+    matrices = program.matrices
+    assert profile.total["variables"] == len(program.variables)
+    assert profile.total["constraints"] == len(matrices.leqcons + matrices.eqcons)
+    assert profile.total["nonzeros"] == matrices.G.nnz + matrices.H.nnz
+    assert profile.total["binaries"] == sum(bool(v.bnr) for v in program.variables)
+
+    # categories partition the constraints
+    categories = profile.sizes["category"]
+    assert {"Binds", "Calculations", "Balance"} <= set(categories)
+    assert sum(c["constraints"] for c in categories.values()) == (
+        profile.total["constraints"]
+    )
+
+
+def test_rank(profile):
+    ranked = profile.rank("component", "nonzeros")
+    sizes = [s["nonzeros"] for _, s in ranked]
+    assert sizes == sorted(sizes, reverse=True)
+    assert {"wf", "pv", "power"} <= {key for key, _ in ranked}
+
+    assert [key for key, _ in profile.rank("location")] == ["l0"]
+    assert {key for key, _ in profile.rank("period")} == {"q", "y"}
+    assert "operate" in profile.sizes["aspect"]
+
+    with pytest.raises(ValueError):
+        profile.rank("operation")
+
+
+def test_flame(profile, tmp_path):
+    path = profile.flame(str(tmp_path / "m.folded"), measure="nonzeros")
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines == profile.stacks("nonzeros")
+
+    constraints = [line for line in lines if line.split(";")[1] == "Constraints"]
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in constraints) == (
+        profile.total["nonzeros"]
+    )
+    assert any(line.startswith("design_scheduling;Constraints;Balance;-;") for line in lines)
+
+
+def test_memory(profile):
+    # profiled as estimated, gana objects and canonical form alike
+    m = profile.model
+    assert profile.total["memory"] == Estimate(m).memory
+    assert profile.total["memory"] > 1000 * profile.total["variables"]
+
+
+def test_owners(profile):
+    # attributed by the gana sets of the components, nothing is made for the profile
+    m = profile.model
+    version = m.program.__dict__.get("_version", 0)
+    assert Profile(m).sizes == profile.sizes
+    assert m.program.__dict__.get("_version", 0) == version
+    assert ("produce", "power") in profile._variables
@@ -0,0 +1,47 @@
+import numpy
+from pandas import DataFrame, MultiIndex
+
+from energia.library.profiles import capacity_factors
+
+calls = []
+
+
+def fetch(attrs, year, lat_lons, resolution, mirror, index):
+    calls.append((year, len(lat_lons)))
+    weather = DataFrame(
+        {
+            (n, attr): numpy.arange(24) * (n + 1) + year % 10
+            for n in range(len(lat_lons))
+            for attr in attrs
+        }
+    )
+    weather.columns = MultiIndex.from_tuples(weather.columns)
+    return lat_lons, weather
+
+
+def model(data, site):
+    return data["wind_speed"].to_numpy() * site[0]
+
+
+def test_capacity_factors(tmp_path):
+    sites = [(30.0, -96.0), (40.0, -100.0), (45.0, -120.0)]
+    kw = dict(kind="wind", cache=str(tmp_path), fetch=fetch, model=model)
+
+    profiles = capacity_factors(sites, [2019, 2020], **kw)
+    # one batched fetch per year
+    assert sorted(calls) == [(2019, 3), (2020, 3)]
+    assert len(profiles) == 6
+    assert profiles[(sites[0], 2019)].max() == 1
+    assert len(list(tmp_path.iterdir())) == 6
+
+    calls.clear()
+    cached = capacity_factors(sites + [(50.0, -110.0)], [2019, 2020], **kw)
+    # only the new site is fetched
+    assert sorted(calls) == [(2019, 1), (2020, 1)]
+    assert numpy.array_equal(cached[(sites[1], 2020)], profiles[(sites[1], 2020)])
+
+    calls.clear()
+    # a different rating is a different profile
+    rated = capacity_factors(sites[:1], [2019], rating=100, **kw)
+    assert calls == [(2019, 1)]
+    assert rated[(sites[0], 2019)].max() == (23 + 9) * 30 / 100
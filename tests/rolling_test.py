@@ -0,0 +1,143 @@
+import pytest
+
+from energia import Currency, Location, Model, Periods, Process, Resource, Storage
+from energia.decomposition.rolling import RollingHorizon
+
+demand = [0.6, 0.7, 0.8, 0.3, 0.5, 0.9, 0.4, 0.6]
+cf = [0.9, 0.8, 0.5, 0.7, 0.6, 0.3, 0.9, 0.8]
+
+
+def build(w):
+    m = Model(f"rolling{w.n}")
+    m.q = Periods()
+    m.y = len(w) * m.q
+    m.usd = Currency()
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume <= 1000
+    _ = m.power.release.prep(180) >= w(demand)
+    m.wf = Process(m.power == -1 * m.wind)
+    _ = m.wf.capacity.x <= 400
+    _ = m.wf.operate.prep(norm=True) <= w(cf)
+    _ = m.usd.spend(m.wf.capacity) == 1000
+    _ = m.usd.spend(m.wf.operate) == 49
+    m.lii = Storage(m.power == 0.9)
+    _ = m.lii.capacity.x <= 100
+    _ = m.usd.spend(m.lii.capacity) == 1500
+    _ = m.usd.spend(m.lii.inventory) == 20
+    m.network.locate(m.wf, m.lii)
+    return m
+
+
+def build_supplied(w):
+    m = build(w)
+    # the build supplies the stored resource itself
+    _ = m.lii.stored.consume(m.q) <= 50
+    return m
+
+
+def build_sites(w):
+    m = Model(f"rolling_sites{w.n}")
+    m.q = Periods()
+    m.y = len(w) * m.q
+    m.usd = Currency()
+    m.declare(Location, ["a", "b"])
+    m.declare(Resource, ["power", "wind"])
+    _ = m.wind.consume(m.a) <= 1000
+    _ = m.wind.consume(m.b) <= 1000
+    _ = m.power.release(m.a, m.q).prep(100) >= w(demand)
+    _ = m.power.release(m.b, m.q).prep(60) >= w(demand)
+    m.wf = Process(m.power == -1 * m.wind)
+    for loc in (m.a, m.b):
+        _ = m.wf.capacity(loc) <= 400
+        _ = m.wf.operate(loc, m.q).prep(norm=True) <= w(cf)
+        _ = m.usd.spend(m.wf.capacity, loc) == 1000
+        _ = m.usd.spend(m.wf.operate, loc, m.q) == 49
+    m.wf.locate(m.a, m.b)
+    return m
+
+
+@pytest.fixture
+def rh():
+    _rh = RollingHorizon(
+        build,
+        length=8,
+        window=4,
+        step=2,
+        objective=lambda m: m.usd.spend,
+        record={
+            "operate": lambda m: m.wf.operate(m.q),
+            "inventory": lambda m: m.lii.inventory(m.q),
+        },
+    )
+    _rh.solve()
+    return _rh
+
+
+def test_rolling_horizon(rh):
+    assert [(w.start, w.stop, w.commit) for w in rh.windows] == [
+        (0, 4, 2),
+        (2, 6, 2),
+        (4, 8, 2),
+        (6, 8, 2),
+    ]
+    assert len(rh.objectives) == 4
+    assert len(rh.committed["operate"]) == 8
+    assert len(rh.committed["inventory"]) == 8
+    # installed capacity never goes down
+    carried = [w.capacity[("wf", "l0")] for w in rh.solved[1:]]
+    assert carried == sorted(carried)
+    capacity = rh.model.wf.capacity.output(aslist=True)[0]
+    assert capacity >= carried[-1] - 1e-6
+    # inventory carried into the first period of the last window only
+    consume = rh.model.lii.stored.consume(rh.model.q).output(aslist=True)
+    assert consume[0] == pytest.approx(rh.solved[-1].inventory[("lii", "l0")])
+    assert consume[0] == pytest.approx(rh.committed["inventory"][5])
+    assert sum(consume[1:]) == pytest.approx(0)
+
+
+def test_rolling_horizon_sites():
+    rh = RollingHorizon(
+        build_sites,
+        length=8,
+        window=4,
+        step=2,
+        objective=lambda m: m.usd.spend,
+        record={
+            "a": lambda m: m.wf.operate(m.a, m.q),
+            "b": lambda m: m.wf.operate(m.b, m.q),
+        },
+    )
+    rh.solve()
+    # committed periods at both sites
+    assert len(rh.committed["a"]) == len(rh.committed["b"]) == 8
+    # capacities are carried per site, the sites differ in demand
+    capacity = rh.solved[-1].capacity
+    assert {("wf", "a"), ("wf", "b")} <= set(capacity)
+    assert capacity[("wf", "a")] > capacity[("wf", "b")]
+    for loc in ("a", "b"):
+        installed = rh.model.wf.capacity(getattr(rh.model, loc)).output(aslist=True)
+        assert installed[0] >= capacity[("wf", loc)] - 1e-6
+
+
+def test_rolling_horizon_supplied():
+    rh = RollingHorizon(
+        build_supplied,
+        length=8,
+        window=4,
+        step=2,
+        objective=lambda m: m.usd.spend,
+        record={"inventory": lambda m: m.lii.inventory(m.q)},
+    )
+    rh.solve()
+    # the carried inventory adds to the supply of the build, not replaces it
+    # more than the build can supply is carried into the second window
+    assert rh.solved[1].inventory[("lii", "l0")] > 50
+    carried = rh.model.program.lii_l0_carried.output(aslist=True)
+    assert carried[0] == pytest.approx(rh.solved[-1].inventory[("lii", "l0")])
+    consume = rh.model.lii.stored.consume(rh.model.q).output(aslist=True)
+    assert max(consume) <= 50 + 1e-6
+
+
+def test_rolling_horizon_step():
+    with pytest.raises(ValueError):
+        RollingHorizon(build, length=8, window=4, step=5, objective=None)
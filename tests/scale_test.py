@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import numpy
+import pandas as pd
+import pytest
+
+from energia.modeling.constraints.bind import Bind
+from energia.modeling.parameters.pool import Pool
+from energia.utils.math import normalize, scale
+from energia.utils.scaling import scaling
+
+
+def test_normalize():
+    assert normalize([1, 2, 4]) == [0.25, 0.5, 1.0]
+    assert normalize([1, 2, 3], how="min_max") == [0.0, 0.5, 1.0]
+    # bounds are normalized individually
+    assert normalize([(1, 2), (2, 4)]) == [(0.5, 0.5), (1.0, 1.0)]
+    assert normalize([[1, 2], [2, 8]]) == [[0.5, 1.0], [0.25, 1.0]]
+    assert normalize(pd.Series([2.0, 4.0])) == [0.5, 1.0]
+
+
+def test_scale():
+    data = numpy.random.default_rng(0).random((8760, 3))
+    scaled = scale(data, how="standard")
+    assert numpy.allclose(scaled.mean(axis=0), 0)
+    assert numpy.allclose(scaled.std(axis=0), 1)
+    # constant data is not divided by zero
+    assert scale([3.0, 3.0], how="min_max").tolist() == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        scale(data, how="log")
+
+    df = pd.DataFrame(data, columns=["a", "b", "c"])
+    scaled = scaling(df, how="minmax")
+    assert list(scaled.columns) == ["a", "b", "c"]
+    assert scaled.min().tolist() == [0.0] * 3
+    assert scaled.max().tolist() == [1.0] * 3
+
+
+def parameter(value, nominal=None, norm=False):
+    bind = SimpleNamespace(_parameter=value, nominal=nominal, norm=norm, pool=Pool())
+    return Bind.parameter.func(bind)
+
+
+def test_bind_parameter():
+    assert parameter([1, 2, 4], nominal=10, norm=True) == [2.5, 5.0, 10.0]
+    assert parameter([(1, 2), (2, 4)], nominal=10) == [(10.0, 20.0), (20.0, 40.0)]
+    # nested lists are normalized list by list, stay lists, and may be ragged
+    nested = parameter([[1, 2], [2, 8, 4]], nominal=10, norm=True)
+    assert nested == [[5.0, 10.0], [2.5, 10.0, 5.0]]
+    assert all(isinstance(i, list) for i in nested)
+    assert parameter([[1, 2], [3, 4]]) == [[1, 2], [3, 4]]
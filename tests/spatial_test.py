@@ -0,0 +1,61 @@
+import pytest
+
+from energia.decomposition import spatial as _spatial
+from energia.decomposition.spatial import Spatial
+from energia.library.examples.supply_chain import seattle_topeka
+
+
+@pytest.fixture
+def m():
+    _m = seattle_topeka()
+    _m.usd.spend.obj()
+    return _m
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_spatial(m, workers):
+    spatial = Spatial(m, workers=workers)
+    # one subproblem per location, network totals are substituted out
+    assert list(spatial.sites) == ["sandiego", "seattle", "newyork", "chicago", "topeka"]
+    # shipments through the linkages are shared between source and sink
+    assert len(spatial.coupled) == 6
+    assert spatial.solve() == pytest.approx(153675, rel=1e-3)
+    assert m.program.optimized
+    assert m.release.output(aslist=True) == pytest.approx([325, 300, 275], rel=1e-3)
+
+
+def test_spatial_clusters(m):
+    spatial = Spatial(
+        m,
+        clusters={
+            "west": [m.seattle, m.sandiego],
+            "east": [m.newyork, m.chicago, m.topeka],
+        },
+        workers=1,
+    )
+    assert list(spatial.sites) == ["west", "east"]
+    assert spatial.solve() == pytest.approx(153675, rel=1e-3)
+
+
+def test_spatial_not_converged(m):
+    spatial = Spatial(m, max_iter=2, workers=1)
+    with pytest.warns(RuntimeWarning):
+        spatial.solve()
+    assert not spatial.converged
+    assert not m.program.optimized
+
+
+def test_spatial_dispose(m, monkeypatch):
+    disposed = []
+    dispose = _spatial._Sites.dispose
+
+    def _dispose(sites):
+        disposed.append(sites.env is not None)
+        dispose(sites)
+        assert sites.env is None and not sites.models
+
+    monkeypatch.setattr(_spatial._Sites, "dispose", _dispose)
+    Spatial(m, workers=1).solve()
+    # the Env is freed once the run is done, nothing is left on the module
+    assert disposed == [True]
+    assert _spatial._WORKER is None
@@ -0,0 +1,47 @@
+"""Tests for writing the program to MPS and LP files"""
+
+import gzip
+
+import gurobipy as gp
+import pytest
+
+from energia.library.examples.energy import design_scheduling
+
+
+@pytest.fixture(scope="module")
+def solved():
+    m = design_scheduling()
+    m.usd.spend.opt(using="gurobi")
+    return m
+
+
+@pytest.mark.parametrize("name", ["m.mps", "m.lp", "m.mps.gz", "m.lp.gz"])
+def test_write(solved, tmp_path, name):
+    path = str(tmp_path / name)
+    assert solved.write(path) == path
+
+    env = gp.Env(params={"OutputFlag": 0})
+    g = gp.read(path, env=env)
+    g.optimize()
+    assert g.ObjVal == pytest.approx(solved.program.objectives[-1].X, rel=1e-6)
+    # non-negativity constraints are written as bounds
+    matrices = solved.program.matrices
+    assert g.NumConstrs == len(matrices.leqcons) + len(matrices.eqcons)
+    assert g.NumIntVars == int(matrices.integrality.sum())
+
+
+def test_categories(solved, tmp_path):
+    path = str(tmp_path / "m.lp.gz")
+    solved.write(path)
+    with gzip.open(path, "rt") as f:
+        categories = [line[2:].strip() for line in f if line.startswith("\\ ")][1:]
+    # each category is written once, grouped as the program stores them
+    assert len(categories) == len(set(categories))
+    assert set(categories) == {
+        str(c.category) for c in solved.program.constraint_sets if c._
+    }
+
+
+def test_extension(solved):
+    with pytest.raises(ValueError):
+        solved.write("m.txt")